@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Multiple accounts
+"""
+
+import json
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from . import formatter as fmt
+from .cache import FITBIT_CACHE_PATH
+from .exceptions import FitbitAPIError, FitbitInitError
+from .output import fetch_sections, format_sections
+from .stream import JSONObjectWriter, NDJSONWriter
+
+MAX_ACCOUNT_WORKERS = 8
+ACCOUNT_NAME = re.compile(r"^[A-Za-z0-9_.@-]+$")
+
+
+def load_accounts(path):
+    """Return {account: token file} from a directory of token files or a manifest.
+
+    A directory holds one ``<account>.json`` token file per account. A manifest
+    is a JSON object mapping account names to token files, relative paths are
+    resolved against the manifest's directory.
+    """
+    source = Path(path).expanduser()
+    if source.is_dir():
+        accounts = {file.stem: str(file) for file in sorted(source.glob("*.json"))}
+    else:
+        try:
+            with open(source, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise FitbitInitError(
+                f"Cannot read the accounts manifest {source}: {e}"
+            ) from e
+        if not isinstance(manifest, dict):
+            raise FitbitInitError(
+                f"The accounts manifest {source} must map account names to token files"
+            )
+        accounts = {
+            name: str(source.parent / Path(token).expanduser())
+            for name, token in manifest.items()
+        }
+    if not accounts:
+        raise FitbitInitError(f"No account token files found in {source}")
+    for name in accounts:
+        if not ACCOUNT_NAME.match(name):
+            raise FitbitInitError(f"Invalid account name: {name!r}")
+    return accounts
+
+
+def account_cache_path(account):
+    """Return the response cache of an account, API URLs are the same for every account."""
+    return str(Path(FITBIT_CACHE_PATH).with_name(f"cache-{account}.db"))
+
+
+def _fetch_account(create_client, args):
+    try:
+        client = create_client()
+    except (FitbitInitError, OSError) as e:
+        return [], str(e)
+    try:
+        sections = fetch_sections(
+            client, args, activity_units=not args.raw_json, raw=args.raw_json
+        )
+        return list(sections), None
+    except (FitbitAPIError, FitbitInitError, OSError) as e:
+        return [], str(e)
+    finally:
+        client.close()
+
+
+def fetch_accounts(client_factories, args):
+    """Create the client of every account and fetch its requested sections concurrently.
+
+    client_factories maps account names to callables returning a client, each
+    called in the account's own task. Returns [(account, sections, error)] in
+    account order. An account whose client cannot be created, e.g. because of
+    a missing or corrupt token file, or whose requests fail carries its error
+    message and does not affect the others. Every client is closed.
+    """
+    workers = max(1, min(len(client_factories), MAX_ACCOUNT_WORKERS))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            account: executor.submit(_fetch_account, create_client, args)
+            for account, create_client in client_factories.items()
+        }
+        return [(account, *future.result()) for account, future in futures.items()]
+
+
+def _write_ndjson(results, args):
+    writer = NDJSONWriter(sys.stdout)
+    for account, sections, error in results:
+        if error is not None:
+            writer.write({"account": account, "error": error})
+        for name, section in format_sections(sections, args, as_json=True):
+            records = section[name]
+            for record in records if isinstance(records, list) else [records]:
+                writer.write({"account": account, "metric": name, **record})
+    sys.stdout.flush()
+
+
+def _account_json(sections, args):
+    if args.raw_json:
+        return dict(sections)
+    merged = {}
+    for _, section in format_sections(sections, args, as_json=True):
+        merged.update(section)
+    return merged
+
+
+def _render_tables(results, args):
+    for account, sections, error in results:
+        fmt.CONSOLE.rule(f":bust_in_silhouette: {account}")
+        if error is not None:
+            fmt.CONSOLE.print(f":unamused: {error}", style="bold red")
+            continue
+        for _ in format_sections(sections, args, compact=args.compact):
+            pass
+
+
+def accounts_display(client_factories, args):
+    """Fetch every account, see fetch_accounts, and write the results tagged by account.
+
+    NDJSON records carry an ``account`` field, JSON output is one object keyed
+    by account, and tables are printed under a rule per account.
+    """
+    results = fetch_accounts(client_factories, args)
+    if args.ndjson:
+        _write_ndjson(results, args)
+    elif args.json or args.raw_json:
+        with JSONObjectWriter(sys.stdout) as writer:
+            for account, sections, error in results:
+                value = {"error": error} if error else _account_json(sections, args)
+                writer.write_member(account, value)
+    else:
+        _render_tables(results, args)
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Asyncio Fitbit API
+"""
+
+# The request flow deliberately mirrors FitbitAPI with awaitable calls
+# pylint: disable=duplicate-code
+
+import asyncio
+
+from .chunking import merge_payloads, split_range
+from .endpoints import FitbitEndpoints
+from .exceptions import FitbitAPIError
+from .fitbit_setup import TokenFileLock, update_fitbit_token
+from .jsonlib import loads
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+
+class AsyncFitbitAPI(FitbitEndpoints):  # pylint: disable=too-many-instance-attributes
+    """Asyncio Fitbit API
+
+    Same getters as FitbitAPI, but each one returns an awaitable. All requests
+    share one aiohttp connection pool, so many overlapping requests run on a
+    single event loop::
+
+        async with AsyncFitbitAPI(client_id, secret, access, refresh) as fitbit:
+            sleep, hrv = await asyncio.gather(
+                fitbit.get_sleep_log("2024-01-01"), fitbit.get_hrv_summary("2024-01-01")
+            )
+
+    Requires the optional ``aiohttp`` dependency (``pip install fitbit-cli[async]``).
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        client_id,
+        client_secret,
+        access_token,
+        refresh_token,
+        pool_size=100,
+        cache=None,
+        retry_policy=None,
+        expires_at=None,
+        token_path=None,
+    ):
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncFitbitAPI requires aiohttp, install it with: pip install fitbit-cli[async]"
+            )
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.expires_at = expires_at
+        self.token_path = token_path
+        self.pool_size = pool_size
+        self.headers = self._create_headers()
+        self.cache = cache
+        self.rate_limiter = RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.session = None
+        self._token_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        self._get_session()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _get_session(self):
+        """Return the shared session, creating it inside the running event loop."""
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=5),
+            )
+        return self.session
+
+    async def close(self):
+        """Close the underlying HTTP session and the response cache."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        if self.cache is not None:
+            self.cache.close()
+
+    @property
+    def rate_limit(self):
+        """Last known Fitbit rate limit budget (limit, remaining, reset_in seconds)"""
+        return self.rate_limiter.budget()
+
+    async def refresh_access_token(self, expired_token=None):
+        """Refresh token, coalescing concurrent refreshes of the same expired token.
+
+        Like FitbitAPI.refresh_access_token, the refresh runs under the token file
+        lock and adopts a token another process has already refreshed.
+        """
+
+        async with self._token_lock:
+            if expired_token is not None and expired_token != self.access_token:
+                return
+            file_lock = TokenFileLock(self.token_path)
+            await asyncio.to_thread(file_lock.acquire)
+            try:
+                if not await asyncio.to_thread(self._adopt_stored_token):
+                    await self._refresh_access_token()
+            finally:
+                file_lock.release()
+
+    async def _refresh_access_token(self):
+        payload, headers = self._refresh_request()
+        async with self._get_session().post(
+            self.TOKEN_API, data=payload, headers=headers
+        ) as response:
+            tokens = await response.json(content_type=None)
+            if response.status != 200:
+                raise FitbitAPIError(f"Failed to refresh access token: {tokens}")
+        self._apply_refresh_response(tokens)
+        await asyncio.to_thread(
+            update_fitbit_token,
+            self.access_token,
+            self.refresh_token,
+            self.expires_at,
+            path=self.token_path,
+        )
+
+    async def _send(self, method, url, headers, **kwargs):
+        """Send one request once the rate limiter grants a slot and read its body."""
+        delay = self.rate_limiter.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        response = None
+        try:
+            async with self._get_session().request(
+                method, url, headers=headers, **kwargs
+            ) as response:
+                await response.read()
+        finally:
+            self.rate_limiter.update(response.headers if response is not None else {})
+        return response
+
+    async def _send_with_retries(self, method, url, headers, **kwargs):
+        """Send a request, retrying connection errors and transient HTTP statuses."""
+        attempt = 0
+        while True:
+            try:
+                response = await self._send(method, url, headers, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if not self.retry_policy.consume(attempt):
+                    raise
+                await asyncio.sleep(self.retry_policy.delay(attempt))
+            else:
+                if response.status not in self.retry_policy.statuses:
+                    return response
+                if not self.retry_policy.consume(attempt):
+                    return response
+                await asyncio.sleep(
+                    self.retry_policy.delay(
+                        attempt, response.headers.get("Retry-After")
+                    )
+                )
+            attempt += 1
+
+    async def make_request(self, method, url, **kwargs):
+        """Make an API request and handle token refresh and retries if needed."""
+
+        access_token = self.access_token
+        if self._token_expiring():
+            await self.refresh_access_token(expired_token=access_token)
+        access_token = self.access_token
+        response = await self._send_with_retries(method, url, self.headers, **kwargs)
+        if response.status == 401:
+            await self.refresh_access_token(expired_token=access_token)
+            response = await self._send_with_retries(
+                method, url, self.headers, **kwargs
+            )
+        if response.status >= 400:
+            raise FitbitAPIError(f"HTTP error occurred: {await response.text()}")
+        return response
+
+    async def _get_json(self, url):  # pylint: disable=invalid-overridden-method
+        """GET a JSON resource, serving it from the response cache when possible."""
+
+        if self.cache is not None:
+            body = self.cache.get(url)
+            if body is not None:
+                return loads(body)
+        response = await self.make_request("GET", url)
+        body = await response.text()
+        if self.cache is not None:
+            self.cache.set(url, body)
+        return loads(body)
+
+    async def _get_range_json(  # pylint: disable=invalid-overridden-method
+        self, url, start_date, end_date, max_days, period=None
+    ):
+        """GET a date range resource, fetching ranges longer than max_days in concurrent chunks."""
+
+        if not end_date:
+            date_range = f"{start_date}/{period}" if period else start_date
+            return await self._get_json(url.format(date_range=date_range))
+
+        spans = split_range(start_date, end_date, max_days)
+        payloads = await asyncio.gather(
+            *(
+                self._get_json(url.format(date_range="/".join(map(str, span))))
+                for span in spans
+            )
+        )
+        return merge_payloads(list(payloads))
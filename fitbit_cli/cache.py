@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+On-disk response cache
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+FITBIT_CACHE_PATH = f"{Path.home()}/.fitbit/cache.db"
+
+# Fitbit devices sync late, so yesterday's data may still change
+MUTABLE_DAYS = 1
+TODAY_TTL = 5 * 60
+FINALIZED_TTL = 30 * 24 * 60 * 60
+
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def is_finalized(day, today=None):
+    """Return True if data for the YYYY-MM-DD day is not expected to change anymore."""
+    today = today or date.today()
+    return day < (today - timedelta(days=MUTABLE_DAYS)).isoformat()
+
+
+def is_mutable_url(url, today=None):
+    """Return True if the response of an API URL may still change."""
+    dates = DATE_PATTERN.findall(url)
+    # Undated (profile, devices) and open-ended (?afterDate=) requests may always change
+    if not dates or "?" in url:
+        return True
+    return not is_finalized(max(dates), today)
+
+
+def ttl_for_url(url, today=None):
+    """Return the cache lifetime in seconds for an API URL."""
+    return TODAY_TTL if is_mutable_url(url, today) else FINALIZED_TTL
+
+
+class ResponseCache:
+    """SQLite cache of raw API response bodies keyed by request URL
+
+    With refresh, every lookup misses. With skip_mutable, only lookups of
+    responses that may still change miss, e.g. for --watch, which has to see
+    today's data as soon as it changes. Responses are stored either way.
+    """
+
+    def __init__(self, path=FITBIT_CACHE_PATH, refresh=False, skip_mutable=False):
+        self.path = path
+        self.refresh = refresh
+        self.skip_mutable = skip_mutable
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "url TEXT PRIMARY KEY, body TEXT NOT NULL, "
+                "fetched_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def get(self, url):
+        """Return the cached body for url, or None if missing, expired or refreshing."""
+        if self.refresh or (self.skip_mutable and is_mutable_url(url)):
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM responses WHERE url = ? AND expires_at > ?",
+                (url, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, url, body):
+        """Store a response body for url with a TTL based on its date range."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (url, body, now, now + ttl_for_url(url)),
+            )
+
+    def info(self):
+        """Return cache statistics."""
+        with self._lock:
+            entries, live, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(expires_at > ?), 0), "
+                "COALESCE(SUM(LENGTH(body)), 0) FROM responses",
+                (time.time(),),
+            ).fetchone()
+        return {
+            "path": self.path,
+            "entries": entries,
+            "live_entries": live,
+            "expired_entries": entries - live,
+            "body_bytes": size,
+        }
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Date range chunking for endpoints with a maximum date span
+"""
+
+from datetime import timedelta
+
+from .dates import to_date
+
+
+def split_range(start_date, end_date, max_days):
+    """Split an inclusive date range into (start, end) spans of at most max_days days.
+
+    A range that already fits is returned unchanged as a single span.
+    """
+    start, end = to_date(start_date), to_date(end_date)
+    if (end - start).days < max_days:
+        return [(start_date, end_date)]
+
+    spans = []
+    while start <= end:
+        span_end = min(start + timedelta(days=max_days - 1), end)
+        spans.append((start.isoformat(), span_end.isoformat()))
+        start = span_end + timedelta(days=1)
+    return spans
+
+
+def merge_payloads(payloads):
+    """Merge chunked responses back into the shape of a single response.
+
+    List responses are concatenated. For dict responses, list values are
+    concatenated per key and any other value is taken from the first chunk.
+    """
+    if all(isinstance(payload, list) for payload in payloads):
+        return [item for payload in payloads for item in payload]
+
+    merged = {}
+    for payload in payloads:
+        for key, value in payload.items():
+            if isinstance(value, list):
+                merged.setdefault(key, []).extend(value)
+            else:
+                merged.setdefault(key, value)
+    return merged
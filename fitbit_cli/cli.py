@@ -4,10 +4,79 @@ CLI Arguments Parser
 """
 
 import argparse
+import importlib.util
 import re
 from datetime import datetime, timedelta
 
 from . import __version__
+from .export import EXPORT_FORMATS
+
+# Arguments that change how data is fetched or shown but do not request any data
+OPTION_ARGS = (
+    "json",
+    "raw_json",
+    "ndjson",
+    "init_auth",
+    "version",
+    "workers",
+    "range_activities",
+    "retries",
+    "retry_budget",
+    "no_cache",
+    "refresh_cache",
+    "cache_info",
+    "clear_cache",
+    "sync",
+    "offline",
+    "export",
+    "export_format",
+    "stats",
+    "stats_window",
+    "compact",
+    "watch",
+    "accounts",
+    "timings",
+    "serve",
+    "socket",
+    "serve_ttl",
+    "no_daemon",
+    "exporter",
+    "exporter_port",
+    "exporter_interval",
+)
+
+
+class DateRange(tuple):
+    """(start date, end date) parsed from a date argument
+
+    spec is the argument as given, or None for a bare flag, which means today.
+    resolve() parses it again, so a bare flag or a relative date follows the
+    current date when a long running --watch passes midnight.
+    """
+
+    def __new__(cls, start_date, end_date, spec=None):
+        date_range = super().__new__(cls, (start_date, end_date))
+        date_range.spec = spec
+        return date_range
+
+    def __getnewargs__(self):
+        return (*self, self.spec)
+
+    def resolve(self):
+        """Return the range this argument means today."""
+        if self.spec is None:
+            return DateRange(datetime.today().date(), None)
+        return parse_date_range(self.spec)
+
+
+def resolve_dates(args):
+    """Return a copy of args with every date argument resolved against today."""
+    return argparse.Namespace(
+        **{
+            name: value.resolve() if isinstance(value, DateRange) else value
+            for name, value in vars(args).items()
+        }
+    )
 
 
 def _get_date_range(delta_days):
@@ -42,7 +111,7 @@ def parse_date_range(date_str):
     """Date parser that handles both absolute and relative dates"""
     relative_result = _parse_relative_dates(date_str)
     if relative_result:
-        return relative_result
+        return DateRange(*relative_result, spec=date_str)
 
     # Handle absolute dates
     dates = date_str.split(",")
@@ -54,10 +123,41 @@ def parse_date_range(date_str):
     except IndexError:
         end_date = None
 
-    return (start_date, end_date)
+    return DateRange(start_date, end_date, spec=date_str)
+
+
+def parse_sync_start(date_str):
+    """Start date parser for --sync, which always syncs up to today"""
+    start_date, end_date = parse_date_range(date_str)
+    if end_date is not None and str(end_date) != datetime.today().strftime("%Y-%m-%d"):
+        raise argparse.ArgumentTypeError(
+            f"{date_str} does not end today, --sync only takes a start date"
+        )
+    return (start_date, None)
+
+
+def has_data_args(args):
+    """Return True if at least one API data argument was requested"""
+    return any(v for k, v in vars(args).items() if k not in OPTION_ARGS)
 
 
-def parse_arguments():
+def _positive_int(value):
+    """Argument type for strictly positive integers"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive integer")
+    return number
+
+
+def _non_negative_int(value):
+    """Argument type for integers greater than or equal to zero"""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a non-negative integer")
+    return number
+
+
+def parse_arguments():  # pylint: disable=too-many-statements
     """Argument parser"""
 
     parser = argparse.ArgumentParser(
@@ -86,6 +186,210 @@ def parse_arguments():
         help="Output raw JSON from the Fitbit API.",
     )
 
+    parser.add_argument(
+        "-n",
+        "--ndjson",
+        action="store_true",
+        help="Stream newline-delimited JSON, one record or sample per line.",
+    )
+
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=_positive_int,
+        default=4,
+        metavar="N",
+        help="Number of API requests sent concurrently (default: 4).",
+    )
+
+    parser.add_argument(
+        "--retries",
+        type=_non_negative_int,
+        default=3,
+        metavar="N",
+        help="Retries per request on HTTP 429/5xx and connection errors (default: 3).",
+    )
+
+    parser.add_argument(
+        "--retry-budget",
+        type=_non_negative_int,
+        default=20,
+        metavar="N",
+        help="Maximum number of retries across the whole run (default: 20).",
+    )
+
+    parser.add_argument(
+        "--range-activities",
+        action="store_true",
+        help="Build --activities date ranges from the activity log list instead of\n"
+        "one request per day. With --raw-json, each day's summary only has\n"
+        "steps, distances, calories and active minutes.",
+    )
+
+    parser.add_argument(
+        "--compact",
+        action=argparse.BooleanOptionalAction,
+        help="Render heart rate and activities as flat tables instead of nested\n"
+        "tables per day (default: automatic above 31 days).",
+    )
+
+    parser.add_argument(
+        "--watch",
+        type=_positive_int,
+        metavar="SECONDS",
+        help="Poll the requested data every SECONDS and show only what changed.\n"
+        "With --json/--ndjson, one line per added, changed or removed record.",
+    )
+
+    parser.add_argument(
+        "--accounts",
+        metavar="PATH",
+        help="Fetch the requested data for every account of PATH concurrently. PATH is\n"
+        "a directory of <account>.json token files or a JSON manifest mapping\n"
+        "account names to token files. Output is tagged by account.",
+    )
+
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Report per-request network timings and time spent parsing, formatting\n"
+        "and rendering on stderr, as JSON with --json/--raw-json/--ndjson.",
+    )
+
+    cache_group = parser.add_argument_group(
+        "Cache",
+        "API responses are cached in ~/.fitbit/cache.db. Past days are kept for 30 days,\n"
+        "today and yesterday for 5 minutes.",
+    )
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the response cache.",
+    )
+    cache_group.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="Ignore cached responses and store fresh ones.",
+    )
+    cache_group.add_argument(
+        "--cache-info",
+        action="store_true",
+        help="Show response cache statistics.",
+    )
+    cache_group.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Remove every cached response.",
+    )
+
+    store_group = parser.add_argument_group(
+        "Local Store",
+        "Metrics can be synced into ~/.fitbit/metrics.db and queried offline.",
+    )
+    store_group.add_argument(
+        "--sync",
+        type=parse_sync_start,
+        nargs="?",
+        const=(None, None),
+        metavar="START_DATE",
+        help="Fetch missing and still mutable days of every metric into the local store.\n"
+        "Without START_DATE, continues from the last sync (first sync: last 30 days).",
+    )
+    store_group.add_argument(
+        "--offline",
+        action="store_true",
+        help="Read data from the local store instead of the Fitbit API.",
+    )
+
+    export_group = parser.add_argument_group(
+        "Export",
+        "Write the requested data to one typed file per table, e.g. sleep.csv, heart.csv\n"
+        "and heart_zones.csv, ready to load into pandas or DuckDB.",
+    )
+    export_group.add_argument(
+        "--export",
+        metavar="DIR",
+        help="Export the requested data into DIR instead of printing it.",
+    )
+    export_group.add_argument(
+        "--export-format",
+        choices=EXPORT_FORMATS,
+        default="csv",
+        help="File format of --export (default: csv). parquet requires pyarrow.",
+    )
+
+    stats_group = parser.add_argument_group(
+        "Statistics",
+        "Summarize resting heart rate, HRV, breathing rate, SpO2, sleep and body series.",
+    )
+    stats_group.add_argument(
+        "--stats",
+        action="store_true",
+        help="Show mean, min/max, percentiles, rolling mean and trend per metric.\n"
+        "Requires numpy.",
+    )
+    stats_group.add_argument(
+        "--stats-window",
+        type=_positive_int,
+        default=7,
+        metavar="N",
+        help="Number of most recent values in the --stats rolling mean (default: 7).",
+    )
+
+    daemon_group = parser.add_argument_group(
+        "Daemon",
+        "A daemon keeps a warm API session and an in-memory cache, and other runs\n"
+        "forward their queries to it while it is running.",
+    )
+    daemon_group.add_argument(
+        "--serve",
+        action="store_true",
+        help="Serve queries on a Unix socket until interrupted.",
+    )
+    daemon_group.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="Unix socket of the daemon (default: ~/.fitbit/daemon.sock).",
+    )
+    daemon_group.add_argument(
+        "--serve-ttl",
+        type=_positive_int,
+        default=60,
+        metavar="SECONDS",
+        help="How long the daemon keeps query results in memory (default: 60).",
+    )
+    daemon_group.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Query the Fitbit API directly even if a daemon is running.",
+    )
+
+    exporter_group = parser.add_argument_group(
+        "Prometheus Exporter",
+        "Serve resting heart rate, HRV, SpO2, breathing rate, device battery and\n"
+        "today's steps and AZM on http://127.0.0.1:PORT/metrics.",
+    )
+    exporter_group.add_argument(
+        "--exporter",
+        action="store_true",
+        help="Scrape the API in the background and serve /metrics until interrupted.",
+    )
+    exporter_group.add_argument(
+        "--exporter-port",
+        type=_positive_int,
+        default=9877,
+        metavar="PORT",
+        help="Port of the /metrics endpoint (default: 9877).",
+    )
+    exporter_group.add_argument(
+        "--exporter-interval",
+        type=_positive_int,
+        default=300,
+        metavar="SECONDS",
+        help="Seconds between API scrapes, 7 requests each (default: 300).\n"
+        "Scrapes wait for the rate limit reset when the budget runs low.",
+    )
+
     group = parser.add_argument_group(
         "APIs",
         "Specify a date, date range (YYYY-MM-DD[,YYYY-MM-DD]), or relative date.\n"
@@ -97,7 +401,7 @@ def parse_arguments():
         "--sleep",
         type=parse_date_range,
         nargs="?",
-        const=(datetime.today().date(), None),
+        const=DateRange(datetime.today().date(), None),
         metavar="DATE[,DATE]|RELATIVE",
         help="Show Sleep Log by Date Range.",
     )
@@ -106,7 +410,7 @@ def parse_arguments():
         "--spo2",
         type=parse_date_range,
         nargs="?",
-        const=(datetime.today().date(), None),
+        const=DateRange(datetime.today().date(), None),
         metavar="DATE[,DATE]|RELATIVE",
         help="Show SpO2 Summary by Interval.",
     )
@@ -115,7 +419,7 @@ def parse_arguments():
         "--heart",
         type=parse_date_range,
         nargs="?",
-        const=(datetime.today().date(), None),
+        const=DateRange(datetime.today().date(), None),
         metavar="DATE[,DATE]|RELATIVE",
         help="Show Heart Rate Time Series by Date Range.",
     )
@@ -124,7 +428,7 @@ def parse_arguments():
         "--active-zone",
         type=parse_date_range,
         nargs="?",
-        const=(datetime.today().date(), None),
+        const=DateRange(datetime.today().date(), None),
         metavar="DATE[,DATE]|RELATIVE",
         help="Show AZM Time Series by Interval.",
     )
@@ -133,7 +437,7 @@ def parse_arguments():
         "--breathing-rate",
         type=parse_date_range,
         nargs="?",
-        const=(datetime.today().date(), None),
+        const=DateRange(datetime.today().date(), None),
         metavar="DATE[,DATE]|RELATIVE",
         help="Show Breathing Rate Summary by Interval.",
     )
@@ -142,7 +446,7 @@ def parse_arguments():
         "--hrv",
         type=parse_date_range,
         nargs="?",
-        const=(datetime.today().date(), None),
+        const=DateRange(datetime.today().date(), None),
         metavar="DATE[,DATE]|RELATIVE",
         help="Show HRV Summary by Interval.",
     )
@@ -151,7 +455,7 @@ def parse_arguments():
         "--body",
         type=parse_date_range,
         nargs="?",
-        const=(datetime.today().date(), None),
+        const=DateRange(datetime.today().date(), None),
         metavar="DATE[,DATE]|RELATIVE",
         help="Show Body Time Series for Weight, BMI, and Body Fat.",
     )
@@ -160,10 +464,35 @@ def parse_arguments():
         "--activities",
         type=parse_date_range,
         nargs="?",
-        const=(datetime.today().date(), None),
+        const=DateRange(datetime.today().date(), None),
         metavar="DATE[,DATE]|RELATIVE",
         help="Show Daily Activity Summary.",
     )
+    group.add_argument(
+        "--spo2-intraday",
+        type=parse_date_range,
+        nargs="?",
+        const=DateRange(datetime.today().date(), None),
+        metavar="DATE[,DATE]|RELATIVE",
+        help="Stream SpO2 Intraday samples (requires --ndjson).",
+    )
+    group.add_argument(
+        "--azm-intraday",
+        type=parse_date_range,
+        nargs="?",
+        const=DateRange(datetime.today().date(), None),
+        metavar="DATE[,DATE]|RELATIVE",
+        help="Stream AZM Intraday samples per minute (requires --ndjson).",
+    )
+    group.add_argument(
+        "--br-intraday",
+        dest="breathing_rate_intraday",
+        type=parse_date_range,
+        nargs="?",
+        const=DateRange(datetime.today().date(), None),
+        metavar="DATE[,DATE]|RELATIVE",
+        help="Stream Breathing Rate Intraday samples (requires --ndjson).",
+    )
     group.add_argument(
         "-u",
         "--user-profile",
@@ -187,13 +516,64 @@ def parse_arguments():
 
     args = parser.parse_args()
 
-    data_args = {
-        k: v
-        for k, v in vars(args).items()
-        if k not in ("json", "raw_json", "init_auth", "version")
-    }
-
-    if not args.init_auth and not any(data_args.values()):
+    standalone = (
+        args.init_auth,
+        args.cache_info,
+        args.clear_cache,
+        args.sync,
+        args.serve,
+        args.exporter,
+    )
+    if not any(standalone) and not has_data_args(args):
         parser.error("No arguments provided. At least one argument is required.")
 
+    intraday = (args.spo2_intraday, args.azm_intraday, args.breathing_rate_intraday)
+    if any(intraday) and not args.ndjson:
+        parser.error("Intraday arguments require --ndjson.")
+
+    if args.offline and (any(intraday) or args.range_activities):
+        parser.error(
+            "--offline cannot be combined with intraday arguments or --range-activities,\n"
+            "the local store keeps daily summaries only."
+        )
+
+    if args.export_format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        parser.error(
+            "--export-format parquet requires pyarrow, install it with: "
+            "pip install fitbit-cli[parquet]"
+        )
+
+    unwatchable = (*intraday, args.export, args.stats, args.serve, args.exporter)
+    if args.watch and any(unwatchable):
+        parser.error(
+            "--watch cannot be combined with intraday arguments, --export, --stats,\n"
+            "--serve or --exporter."
+        )
+    if args.watch and args.raw_json:
+        parser.error(
+            "--watch writes the changed records, use --json or --ndjson instead of\n"
+            "--raw-json."
+        )
+
+    single_account = (
+        *intraday,
+        args.export,
+        args.stats,
+        args.serve,
+        args.exporter,
+        args.watch,
+        args.sync,
+        args.offline,
+    )
+    if args.accounts and any(single_account):
+        parser.error(
+            "--accounts only supports table, --json, --raw-json and --ndjson output of\n"
+            "summary data."
+        )
+
+    if args.stats and importlib.util.find_spec("numpy") is None:
+        parser.error(
+            "--stats requires numpy, install it with: pip install fitbit-cli[stats]"
+        )
+
     return args
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+Daemon serving API queries over a Unix socket
+"""
+
+import os
+import socket
+import socketserver
+import threading
+import time
+from datetime import date
+from functools import partial
+from pathlib import Path
+
+from .endpoints import FitbitEndpoints
+from .exceptions import FitbitAPIError
+from .jsonlib import dumps, loads
+
+FITBIT_SOCKET_PATH = f"{Path.home()}/.fitbit/daemon.sock"
+DEFAULT_TTL = 60
+CLIENT_TIMEOUT = 60
+
+# Only the read-only getters can be called through the socket
+QUERY_METHODS = frozenset(
+    name for name in dir(FitbitEndpoints) if name.startswith("get_")
+)
+
+# The protocol is one JSON object per line in each direction:
+#   -> {"method": "get_hrv_summary", "args": ["2024-01-01", "2024-01-07"]}
+#   <- {"result": {...}}  or  {"error": "message"}
+
+
+class TTLCache:  # pylint: disable=too-few-public-methods
+    """In-memory cache of query results that fetches each missing key only once
+
+    Concurrent lookups of the same missing key wait for the first one to fetch
+    it instead of sending the same request again. Expired entries are evicted
+    whenever a value is stored, so the cache only holds live results.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def _fresh(self, key):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > self._clock():
+            return entry
+        return None
+
+    def get_or_fetch(self, key, fetch):
+        """Return the cached value of key, calling fetch() when it is missing or expired."""
+        with self._lock:
+            entry = self._fresh(key)
+            if entry is not None:
+                return entry[1]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                entry = self._fresh(key)
+            if entry is not None:
+                return entry[1]
+            try:
+                value = fetch()
+                with self._lock:
+                    self._evict_expired()
+                    self._entries[key] = (self._clock() + self.ttl, value)
+            finally:
+                # Waiters hold their own reference, later lookups find the entry
+                with self._lock:
+                    if self._key_locks.get(key) is key_lock:
+                        del self._key_locks[key]
+            return value
+
+    def _evict_expired(self):
+        now = self._clock()
+        for key in [key for key, entry in self._entries.items() if entry[0] <= now]:
+            del self._entries[key]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class _QueryHandler(socketserver.StreamRequestHandler):
+    """Answer every request line of a connection"""
+
+    def handle(self):
+        for line in self.rfile:
+            response = self.server.dispatch(line)
+            self.wfile.write(dumps(response).encode("utf-8") + b"\n")
+
+
+class DaemonServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server answering get_* queries from a warm client and a TTL cache"""
+
+    daemon_threads = True
+
+    def __init__(self, fitbit, path=FITBIT_SOCKET_PATH, ttl=DEFAULT_TTL):
+        self.fitbit = fitbit
+        self.cache = TTLCache(ttl)
+        _remove_stale_socket(path)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Health data, so only the owner may connect. The socket is created
+        # 0600 by binding under a restrictive umask, a chmod after bind would
+        # leave a window in which other users can connect.
+        umask = os.umask(0o177)
+        try:
+            super().__init__(path, _QueryHandler)
+        finally:
+            os.umask(umask)
+
+    def query(self, method, args=(), kwargs=None):
+        """Return the result of fitbit.method(*args, **kwargs), cached for the TTL."""
+        kwargs = kwargs or {}
+        key = dumps([method, list(args), kwargs])
+        return self.cache.get_or_fetch(
+            key, lambda: getattr(self.fitbit, method)(*args, **kwargs)
+        )
+
+    def dispatch(self, line):
+        """Run one request line and return its response object."""
+        try:
+            request = loads(line)
+            method = request.get("method")
+            if method not in QUERY_METHODS:
+                return {"error": f"Unknown query: {method}"}
+            return {
+                "result": self.query(
+                    method, request.get("args", []), request.get("kwargs")
+                )
+            }
+        except FitbitAPIError as e:
+            return {"error": e.message}
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Keep serving other clients, the caller gets the error instead
+            return {"error": f"{type(e).__name__}: {e}"}
+
+    def server_close(self):
+        super().server_close()
+        Path(self.server_address).unlink(missing_ok=True)
+
+
+def _remove_stale_socket(path):
+    """Remove a socket file left behind by a daemon that is no longer running."""
+    if not os.path.exists(path):
+        return
+    if daemon_running(path):
+        raise FitbitAPIError(f"A fitbit-cli daemon is already serving on {path}")
+    os.unlink(path)
+
+
+def daemon_running(path=FITBIT_SOCKET_PATH):
+    """Return whether a daemon accepts connections on path."""
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def serve(fitbit, path=FITBIT_SOCKET_PATH, ttl=DEFAULT_TTL):
+    """Serve queries on path until interrupted."""
+    with DaemonServer(fitbit, path, ttl) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+class DaemonClient:
+    """FitbitAPI compatible client that forwards every get_* call to a running daemon"""
+
+    def __init__(self, path=FITBIT_SOCKET_PATH, timeout=CLIENT_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+
+    def __getattr__(self, name):
+        if name not in QUERY_METHODS:
+            raise AttributeError(name)
+        return partial(self.call, name)
+
+    def call(self, method, *args, **kwargs):
+        """Send one query to the daemon and return its result."""
+        request = {
+            "method": method,
+            "args": [str(a) if isinstance(a, date) else a for a in args],
+            "kwargs": kwargs,
+        }
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            sock.sendall(dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+        if not line:
+            raise FitbitAPIError("The fitbit-cli daemon closed the connection")
+        response = loads(line)
+        if "error" in response:
+            raise FitbitAPIError(response["error"])
+        return response["result"]
+
+    def close(self):
+        """Nothing to release, every call uses its own connection."""
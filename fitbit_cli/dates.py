@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""
+Date helpers
+"""
+
+from datetime import date, datetime, timedelta
+
+
+def to_date(value):
+    """Convert a YYYY-MM-DD string or date into a date object."""
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def iter_days(start_date, end_date):
+    """Yield every day between start_date and end_date (inclusive) as YYYY-MM-DD."""
+    start, end = to_date(start_date), to_date(end_date)
+    for i in range((end - start).days + 1):
+        yield (start + timedelta(days=i)).strftime("%Y-%m-%d")
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+Fitbit API endpoints
+"""
+
+import time
+
+from .exceptions import FitbitInitError
+from .fitbit_setup import REFRESH_MARGIN, expires_at, read_fitbit_token
+
+
+class FitbitEndpoints:
+    """Fitbit Web API endpoints shared by the sync and async clients
+
+    Subclasses provide ``_get_json(url)`` and ``_get_range_json(...)``. Every
+    getter returns whatever those return, i.e. a payload for FitbitAPI and an
+    awaitable payload for AsyncFitbitAPI.
+    """
+
+    TOKEN_API = "https://api.fitbit.com/oauth2/token"
+
+    def _get_json(self, url):
+        """GET a JSON resource"""
+        raise NotImplementedError
+
+    # Set by the concrete client
+    client_id = client_secret = access_token = refresh_token = headers = None
+    # Epoch time the access token expires at, None when unknown
+    expires_at = None
+    # Token file of the account, None for the default ~/.fitbit/token.json
+    token_path = None
+
+    def _get_range_json(self, url, start_date, end_date, max_days, period=None):
+        """GET a date range JSON resource"""
+        raise NotImplementedError
+
+    def _refresh_request(self):
+        """Return the form payload and headers of a token refresh request."""
+        payload = {
+            "grant_type": "refresh_token",
+            "client_id": self.client_id,
+            "refresh_token": self.refresh_token,
+        }
+        headers = {
+            "Authorization": f"Basic {self.client_secret}",
+            "Content-Type": "application/x-www-form-urlencoded",
+        }
+        return payload, headers
+
+    def _token_expiring(self):
+        """Return whether the access token expires within REFRESH_MARGIN."""
+        return (
+            self.expires_at is not None
+            and time.time() >= self.expires_at - REFRESH_MARGIN
+        )
+
+    def _set_tokens(self, access_token, refresh_token, token_expires_at):
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.expires_at = token_expires_at
+        self.headers = self._create_headers()
+
+    def _apply_refresh_response(self, tokens):
+        """Take the tokens of a successful refresh response."""
+        self._set_tokens(
+            tokens.get("access_token"),
+            tokens.get("refresh_token"),
+            expires_at(tokens.get("expires_in")),
+        )
+
+    def _adopt_stored_token(self):
+        """Take the token another process has refreshed, if the token file has one.
+
+        Call it while holding TokenFileLock. Returns whether a token was adopted.
+        """
+        try:
+            stored = read_fitbit_token(self.token_path)
+        except FitbitInitError:
+            return False
+        if stored.get("refresh_token") in (None, self.refresh_token):
+            return False
+        self._set_tokens(
+            stored["access_token"], stored["refresh_token"], stored.get("expires_at")
+        )
+        return True
+
+    def _create_headers(self):
+        return {
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json",
+        }
+
+    def get_user_profile(self):
+        """Get Profile"""
+
+        url = "https://api.fitbit.com/1/user/-/profile.json"
+        return self._get_json(url)
+
+    def get_devices(self):
+        """Get Devices"""
+
+        url = "https://api.fitbit.com/1/user/-/devices.json"
+        return self._get_json(url)
+
+    def get_sleep_log(self, start_date, end_date=None):
+        """Get Sleep Logs by Date Range and Date"""
+
+        url = "https://api.fitbit.com/1.2/user/-/sleep/date/{date_range}.json"
+        return self._get_range_json(url, start_date, end_date, max_days=100)
+
+    def get_heart_rate_time_series(self, start_date, end_date=None):
+        """Get Heart Rate Time Series by Date Range and Date"""
+
+        url = "https://api.fitbit.com/1/user/-/activities/heart/date/{date_range}.json"
+        return self._get_range_json(
+            url, start_date, end_date, max_days=365, period="1d"
+        )
+
+    def get_spo2_summary(self, start_date, end_date=None):
+        """Get SpO2 Summary by Interval and Date"""
+
+        url = "https://api.fitbit.com/1/user/-/spo2/date/{date_range}.json"
+        return self._get_range_json(url, start_date, end_date, max_days=30)
+
+    def get_spo2_intraday(self, start_date, end_date=None):
+        """Get SpO2 Intraday by Interval and Date"""
+
+        url = "https://api.fitbit.com/1/user/-/spo2/date/{date_range}/all.json"
+        return self._get_range_json(url, start_date, end_date, max_days=30)
+
+    def get_azm_time_series(self, start_date, end_date=None):
+        """Get AZM Time Series by Interval and Data"""
+
+        url = "https://api.fitbit.com/1/user/-/activities/active-zone-minutes/date/{date_range}.json"
+        return self._get_range_json(
+            url, start_date, end_date, max_days=1095, period="1d"
+        )
+
+    def get_azm_intraday(self, start_date, end_date=None):
+        """Get AZM Intraday by Interval and Data"""
+
+        url = "https://api.fitbit.com/1/user/-/activities/active-zone-minutes/date/{date_range}/1min.json"
+        return self._get_range_json(url, start_date, end_date, max_days=1, period="1d")
+
+    def get_breathing_rate_summary(self, start_date, end_date=None):
+        """Get Breathing Rate Summary by Interval and Data"""
+
+        url = "https://api.fitbit.com/1/user/-/br/date/{date_range}.json"
+        return self._get_range_json(url, start_date, end_date, max_days=30)
+
+    def get_breathing_rate_intraday(self, start_date, end_date=None):
+        """Get Breathing Rate Intraday by Interval and Data"""
+
+        url = "https://api.fitbit.com/1/user/-/br/date/{date_range}/all.json"
+        return self._get_range_json(url, start_date, end_date, max_days=30)
+
+    def get_hrv_summary(self, start_date, end_date=None):
+        """Get HRV Summary by Interval and Date"""
+
+        url = "https://api.fitbit.com/1/user/-/hrv/date/{date_range}.json"
+        return self._get_range_json(url, start_date, end_date, max_days=30)
+
+    def get_body_time_series(self, resource_path, start_date, end_date=None):
+        """Get Body Time Series by Interval and Date"""
+
+        url = f"https://api.fitbit.com/1/user/-/body/{resource_path}/date/{{date_range}}.json"
+        return self._get_range_json(
+            url, start_date, end_date, max_days=1095, period="1d"
+        )
+
+    def get_daily_activity_summary(self, start_date):
+        """Get Daily Activity Summary"""
+
+        url = f"https://api.fitbit.com/1/user/-/activities/date/{start_date}.json"
+        return self._get_json(url)
+
+    def get_activity_time_series(self, resource_path, start_date, end_date=None):
+        """Get Activity Time Series by Date Range and Date"""
+
+        url = f"https://api.fitbit.com/1/user/-/activities/{resource_path}/date/{{date_range}}.json"
+        return self._get_range_json(
+            url, start_date, end_date, max_days=1095, period="1d"
+        )
+
+    def get_activity_log_list(self, after_date, limit=100, offset=0):
+        """Get Activity Log List after a Date"""
+
+        url = (
+            "https://api.fitbit.com/1/user/-/activities/list.json"
+            f"?afterDate={after_date}&sort=asc&limit={limit}&offset={offset}"
+        )
+        return self._get_json(url)
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar export of formatted sections
+"""
+
+import csv
+from datetime import date
+from itertools import islice
+from pathlib import Path
+
+BATCH_SIZE = 1000
+EXPORT_FORMATS = ("csv", "parquet")
+
+SLEEP_COLUMNS = (
+    ("date", "date"),
+    ("deep_minutes", "int"),
+    ("light_minutes", "int"),
+    ("rem_minutes", "int"),
+    ("wake_minutes", "int"),
+    ("efficiency", "int"),
+    ("time_in_bed_hours", "float"),
+)
+SPO2_COLUMNS = (("date", "date"), ("min", "float"), ("avg", "float"), ("max", "float"))
+HEART_COLUMNS = (("date", "date"), ("resting_heart_rate", "int"))
+HEART_ZONE_COLUMNS = (
+    ("date", "date"),
+    ("name", "str"),
+    ("min", "int"),
+    ("max", "int"),
+    ("minutes", "int"),
+    ("calories_out", "float"),
+)
+AZM_COLUMNS = (
+    ("date", "date"),
+    ("active_zone_minutes", "int"),
+    ("fat_burn_minutes", "int"),
+    ("cardio_minutes", "int"),
+    ("peak_minutes", "int"),
+)
+BREATHING_RATE_COLUMNS = (("date", "date"), ("breathing_rate", "float"))
+HRV_COLUMNS = (("date", "date"), ("daily_rmssd", "float"), ("deep_rmssd", "float"))
+BODY_COLUMNS = (
+    ("date", "date"),
+    ("weight", "float"),
+    ("bmi", "float"),
+    ("fat", "float"),
+)
+ACTIVITY_COLUMNS = (
+    ("date", "date"),
+    ("start_time", "str"),
+    ("name", "str"),
+    ("description", "str"),
+    ("distance", "float"),
+    ("distance_unit", "str"),
+    ("steps", "int"),
+    ("calories", "int"),
+    ("duration_minutes", "float"),
+)
+DEVICE_COLUMNS = (
+    ("battery_level", "int"),
+    ("device", "str"),
+    ("type", "str"),
+    ("last_sync_time", "str"),
+    ("mac_address", "str"),
+)
+
+
+def _heart_zones(records):
+    for record in records:
+        for zone in record.get("zones", []):
+            yield {"date": record.get("date"), **zone}
+
+
+def _activities(records):
+    for day in records:
+        for activity in day.get("activities", []):
+            distance, _, unit = (activity.get("distance") or "").partition(" ")
+            yield {
+                **activity,
+                "date": day.get("date"),
+                "distance": distance or None,
+                "distance_unit": unit or None,
+            }
+
+
+def _records(records):
+    return iter(records)
+
+
+# Section -> tables as (table name, columns, records -> row dicts)
+EXPORT_TABLES = {
+    "devices": (("devices", DEVICE_COLUMNS, _records),),
+    "sleep": (("sleep", SLEEP_COLUMNS, _records),),
+    "spo2": (("spo2", SPO2_COLUMNS, _records),),
+    "heart": (
+        ("heart", HEART_COLUMNS, _records),
+        ("heart_zones", HEART_ZONE_COLUMNS, _heart_zones),
+    ),
+    "active_zone": (("active_zone", AZM_COLUMNS, _records),),
+    "breathing_rate": (("breathing_rate", BREATHING_RATE_COLUMNS, _records),),
+    "hrv": (("hrv", HRV_COLUMNS, _records),),
+    "body": (("body", BODY_COLUMNS, _records),),
+    "activities": (("activities", ACTIVITY_COLUMNS, _activities),),
+}
+
+
+def _cast(value, column_type):
+    """Convert a formatted value to the Python type of its column."""
+    if value is None or value == "":
+        return None
+    if column_type == "int":
+        return int(float(value))
+    if column_type == "float":
+        return float(value)
+    if column_type == "date":
+        return date.fromisoformat(str(value))
+    return str(value)
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+class CSVTableWriter:
+    """Writes one table as a CSV file with a header row"""
+
+    suffix = "csv"
+
+    def __init__(self, path, columns):
+        self._file = open(  # pylint: disable=consider-using-with
+            path, "w", newline="", encoding="utf-8"
+        )
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([name for name, _ in columns])
+
+    def write_batch(self, rows):
+        """Write a batch of typed rows."""
+        self._writer.writerows(
+            ["" if value is None else value for value in row] for row in rows
+        )
+
+    def close(self):
+        """Flush and close the file."""
+        self._file.close()
+
+
+class ParquetTableWriter:
+    """Writes one table as a Parquet file, one row group per batch"""
+
+    suffix = "parquet"
+    ARROW_TYPES = {
+        "date": "date32",
+        "int": "int64",
+        "float": "float64",
+        "str": "string",
+    }
+
+    def __init__(self, path, columns):
+        try:
+            import pyarrow  # pylint: disable=import-outside-toplevel
+            import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+        except ImportError as e:
+            raise ImportError(
+                "Parquet export requires pyarrow, install it with: pip install fitbit-cli[parquet]"
+            ) from e
+        self._pa = pyarrow
+        self._schema = pyarrow.schema(
+            [
+                (name, getattr(pyarrow, self.ARROW_TYPES[column_type])())
+                for name, column_type in columns
+            ]
+        )
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+
+    def write_batch(self, rows):
+        """Write a batch of typed rows as one row group."""
+        columns = list(zip(*rows))
+        self._writer.write_table(
+            self._pa.Table.from_arrays(
+                [
+                    self._pa.array(values, type=field.type)
+                    for values, field in zip(columns, self._schema)
+                ],
+                schema=self._schema,
+            )
+        )
+
+    def close(self):
+        """Write the footer and close the file."""
+        self._writer.close()
+
+
+TABLE_WRITERS = {"csv": CSVTableWriter, "parquet": ParquetTableWriter}
+
+
+def _write_table(writer_class, path, columns, records, batch_size):
+    """Cast records to the column types and write them in batches, returning the row count."""
+    writer = writer_class(path, columns)
+    rows = 0
+    try:
+        typed = (
+            tuple(_cast(record.get(col), kind) for col, kind in columns)
+            for record in records
+        )
+        for batch in _batches(typed, batch_size):
+            writer.write_batch(batch)
+            rows += len(batch)
+    finally:
+        writer.close()
+    return rows
+
+
+def export_sections(sections, directory, file_format="csv", batch_size=BATCH_SIZE):
+    """Write formatted sections to one typed columnar file per table.
+
+    sections yields (section name, formatter JSON output) as produced by
+    ``render_sections(..., as_json=True)``. Rows are typed and written in
+    batches of batch_size, so long ranges never build a second copy of the
+    data. Returns one summary dict per written table.
+    """
+    writer_class = TABLE_WRITERS[file_format]
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    summary = []
+    for name, section in sections:
+        for table, columns, flatten in EXPORT_TABLES.get(name, ()):
+            path = Path(directory) / f"{table}.{writer_class.suffix}"
+            rows = _write_table(
+                writer_class, path, columns, flatten(section[name]), batch_size
+            )
+            summary.append({"table": table, "path": str(path), "rows": rows})
+    return summary
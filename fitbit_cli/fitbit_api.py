@@ -3,172 +3,259 @@
 Fitbit API
 """
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
 
+from . import timings
+from .chunking import merge_payloads, split_range
+from .endpoints import FitbitEndpoints
 from .exceptions import FitbitAPIError
-from .fitbit_setup import update_fitbit_token
-
-
-class FitbitAPI:
-    """Fitbit API"""
+from .fitbit_setup import TokenFileLock, update_fitbit_token
+from .jsonlib import loads
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
 
-    TOKEN_API = "https://api.fitbit.com/oauth2/token"
 
-    def __init__(self, client_id, client_secret, access_token, refresh_token):
+def _error_detail(response):
+    """Return the JSON error body of a response, or its text for non-JSON errors."""
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
+
+
+class FitbitAPI(FitbitEndpoints):  # pylint: disable=too-many-instance-attributes
+    """Fitbit API
+
+    At most ``workers`` requests are in flight at once, however many threads
+    call the client, e.g. the section pool of the output modes and the chunk
+    pool of long ranges together. The connection pool defaults to that bound
+    plus one connection for token refreshes, so no connection is discarded.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        client_id,
+        client_secret,
+        access_token,
+        refresh_token,
+        pool_size=None,
+        cache=None,
+        workers=4,
+        retry_policy=None,
+        expires_at=None,
+        token_path=None,
+        conditional_requests=False,
+    ):
         self.client_id = client_id
         self.client_secret = client_secret
         self.access_token = access_token
         self.refresh_token = refresh_token
+        self.expires_at = expires_at
+        self.token_path = token_path
+        self._token_lock = threading.Lock()
+        self.workers = workers
+        self._in_flight = threading.BoundedSemaphore(workers)
+        self.session = self._create_session(
+            workers + 1 if pool_size is None else pool_size
+        )
         self.headers = self._create_headers()
-
-    def _create_headers(self):
-        return {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json",
-        }
-
-    def refresh_access_token(self):
-        """Refresh token"""
-
-        payload = {
-            "grant_type": "refresh_token",
-            "client_id": self.client_id,
-            "refresh_token": self.refresh_token,
-        }
-        headers = {
-            "Authorization": f"Basic {self.client_secret}",
-            "Content-Type": "application/x-www-form-urlencoded",
-        }
-        response = requests.post(
+        self.cache = cache
+        self.rate_limiter = RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        # url -> (ETag, Last-Modified, payload) of the last response
+        self.conditional_requests = conditional_requests
+        self._validators = {}
+
+    @staticmethod
+    def _create_session(pool_size):
+        """Create a keep-alive session whose connection pool is shared by all requests."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.headers.update({"Connection": "keep-alive"})
+        return session
+
+    def close(self):
+        """Close the underlying HTTP session and the response cache."""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def refresh_access_token(self, expired_token=None):
+        """Refresh token
+
+        Concurrent callers that all hit a 401 with the same expired token only
+        trigger a single refresh; the others reuse the new token. Across
+        processes the token file lock does the same: a token another process
+        has already refreshed is adopted instead of refreshing it again.
+        """
+
+        with self._token_lock:
+            if expired_token is not None and expired_token != self.access_token:
+                return
+            with TokenFileLock(self.token_path):
+                if not self._adopt_stored_token():
+                    self._refresh_access_token()
+
+    def _refresh_access_token(self):
+        payload, headers = self._refresh_request()
+        response = self.session.post(
             FitbitAPI.TOKEN_API, data=payload, headers=headers, timeout=5
         )
 
+        timings.record_token_refresh()
         if response.status_code == 200:
-            tokens = response.json()
-            self.access_token = tokens.get("access_token")
-            self.refresh_token = tokens.get("refresh_token")
-            self.headers = self._create_headers()
-            update_fitbit_token(self.access_token, self.refresh_token)
+            self._apply_refresh_response(response.json())
+            update_fitbit_token(
+                self.access_token,
+                self.refresh_token,
+                self.expires_at,
+                path=self.token_path,
+            )
         else:
-            raise FitbitAPIError(f"Failed to refresh access token: {response.json()}")
+            raise FitbitAPIError(
+                f"Failed to refresh access token: {_error_detail(response)}"
+            )
+
+    @property
+    def rate_limit(self):
+        """Last known Fitbit rate limit budget (limit, remaining, reset_in seconds)"""
+        return self.rate_limiter.budget()
+
+    def _send(self, method, url, headers, attempt=0, **kwargs):
+        """Send one request once an in-flight slot and the rate limiter allow it."""
+        queued = time.perf_counter()
+        with self._in_flight:
+            self.rate_limiter.acquire()
+            sent = time.perf_counter()
+            response = None
+            try:
+                response = self.session.request(
+                    method, url, headers=headers, timeout=5, **kwargs
+                )
+            finally:
+                self.rate_limiter.update(
+                    response.headers if response is not None else {}
+                )
+                timings.record_request(
+                    method,
+                    url,
+                    response,
+                    time.perf_counter() - sent,
+                    attempt,
+                    sent - queued,
+                )
+        return response
+
+    def _send_with_retries(self, method, url, headers, **kwargs):
+        """Send a request, retrying connection errors and transient HTTP statuses."""
+        attempt = 0
+        while True:
+            try:
+                response = self._send(method, url, headers, attempt, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if not self.retry_policy.consume(attempt):
+                    raise
+                self.retry_policy.wait(attempt)
+            else:
+                if response.status_code not in self.retry_policy.statuses:
+                    return response
+                if not self.retry_policy.consume(attempt):
+                    return response
+                self.retry_policy.wait(attempt, response.headers.get("Retry-After"))
+            attempt += 1
 
     def make_request(self, method, url, **kwargs):
-        """Make an API request and handle token refresh if needed."""
+        """Make an API request and handle token refresh and retries if needed."""
 
+        access_token = self.access_token
+        if self._token_expiring():
+            self.refresh_access_token(expired_token=access_token)
+        access_token = self.access_token
+        headers = self._request_headers(method, url)
         try:
-            response = requests.request(
-                method, url, headers=self.headers, timeout=5, **kwargs
-            )
+            response = self._send_with_retries(method, url, headers, **kwargs)
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
             if response.status_code == 401:
-                self.refresh_access_token()
-                response = requests.request(
-                    method, url, headers=self.headers, timeout=5, **kwargs
+                self.refresh_access_token(expired_token=access_token)
+                response = self._send_with_retries(
+                    method, url, self._request_headers(method, url), **kwargs
                 )
                 response.raise_for_status()
             else:
-                raise FitbitAPIError(f"HTTP error occurred: {response.json()}") from e
+                raise FitbitAPIError(
+                    f"HTTP error occurred: {_error_detail(response)}"
+                ) from e
 
         return response
 
-    def get_user_profile(self):
-        """Get Profile"""
-
-        url = "https://api.fitbit.com/1/user/-/profile.json"
+    def _request_headers(self, method, url):
+        """Return the request headers, conditional on the last response of a GET."""
+        validator = self._validators.get(url) if method == "GET" else None
+        if validator is None:
+            return self.headers
+        etag, last_modified, _ = validator
+        headers = dict(self.headers)
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def _get_json(self, url):
+        """GET a JSON resource, serving it from the response cache when possible.
+
+        With conditional_requests, the ETag and Last-Modified of each response
+        are remembered and sent back on the next request of the URL, and a 304
+        Not Modified reuses the previous payload.
+        """
+
+        if self.cache is not None:
+            body = self.cache.get(url)
+            if body is not None:
+                timings.record_cache_hit(url)
+                with timings.phase("parse"):
+                    return loads(body)
         response = self.make_request("GET", url)
-        return response.json()
-
-    def get_devices(self):
-        """Get Devices"""
-
-        url = "https://api.fitbit.com/1/user/-/devices.json"
-        response = self.make_request("GET", url)
-        return response.json()
-
-    def get_sleep_log(self, start_date, end_date=None):
-        """Get Sleep Logs by Date Range and Date"""
-
-        date_range = f"{start_date}/{end_date}" if end_date else start_date
-        url = f"https://api.fitbit.com/1.2/user/-/sleep/date/{date_range}.json"
-        response = self.make_request("GET", url)
-        return response.json()
-
-    def get_heart_rate_time_series(self, start_date, end_date=None):
-        """Get Heart Rate Time Series by Date Range and Date"""
-
-        date_range = f"{start_date}/{end_date}" if end_date else f"{start_date}/1d"
-        url = f"https://api.fitbit.com/1/user/-/activities/heart/date/{date_range}.json"
-        response = self.make_request("GET", url)
-        return response.json()
-
-    def get_spo2_summary(self, start_date, end_date=None):
-        """Get SpO2 Summary by Interval and Date"""
-
-        date_range = f"{start_date}/{end_date}" if end_date else start_date
-        url = f"https://api.fitbit.com/1/user/-/spo2/date/{date_range}.json"
-        response = self.make_request("GET", url)
-        return response.json()
-
-    def get_spo2_intraday(self, start_date, end_date=None):
-        """Get SpO2 Intraday by Interval and Date"""
-
-        date_range = f"{start_date}/{end_date}" if end_date else start_date
-        url = f"https://api.fitbit.com/1/user/-/spo2/date/{date_range}/all.json"
-        response = self.make_request("GET", url)
-        return response.json()
-
-    def get_azm_time_series(self, start_date, end_date=None):
-        """Get AZM Time Series by Interval and Data"""
-
-        date_range = f"{start_date}/{end_date}" if end_date else f"{start_date}/1d"
-        url = f"https://api.fitbit.com/1/user/-/activities/active-zone-minutes/date/{date_range}.json"
-        response = self.make_request("GET", url)
-        return response.json()
-
-    def get_azm_intraday(self, start_date, end_date=None):
-        """Get AZM Intraday by Interval and Data"""
-
-        date_range = f"{start_date}/{end_date}" if end_date else f"{start_date}/1d"
-        url = f"https://api.fitbit.com/1/user/-/activities/active-zone-minutes/date/{date_range}/1min.json"
-        response = self.make_request("GET", url)
-        return response.json()
-
-    def get_breathing_rate_summary(self, start_date, end_date=None):
-        """Get Breathing Rate Summary by Interval and Data"""
-
-        date_range = f"{start_date}/{end_date}" if end_date else start_date
-        url = f"https://api.fitbit.com/1/user/-/br/date/{date_range}.json"
-        response = self.make_request("GET", url)
-        return response.json()
-
-    def get_breathing_rate_intraday(self, start_date, end_date=None):
-        """Get Breathing Rate Intraday by Interval and Data"""
-
-        date_range = f"{start_date}/{end_date}" if end_date else start_date
-        url = f"https://api.fitbit.com/1/user/-/br/date/{date_range}/all.json"
-        response = self.make_request("GET", url)
-        return response.json()
-
-    def get_hrv_summary(self, start_date, end_date=None):
-        """Get HRV Summary by Interval and Date"""
-
-        date_range = f"{start_date}/{end_date}" if end_date else start_date
-        url = f"https://api.fitbit.com/1/user/-/hrv/date/{date_range}.json"
-        response = self.make_request("GET", url)
-        return response.json()
-
-    def get_body_time_series(self, resource_path, start_date, end_date=None):
-        """Get Body Time Series by Interval and Date"""
-
-        date_range = f"{start_date}/{end_date}" if end_date else f"{start_date}/1d"
-        url = f"https://api.fitbit.com/1/user/-/body/{resource_path}/date/{date_range}.json"
-        response = self.make_request("GET", url)
-        return response.json()
-
-    def get_daily_activity_summary(self, start_date):
-        """Get Daily Activity Summary"""
-
-        url = f"https://api.fitbit.com/1/user/-/activities/date/{start_date}.json"
-        response = self.make_request("GET", url)
-        return response.json()
+        if response.status_code == 304:
+            return self._validators[url][2]
+        if self.cache is not None:
+            self.cache.set(url, response.text)
+        with timings.phase("parse"):
+            payload = loads(response.content)
+        if self.conditional_requests:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self._validators[url] = (etag, last_modified, payload)
+        return payload
+
+    def _get_range_json(self, url, start_date, end_date, max_days, period=None):
+        """GET a date range resource, splitting ranges longer than max_days.
+
+        url contains a ``{date_range}`` placeholder. A single date is requested
+        as ``start`` or ``start/period``. Ranges the endpoint does not accept in
+        one call are fetched concurrently in chunks and merged back into the
+        shape of a single response. The chunks share the client's in-flight
+        limit with every other request.
+        """
+
+        if not end_date:
+            date_range = f"{start_date}/{period}" if period else start_date
+            return self._get_json(url.format(date_range=date_range))
+
+        spans = split_range(start_date, end_date, max_days)
+        if len(spans) == 1:
+            return self._get_json(url.format(date_range=f"{start_date}/{end_date}"))
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(spans))) as executor:
+            payloads = executor.map(
+                lambda span: self._get_json(url.format(date_range="/".join(span))),
+                spans,
+            )
+            return merge_payloads(list(payloads))
@@ -3,23 +3,21 @@
 Fitbit initial setup
 """
 
-import getpass
 import json
-import secrets
-import string
-import threading
-import webbrowser
-from base64 import b64encode, urlsafe_b64encode
-from hashlib import sha256
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import os
+import time
 from pathlib import Path
-from urllib.parse import parse_qs, urlparse
-
-import requests
-from rich.prompt import Prompt
 
 from .exceptions import FitbitInitError
-from .formatter import CONSOLE
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None
+
+# The interactive setup pulls in requests, rich, http.server and webbrowser.
+# They are imported on --init-auth only, so reading the token stays cheap.
+# pylint: disable=import-outside-toplevel
 
 BASE_URL = "https://www.fitbit.com/oauth2/authorize"
 FITBIT_TOKEN_PATH = f"{Path.home()}/.fitbit/token.json"
@@ -41,39 +39,99 @@ SCOPE = [
     "weight",
 ]
 TOKEN_URL = "https://api.fitbit.com/oauth2/token"
+# Refresh the access token this many seconds before it expires
+REFRESH_MARGIN = 300
 
 
-class RequestHandler(BaseHTTPRequestHandler):
-    """Simple HTTP request handler"""
+class TokenFileLock:
+    """Exclusive lock on the token file, shared by every process that refreshes it
 
-    code = None
+    A refresh token is single use, so the read, refresh and write of the token
+    file must not interleave between parallel fitbit-cli runs.
+    """
+
+    def __init__(self, path=None):
+        self.path = f"{path or FITBIT_TOKEN_PATH}.lock"
+        self._file = None
+
+    def acquire(self):
+        """Block until the lock is held."""
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(  # pylint: disable=consider-using-with
+            self.path, "a", encoding="utf-8"
+        )
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_EX)
 
-    def do_GET(self):  # pylint: disable=C0103
-        """Handle GET request"""
-        parsed_url = urlparse(self.path)
-        query_params = parse_qs(parsed_url.query)
-        RequestHandler.code = query_params.get("code", [""])[0]
+    def release(self):
+        """Release the lock."""
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
 
-        self.send_response(200)
-        self.send_header("Content-type", "text/html")
-        self.end_headers()
-        self.wfile.write(b"You can close this window now")
+    def __enter__(self):
+        self.acquire()
+        return self
 
-        threading.Thread(target=self.server.shutdown).start()
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+def expires_at(expires_in):
+    """Return the epoch time a token valid for expires_in seconds expires at."""
+    return time.time() + expires_in if expires_in else None
 
 
 def start_server():
     """Start simple HTTP server to catch token"""
 
+    import threading
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from urllib.parse import parse_qs, urlparse
+
+    from . import formatter as fmt
+
+    class RequestHandler(BaseHTTPRequestHandler):
+        """Simple HTTP request handler"""
+
+        code = None
+
+        def do_GET(self):  # pylint: disable=C0103
+            """Handle GET request"""
+            parsed_url = urlparse(self.path)
+            query_params = parse_qs(parsed_url.query)
+            RequestHandler.code = query_params.get("code", [""])[0]
+
+            self.send_response(200)
+            self.send_header("Content-type", "text/html")
+            self.end_headers()
+            self.wfile.write(b"You can close this window now")
+
+            threading.Thread(target=self.server.shutdown).start()
+
     with HTTPServer(("127.0.0.1", 8080), RequestHandler) as httpd:
-        CONSOLE.print(":computer: Serving on http://127.0.0.1:8080")
+        fmt.CONSOLE.print(":computer: Serving on http://127.0.0.1:8080")
         httpd.serve_forever()
     return RequestHandler.code
 
 
-def fitbit_init_setup():
+def fitbit_init_setup():  # pylint: disable=too-many-locals
     """Fitbit initial setup"""
 
+    import getpass
+    import secrets
+    import string
+    import webbrowser
+    from base64 import b64encode, urlsafe_b64encode
+    from hashlib import sha256
+    from urllib.parse import parse_qs, urlparse
+
+    import requests
+    from rich.prompt import Prompt
+
+    from . import formatter as fmt
+
     # --------- Generate code challenge using random strings ---------
     code_verifier = "".join(
         secrets.choice(string.ascii_letters + string.digits) for _ in range(128)
@@ -95,13 +153,13 @@ def fitbit_init_setup():
     )
 
     # --------- Get authorization code ---------
-    CONSOLE.print(
+    fmt.CONSOLE.print(
         f":earth_asia: Opening below URL in browser to authorize the app \n\n{authorization_url}\n"
     )
     try:
         browser_status = webbrowser.open(authorization_url)
         if browser_status:
-            CONSOLE.print(
+            fmt.CONSOLE.print(
                 ":satellite: Waiting for authorization... "
                 + "(Check your browser or press 'Ctrl+C', authorize the app by opening the"
                 + " above URL in your browser and past the redirect URL manually.)\n"
@@ -110,8 +168,8 @@ def fitbit_init_setup():
         else:
             raise FitbitInitError("Failed to open the URL in browser")
     except (KeyboardInterrupt, FitbitInitError):
-        CONSOLE.print("\n:unamused: Error while opening the URL...")
-        CONSOLE.print(
+        fmt.CONSOLE.print("\n:unamused: Error while opening the URL...")
+        fmt.CONSOLE.print(
             ":neutral_face: Authrize the app by opening the above URL in your"
             + "browser and past the redirect URL"
         )
@@ -144,38 +202,39 @@ def fitbit_init_setup():
 
     if response.status_code == 200:
         response_json = response.json()
-        Path(FITBIT_TOKEN_PATH).parent.mkdir(parents=True, exist_ok=True)
         token_content = {
             "access_token": response_json.get("access_token", ""),
             "refresh_token": response_json.get("refresh_token", ""),
+            "expires_at": expires_at(response_json.get("expires_in")),
             "client_id": client_id,
             "secret": encoded_auth,
         }
-        with open(FITBIT_TOKEN_PATH, "w", encoding="utf-8") as f:
-            json.dump(token_content, f)
+        with TokenFileLock():
+            write_fitbit_token(token_content)
 
-        CONSOLE.print(
+        fmt.CONSOLE.print(
             f":floppy_disk: Saving fitbit token in {FITBIT_TOKEN_PATH}",
             style="bold green",
         )
     else:
-        CONSOLE.print(
+        fmt.CONSOLE.print(
             f":unamused: Failed to get tokens: {response.json()['errors'][0]['errorType']}",
             style="bold red",
         )
 
 
-def read_fitbit_token():
+def read_fitbit_token(path=None):
     """Read Fitbit token from the file and return as a JSON object."""
 
+    path = path or FITBIT_TOKEN_PATH
     try:
-        with open(FITBIT_TOKEN_PATH, "r", encoding="utf-8") as f:
+        with open(path, "r", encoding="utf-8") as f:
             token_content = json.load(f)
     except FileNotFoundError as e:
         raise FitbitInitError(
-            f"Token file not found at {FITBIT_TOKEN_PATH}. Please run the initialization with --init-auth"
+            f"Token file not found at {path}. Please run the initialization with --init-auth"
         ) from e
-    except json.JSONDecodeError:
+    except json.JSONDecodeError as e:
         raise FitbitInitError(
             "Error decoding the token file. Please re-run the initialization with --init-auth"
         ) from e
@@ -183,18 +242,29 @@ def read_fitbit_token():
     return token_content
 
 
-def write_fitbit_token(token_content):
-    """Write Fitbit token to the file."""
+def write_fitbit_token(token_content, path=None):
+    """Atomically write Fitbit token to the file, readable by the owner only."""
 
-    Path(FITBIT_TOKEN_PATH).parent.mkdir(parents=True, exist_ok=True)
-    with open(FITBIT_TOKEN_PATH, "w", encoding="utf-8") as f:
-        json.dump(token_content, f)
+    path = path or FITBIT_TOKEN_PATH
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(token_content, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
 
 
-def update_fitbit_token(access_token, refresh_token):
-    """Update Fitbit token in the file."""
+def update_fitbit_token(access_token, refresh_token, token_expires_at=None, path=None):
+    """Update Fitbit token in the file, call it while holding TokenFileLock."""
 
-    token_content = read_fitbit_token()
+    token_content = read_fitbit_token(path)
     token_content["access_token"] = access_token
     token_content["refresh_token"] = refresh_token
-    write_fitbit_token(token_content)
+    token_content["expires_at"] = token_expires_at
+    write_fitbit_token(token_content, path)
@@ -3,11 +3,53 @@
 Json Data Formatter
 """
 
-from rich.console import Console
-from rich.table import Table
-from rich.text import Text
+from . import timings
+from .records import (
+    parse_activities,
+    parse_azm,
+    parse_body,
+    parse_breathing_rate,
+    parse_devices,
+    parse_heart,
+    parse_hrv,
+    parse_sleep,
+    parse_spo2,
+)
 
-CONSOLE = Console()
+# rich is only imported once a table is rendered, JSON output never loads it
+# pylint: disable=import-outside-toplevel
+
+
+def __getattr__(name):
+    """Create the shared rich console on first access of ``CONSOLE``."""
+    if name == "CONSOLE":
+        from rich.console import Console
+
+        console = globals()["CONSOLE"] = Console()
+        return console
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _console():
+    return globals()["CONSOLE"] if "CONSOLE" in globals() else __getattr__("CONSOLE")
+
+
+def _print(renderable):
+    """Print to the shared console, timed as the render phase."""
+    with timings.phase("render"):
+        _console().print(renderable)
+
+
+# Above this many days, nested per-day tables are replaced by one flat table
+COMPACT_ROWS = 31
+
+
+def _use_compact(compact, rows):
+    return rows > COMPACT_ROWS if compact is None else compact
+
+
+def _na(value):
+    return "N/A" if value is None else str(value)
 
 
 def display_user_profile(user_data, as_json=False):
@@ -37,6 +79,8 @@ def display_user_profile(user_data, as_json=False):
             }
         }
 
+    from rich.table import Table
+
     table = Table(title=f"Hello, {user['displayName']} :wave:", show_header=False)
 
     table.add_column("")
@@ -53,35 +97,33 @@ def display_user_profile(user_data, as_json=False):
     table.add_row(":calendar: Member Since", user["memberSince"])
     table.add_row(":clock1: Time Zone", user["timezone"])
 
-    CONSOLE.print(table)
+    _print(table)
     return None
 
 
 def display_sleep(sleep_data, as_json=False):
     """Sleep data formatter"""
 
+    records = parse_sleep(sleep_data)
+
     if as_json:
         return {
             "sleep": [
                 {
-                    "date": s["dateOfSleep"],
-                    "deep_minutes": s["levels"]["summary"]
-                    .get("deep", {})
-                    .get("minutes"),
-                    "light_minutes": s["levels"]["summary"]
-                    .get("light", {})
-                    .get("minutes"),
-                    "rem_minutes": s["levels"]["summary"].get("rem", {}).get("minutes"),
-                    "wake_minutes": s["levels"]["summary"]
-                    .get("wake", {})
-                    .get("minutes"),
-                    "efficiency": s["efficiency"],
-                    "time_in_bed_hours": round(s["timeInBed"] / 60, 1),
+                    "date": s.date,
+                    "deep_minutes": s.deep_minutes,
+                    "light_minutes": s.light_minutes,
+                    "rem_minutes": s.rem_minutes,
+                    "wake_minutes": s.wake_minutes,
+                    "efficiency": s.efficiency,
+                    "time_in_bed_hours": round(s.time_in_bed / 60, 1),
                 }
-                for s in sleep_data["sleep"]
+                for s in records
             ]
         }
 
+    from rich.table import Table
+
     table = Table(title="Sleep Data Summary :sleeping:", show_header=True)
 
     table.add_column("Date :calendar:")
@@ -92,40 +134,36 @@ def display_sleep(sleep_data, as_json=False):
     table.add_column("Efficiency :100:")
     table.add_column("Time in Bed :clock1:")
 
-    for sleep in sleep_data["sleep"]:
+    for sleep in records:
         table.add_row(
-            sleep["dateOfSleep"],
-            f"{sleep['levels']['summary'].get('deep', {}).get('minutes', 'N/A')} min",
-            f"{sleep['levels']['summary'].get('light', {}).get('minutes', 'N/A')} min",
-            f"{sleep['levels']['summary'].get('rem', {}).get('minutes', 'N/A')} min",
-            f"{sleep['levels']['summary'].get('wake', {}).get('minutes', 'N/A')} min",
-            f"{sleep['efficiency']}%",
-            f"{sleep['timeInBed'] / 60:.1f} hr",
+            sleep.date,
+            f"{_na(sleep.deep_minutes)} min",
+            f"{_na(sleep.light_minutes)} min",
+            f"{_na(sleep.rem_minutes)} min",
+            f"{_na(sleep.wake_minutes)} min",
+            f"{sleep.efficiency}%",
+            f"{sleep.time_in_bed / 60:.1f} hr",
         )
 
-    CONSOLE.print(table)
+    _print(table)
     return None
 
 
 def display_spo2(spo2_data, as_json=False):
     """SpO2 data formatter"""
 
-    if isinstance(spo2_data, dict):
-        spo2_data = [spo2_data]
+    records = parse_spo2(spo2_data)
 
     if as_json:
         return {
             "spo2": [
-                {
-                    "date": s.get("dateTime"),
-                    "min": s.get("value", {}).get("min"),
-                    "avg": s.get("value", {}).get("avg"),
-                    "max": s.get("value", {}).get("max"),
-                }
-                for s in spo2_data
+                {"date": s.date, "min": s.min, "avg": s.avg, "max": s.max}
+                for s in records
             ]
         }
 
+    from rich.table import Table
+
     table = Table(title="SpO2 Data Summary :heart:", show_header=True)
 
     table.add_column("Date :calendar:")
@@ -133,57 +171,64 @@ def display_spo2(spo2_data, as_json=False):
     table.add_column("Average :blue_circle:")
     table.add_column("Maximum :green_circle:")
 
-    for spo2 in spo2_data:
-        table.add_row(
-            spo2.get("dateTime", "N/A"),
-            str(spo2.get("value", {}).get("min", "N/A")),
-            str(spo2.get("value", {}).get("avg", "N/A")),
-            str(spo2.get("value", {}).get("max", "N/A")),
-        )
+    for spo2 in records:
+        table.add_row(_na(spo2.date), _na(spo2.min), _na(spo2.avg), _na(spo2.max))
 
-    CONSOLE.print(table)
+    _print(table)
     return None
 
 
-def display_heart_data(heart_data, as_json=False):
-    """Heart data formatter"""
+def _calories(zone):
+    return zone.calories_out if isinstance(zone.calories_out, (int, float)) else None
+
+
+def display_heart_data(heart_data, as_json=False, compact=None):
+    """Heart data formatter
+
+    With compact (by default above COMPACT_ROWS days) each day is one flat row
+    with a minutes column per zone instead of a nested zones table.
+    """
+
+    records = parse_heart(heart_data)
 
     if as_json:
         return {
             "heart": [
                 {
-                    "date": a.get("dateTime"),
-                    "resting_heart_rate": a.get("value", {}).get("restingHeartRate"),
+                    "date": a.date,
+                    "resting_heart_rate": a.resting_heart_rate,
                     "zones": [
                         {
-                            "name": z.get("name"),
-                            "min": z.get("min"),
-                            "max": z.get("max"),
-                            "minutes": z.get("minutes"),
+                            "name": z.name,
+                            "min": z.min,
+                            "max": z.max,
+                            "minutes": z.minutes,
                             "calories_out": (
-                                round(z["caloriesOut"], 2)
-                                if isinstance(z.get("caloriesOut"), (int, float))
+                                round(z.calories_out, 2)
+                                if isinstance(z.calories_out, (int, float))
                                 else None
                             ),
                         }
-                        for z in a.get("value", {}).get("heartRateZones", [])
+                        for z in a.zones
                     ],
                 }
-                for a in heart_data.get("activities-heart", [])
+                for a in records
             ]
         }
 
+    from rich.table import Table
+
+    if _use_compact(compact, len(records)):
+        _print(_compact_heart_table(records))
+        return None
+
     table = Table(title="Heart Rate Time Series :heart:", show_header=True)
 
     table.add_column("Date :calendar:")
     table.add_column("Resting Heart Rate :heartpulse:")
     table.add_column("Heart Rate Zones :dart:")
 
-    for activity in heart_data.get("activities-heart", []):
-        date = activity.get("dateTime", "N/A")
-        value = activity.get("value", {})
-        resting_heart_rate = value.get("restingHeartRate", "N/A")
-
+    for day in records:
         zones_table = Table(show_header=True, header_style="bold magenta")
         zones_table.add_column("Zone :dart:")
         zones_table.add_column("Min :arrow_down:")
@@ -191,42 +236,70 @@ def display_heart_data(heart_data, as_json=False):
         zones_table.add_column("Minutes :hourglass:")
         zones_table.add_column("Calories Out (kcal) :fire:")
 
-        for zone in value.get("heartRateZones", []):
+        for zone in day.zones:
+            calories = _calories(zone)
             zones_table.add_row(
-                zone.get("name", "N/A"),
-                str(zone.get("min", "N/A")),
-                str(zone.get("max", "N/A")),
-                str(zone.get("minutes", "N/A")),
-                (
-                    f"{zone.get('caloriesOut', 'N/A'):.2f}"
-                    if isinstance(zone.get("caloriesOut"), (int, float))
-                    else "N/A"
-                ),
+                _na(zone.name),
+                _na(zone.min),
+                _na(zone.max),
+                _na(zone.minutes),
+                f"{calories:.2f}" if calories is not None else "N/A",
             )
-        table.add_row(date, str(resting_heart_rate), zones_table)
-    CONSOLE.print(table)
+        table.add_row(_na(day.date), _na(day.resting_heart_rate), zones_table)
+    _print(table)
     return None
 
 
+def _compact_heart_table(records):
+    """Flat heart rate table with one row per day and one column per zone."""
+
+    from rich.table import Table
+
+    zone_names = list(
+        dict.fromkeys(_na(zone.name) for day in records for zone in day.zones)
+    )
+
+    table = Table(title="Heart Rate Time Series :heart:", show_header=True)
+
+    table.add_column("Date :calendar:")
+    table.add_column("Resting Heart Rate :heartpulse:")
+    for name in zone_names:
+        table.add_column(f"{name} (min)")
+    table.add_column("Calories Out (kcal) :fire:")
+
+    for day in records:
+        minutes = {_na(zone.name): zone.minutes for zone in day.zones}
+        calories = [c for c in map(_calories, day.zones) if c is not None]
+        table.add_row(
+            _na(day.date),
+            _na(day.resting_heart_rate),
+            *(_na(minutes.get(name)) for name in zone_names),
+            f"{sum(calories):.2f}" if calories else "N/A",
+        )
+    return table
+
+
 def display_azm_time_series(azm_data, as_json=False):
     """AZM Time Series data formatter"""
 
+    records = parse_azm(azm_data)
+
     if as_json:
         return {
             "active_zone": [
                 {
-                    "date": a.get("dateTime"),
-                    "active_zone_minutes": a.get("value", {}).get("activeZoneMinutes"),
-                    "fat_burn_minutes": a.get("value", {}).get(
-                        "fatBurnActiveZoneMinutes"
-                    ),
-                    "cardio_minutes": a.get("value", {}).get("cardioActiveZoneMinutes"),
-                    "peak_minutes": a.get("value", {}).get("peakActiveZoneMinutes"),
+                    "date": a.date,
+                    "active_zone_minutes": a.active_zone_minutes,
+                    "fat_burn_minutes": a.fat_burn_minutes,
+                    "cardio_minutes": a.cardio_minutes,
+                    "peak_minutes": a.peak_minutes,
                 }
-                for a in azm_data.get("activities-active-zone-minutes", [])
+                for a in records
             ]
         }
 
+    from rich.table import Table
+
     table = Table(title="AZM Time Series :runner:", show_header=True)
 
     table.add_column("Date :calendar:")
@@ -235,105 +308,81 @@ def display_azm_time_series(azm_data, as_json=False):
     table.add_column("Cardio :heart:")
     table.add_column("Peak :mountain:")
 
-    for activity in azm_data.get("activities-active-zone-minutes", []):
-        date = activity.get("dateTime", "N/A")
-        value = activity.get("value", {})
+    for azm in records:
         table.add_row(
-            date,
-            str(value.get("activeZoneMinutes", "N/A")),
-            str(value.get("fatBurnActiveZoneMinutes", "N/A")),
-            str(value.get("cardioActiveZoneMinutes", "N/A")),
-            str(value.get("peakActiveZoneMinutes", "N/A")),
+            _na(azm.date),
+            _na(azm.active_zone_minutes),
+            _na(azm.fat_burn_minutes),
+            _na(azm.cardio_minutes),
+            _na(azm.peak_minutes),
         )
 
-    CONSOLE.print(table)
+    _print(table)
     return None
 
 
 def display_breathing_rate(breathing_rate_data, as_json=False):
     """Breathing Rate data formatter"""
 
+    records = parse_breathing_rate(breathing_rate_data)
+
     if as_json:
         return {
             "breathing_rate": [
-                {
-                    "date": br.get("dateTime"),
-                    "breathing_rate": br.get("value", {}).get("breathingRate"),
-                }
-                for br in breathing_rate_data.get("br", [])
+                {"date": br.date, "breathing_rate": br.breathing_rate} for br in records
             ]
         }
 
+    from rich.table import Table
+
     table = Table(title="Breathing Rate Summary 🫁", show_header=True)
 
     table.add_column("Date :calendar:")
     table.add_column("Breaths Per Minute :dash:")
 
-    for br in breathing_rate_data.get("br", []):
-        table.add_row(
-            br.get("dateTime", "N/A"),
-            str(br.get("value", {}).get("breathingRate", "N/A")),
-        )
+    for br in records:
+        table.add_row(_na(br.date), _na(br.breathing_rate))
 
-    CONSOLE.print(table)
+    _print(table)
     return None
 
 
 def display_hrv(hrv_data, as_json=False):
     """HRV data formatter"""
 
+    records = parse_hrv(hrv_data)
+
     if as_json:
         return {
             "hrv": [
                 {
-                    "date": h.get("dateTime"),
-                    "daily_rmssd": h.get("value", {}).get("dailyRmssd"),
-                    "deep_rmssd": h.get("value", {}).get("deepRmssd"),
+                    "date": h.date,
+                    "daily_rmssd": h.daily_rmssd,
+                    "deep_rmssd": h.deep_rmssd,
                 }
-                for h in hrv_data.get("hrv", [])
+                for h in records
             ]
         }
 
+    from rich.table import Table
+
     table = Table(title="HRV Data Summary :heartpulse:", show_header=True)
 
     table.add_column("Date :calendar:")
     table.add_column("Daily RMSSD :chart_with_upwards_trend:")
     table.add_column("Deep RMSSD :sleeping:")
 
-    for hrv in hrv_data.get("hrv", []):
-        table.add_row(
-            hrv.get("dateTime", "N/A"),
-            str(hrv.get("value", {}).get("dailyRmssd", "N/A")),
-            str(hrv.get("value", {}).get("deepRmssd", "N/A")),
-        )
+    for hrv in records:
+        table.add_row(_na(hrv.date), _na(hrv.daily_rmssd), _na(hrv.deep_rmssd))
 
-    CONSOLE.print(table)
+    _print(table)
     return None
 
 
 def _merge_body_data(body_data):
     """Merge weight, BMI, and body fat time series by date."""
 
-    merged = {}
-    resource_map = {
-        "weight": "body-weight",
-        "bmi": "body-bmi",
-        "fat": "body-fat",
-    }
-
-    for resource, response_key in resource_map.items():
-        for item in body_data.get(resource, {}).get(response_key, []):
-            date = item.get("dateTime")
-            if date not in merged:
-                merged[date] = {
-                    "date": date,
-                    "weight": None,
-                    "bmi": None,
-                    "fat": None,
-                }
-            merged[date][resource] = item.get("value")
-
-    return [merged[date] for date in sorted(merged)]
+    return parse_body(body_data)
 
 
 def display_body(body_data, as_json=False):
@@ -342,7 +391,14 @@ def display_body(body_data, as_json=False):
     merged_body = _merge_body_data(body_data)
 
     if as_json:
-        return {"body": merged_body}
+        return {
+            "body": [
+                {"date": b.date, "weight": b.weight, "bmi": b.bmi, "fat": b.fat}
+                for b in merged_body
+            ]
+        }
+
+    from rich.table import Table
 
     table = Table(title="Body Time Series :balance_scale:", show_header=True)
 
@@ -352,39 +408,42 @@ def display_body(body_data, as_json=False):
     table.add_column("Body Fat % :chart_with_upwards_trend:")
 
     for body in merged_body:
-        table.add_row(
-            str(body.get("date", "N/A")),
-            str(body.get("weight", "N/A")),
-            str(body.get("bmi", "N/A")),
-            str(body.get("fat", "N/A")),
-        )
+        table.add_row(str(body.date), str(body.weight), str(body.bmi), str(body.fat))
 
-    CONSOLE.print(table)
+    _print(table)
     return None
 
 
+def _format_mac(mac):
+    if mac is None:
+        return "N/A"
+    mac = str(mac)
+    if len(mac) % 2:
+        return mac
+    return ":".join(mac[i : i + 2] for i in range(0, len(mac), 2))
+
+
 def display_devices(devices, as_json=False):
     """Devices list formatter"""
 
-    def format_mac(mac):
-        if mac == "N/A" or len(mac) % 2:
-            return mac
-        return ":".join(mac[i : i + 2] for i in range(0, len(mac), 2))
+    records = parse_devices(devices)
 
     if as_json:
         return {
             "devices": [
                 {
-                    "battery_level": device.get("batteryLevel"),
-                    "device": device.get("deviceVersion"),
-                    "type": device.get("type"),
-                    "last_sync_time": device.get("lastSyncTime"),
-                    "mac_address": format_mac(str(device.get("mac", "N/A"))),
+                    "battery_level": device.battery_level,
+                    "device": device.device,
+                    "type": device.type,
+                    "last_sync_time": device.last_sync_time,
+                    "mac_address": _format_mac(device.mac),
                 }
-                for device in devices
+                for device in records
             ]
         }
 
+    from rich.table import Table
+
     table = Table(title="Devices List :link:", show_header=True)
 
     table.add_column("Battery % :battery:")
@@ -393,57 +452,79 @@ def display_devices(devices, as_json=False):
     table.add_column("Last Sync Time :clock3:")
     table.add_column("MAC Address :label:")
 
-    for device in devices:
-        mac_address = format_mac(str(device.get("mac", "N/A")))
+    for device in records:
         table.add_row(
-            f"{str(device.get('batteryLevel', 'N/A'))}%",
-            str(device.get("deviceVersion", "N/A")),
-            str(device.get("type", "N/A")),
-            str(device.get("lastSyncTime", "N/A")),
-            mac_address,
+            f"{_na(device.battery_level)}%",
+            _na(device.device),
+            _na(device.type),
+            _na(device.last_sync_time),
+            _format_mac(device.mac),
         )
 
-    CONSOLE.print(table)
+    _print(table)
     return None
 
 
-def display_activity(activity_data, unit_system, as_json=False):
-    """Activity data formatter"""
+def _duration_minutes(activity):
+    return (activity.duration or 0) / 60000
+
+
+def display_activity(activity_data, unit_system, as_json=False, compact=None):
+    """Activity data formatter
+
+    With compact (by default above COMPACT_ROWS days) every activity is one flat
+    row instead of a nested activities table per day, and descriptions are left out.
+    """
 
     dis_unit = "km" if unit_system != "US" else "miles"
+    records = parse_activities(activity_data)
 
     if as_json:
         return {
             "activities": [
                 {
-                    "date": day.get("date"),
+                    "date": day.date,
                     "activities": [
                         {
-                            "start_time": a.get("startTime"),
-                            "name": a.get("name"),
-                            "description": a.get("description"),
+                            "start_time": a.start_time,
+                            "name": a.name,
+                            "description": a.description,
                             "distance": (
-                                f"{a.get('distance', 'N/A')} {dis_unit}"
-                                if a.get("distance") is not None
+                                f"{a.distance} {dis_unit}"
+                                if a.distance is not None
                                 else None
                             ),
-                            "steps": a.get("steps"),
-                            "calories": a.get("calories"),
-                            "duration_minutes": round(a.get("duration", 0) / 60000, 1),
+                            "steps": a.steps,
+                            "calories": a.calories,
+                            "duration_minutes": round(_duration_minutes(a), 1),
                         }
-                        for a in day.get("activities", [])
+                        for a in day.activities
                     ],
                 }
-                for day in activity_data
+                | ({"error": day.error} if day.error is not None else {})
+                for day in records
             ]
         }
 
+    from rich.table import Table
+    from rich.text import Text
+
+    if _use_compact(compact, len(records)):
+        _print(_compact_activity_table(records, dis_unit))
+        return None
+
     table = Table(title="Daily Activities :runner:", show_header=True)
 
     table.add_column("Date :calendar:")
     table.add_column("Activities :clipboard:")
 
-    for activity_day in activity_data:
+    for activity_day in records:
+        if activity_day.error is not None:
+            table.add_row(
+                activity_day.date or "",
+                Text(activity_day.error, style="bold red", overflow="fold"),
+            )
+            continue
         activity_table = Table(show_header=True, header_style="bold magenta")
         activity_table.add_column("Start Time :alarm_clock:")
         activity_table.add_column("Name :running_shirt_with_sash:")
@@ -453,18 +534,233 @@ def display_activity(activity_data, unit_system, as_json=False):
         activity_table.add_column("Calories (kcal) :fire:")
         activity_table.add_column("Duration :hourglass:")
 
-        for activity in activity_day.get("activities", []):
-            duration_min = activity.get("duration", 0) / 60000
+        for activity in activity_day.activities:
             activity_table.add_row(
-                activity.get("startTime", ""),
-                activity.get("name", "N/A"),
-                Text(activity.get("description", "N/A"), overflow="fold"),
-                f"{activity.get('distance', 'N/A')} {dis_unit}",
-                str(activity.get("steps", "N/A")),
-                str(activity.get("calories", "N/A")),
-                f"{duration_min:.1f} min",
+                activity.start_time or "",
+                _na(activity.name),
+                Text(_na(activity.description), overflow="fold"),
+                f"{_na(activity.distance)} {dis_unit}",
+                _na(activity.steps),
+                _na(activity.calories),
+                f"{_duration_minutes(activity):.1f} min",
+            )
+        table.add_row(activity_day.date or "", activity_table)
+
+    _print(table)
+    return None
+
+
+def _compact_activity_table(records, dis_unit):
+    """Flat activity table with one row per logged activity."""
+
+    from rich.table import Table
+    from rich.text import Text
+
+    table = Table(title="Daily Activities :runner:", show_header=True)
+
+    table.add_column("Date :calendar:")
+    table.add_column("Start Time :alarm_clock:")
+    table.add_column("Name :running_shirt_with_sash:")
+    table.add_column("Distance :straight_ruler:")
+    table.add_column("Steps :footprints:")
+    table.add_column("Calories (kcal) :fire:")
+    table.add_column("Duration :hourglass:")
+
+    for activity_day in records:
+        date = activity_day.date or ""
+        if activity_day.error is not None:
+            table.add_row(
+                date, "", Text(activity_day.error, style="bold red", overflow="fold")
             )
-        table.add_row(activity_day.get("date", ""), activity_table)
+            continue
+        for activity in activity_day.activities:
+            table.add_row(
+                date,
+                activity.start_time or "",
+                _na(activity.name),
+                f"{_na(activity.distance)} {dis_unit}",
+                _na(activity.steps),
+                _na(activity.calories),
+                f"{_duration_minutes(activity):.1f} min",
+            )
+    return table
+
+
+def display_cache_info(cache_info, as_json=False):
+    """Response cache statistics formatter"""
+
+    if as_json:
+        return {"cache": cache_info}
+
+    from rich.table import Table
+
+    table = Table(title="Response Cache :floppy_disk:", show_header=False)
+
+    table.add_column("")
+    table.add_column("")
+
+    table.add_row(":file_folder: Path", cache_info["path"])
+    table.add_row(":card_index: Entries", str(cache_info["entries"]))
+    table.add_row(":white_check_mark: Live", str(cache_info["live_entries"]))
+    table.add_row(":hourglass: Expired", str(cache_info["expired_entries"]))
+    table.add_row(":package: Size", f"{cache_info['body_bytes'] / 1024:.1f} KiB")
+
+    _print(table)
+    return None
+
+
+def display_sync_summary(sync_summary, as_json=False):
+    """Local store sync summary formatter"""
+
+    if as_json:
+        return {"sync": sync_summary}
+
+    from rich.table import Table
+
+    table = Table(title="Local Store Sync :arrows_counterclockwise:", show_header=True)
+
+    table.add_column("Metric :bar_chart:")
+    table.add_column("From :calendar:")
+    table.add_column("To :calendar:")
+    table.add_column("Records :card_index:")
+    table.add_column("Failed Days :warning:")
+    table.add_column("Error :x:")
+
+    for metric in sync_summary:
+        table.add_row(
+            metric["metric"],
+            metric["start"],
+            metric["end"],
+            str(metric["records"]),
+            ", ".join(metric["failed_days"]) or "-",
+            metric.get("error") or "-",
+        )
+
+    _print(table)
+    return None
+
+
+def display_export_summary(export_summary, as_json=False):
+    """Columnar export summary formatter"""
+
+    if as_json:
+        return {"export": export_summary}
+
+    from rich.table import Table
+
+    table = Table(title="Export :floppy_disk:", show_header=True)
+
+    table.add_column("Table :bar_chart:")
+    table.add_column("File :file_folder:")
+    table.add_column("Rows :card_index:")
+
+    for exported in export_summary:
+        table.add_row(exported["table"], exported["path"], str(exported["rows"]))
+
+    _print(table)
+    return None
+
+
+def display_stats(stats, as_json=False):
+    """Series statistics formatter"""
+
+    if as_json:
+        return {"stats": stats}
+
+    from rich.table import Table
+
+    table = Table(title="Statistics :bar_chart:", show_header=True)
+
+    table.add_column("Metric :label:")
+    table.add_column("Values :1234:")
+    table.add_column("From :calendar:")
+    table.add_column("To :calendar:")
+    table.add_column("Mean")
+    table.add_column("Min :arrow_down:")
+    table.add_column("Max :arrow_up:")
+    table.add_column("P10")
+    table.add_column("Median")
+    table.add_column("P90")
+    table.add_column("Rolling Mean")
+    table.add_column("Trend / Day :chart_with_upwards_trend:")
+
+    for series in stats:
+        window = series.get("rolling_window")
+        trend = series.get("trend_per_day")
+        table.add_row(
+            series["metric"],
+            str(series["count"]),
+            series.get("start", "N/A"),
+            series.get("end", "N/A"),
+            str(series.get("mean", "N/A")),
+            str(series.get("min", "N/A")),
+            str(series.get("max", "N/A")),
+            str(series.get("p10", "N/A")),
+            str(series.get("p50", "N/A")),
+            str(series.get("p90", "N/A")),
+            f"{series['rolling_mean']} (last {window})" if window else "N/A",
+            f"{trend:+}" if trend is not None else "N/A",
+        )
+
+    _print(table)
+    return None
+
+
+def _ms_text(value):
+    return "N/A" if value is None else f"{value:.1f}"
+
+
+def display_timings(summary, as_json=False):
+    """Timings formatter, tables are written to stderr to keep stdout intact"""
+
+    if as_json:
+        return {"timings": summary}
+
+    from rich.console import Console
+    from rich.table import Table
+
+    requests = Table(title="API Requests (ms) :stopwatch:", show_header=True)
+
+    requests.add_column("Endpoint :link:", overflow="fold")
+    requests.add_column("Status")
+    requests.add_column("Retry")
+    requests.add_column("Queued")
+    requests.add_column("TTFB")
+    requests.add_column("Download")
+    requests.add_column("Total")
+    requests.add_column("Bytes")
+
+    for request in summary["requests"]:
+        requests.add_row(
+            f"{request['method']} {request['endpoint']}",
+            _na(request["status"]),
+            str(request["attempt"]),
+            _ms_text(request["wait_ms"]),
+            _ms_text(request["ttfb_ms"]),
+            _ms_text(request["download_ms"]),
+            _ms_text(request["total_ms"]),
+            _na(request["bytes"]),
+        )
 
-    CONSOLE.print(table)
+    totals = summary["totals"]
+    phases = Table(title="Timings :hourglass:", show_header=True)
+
+    phases.add_column("Phase :gear:")
+    phases.add_column("Calls")
+    phases.add_column("Total ms")
+
+    phases.add_row("wall time", "", _ms_text(totals["wall_ms"]))
+    phases.add_row("network", str(totals["requests"]), _ms_text(totals["network_ms"]))
+    for name, phase in summary["phases"].items():
+        phases.add_row(name, str(phase["calls"]), _ms_text(phase["ms"]))
+
+    console = Console(stderr=True)
+    if summary["requests"]:
+        console.print(requests)
+    console.print(phases)
+    console.print(
+        f"{totals['requests']} requests, {totals['retries']} retries, "
+        f"{totals['token_refreshes']} token refreshes, {totals['cache_hits']} cache hits, "
+        f"{totals['bytes']} bytes received"
+    )
     return None
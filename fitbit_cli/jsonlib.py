@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+JSON backend
+"""
+
+# orjson is a compiled extension pylint cannot introspect
+# pylint: disable=no-member
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Set FITBIT_CLI_JSON=json to force the standard library backend
+if os.environ.get("FITBIT_CLI_JSON") == "json":
+    orjson = None  # pylint: disable=invalid-name
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(data):
+    """Parse a JSON document from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj):
+    """Serialize obj to a compact JSON string.
+
+    With the standard library the output is ``json.dumps(obj, separators=(",", ":"))``.
+    orjson output differs in a few places:
+    non-ASCII characters are written as UTF-8 instead of \\u escapes, NaN and
+    infinities become ``null`` instead of ``NaN``/``Infinity``, and floats in
+    exponent notation drop the sign and padding (``1e16`` instead of ``1e+16``).
+    Values orjson rejects, such as integers above 64 bits, fall back to the
+    standard library.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except (TypeError, orjson.JSONEncodeError):
+            pass
+    return json.dumps(obj, separators=(",", ":"))
@@ -3,33 +3,259 @@
 Main Module
 """
 
-from . import fitbit_setup as setup
-from . import output
-from .cli import parse_arguments
-from .fitbit_api import FitbitAPI
+from .cli import has_data_args, parse_arguments
 
+# Only the argument parser is imported up front, so --version, --help and usage
+# errors never load requests, rich or sqlite3. Everything else is imported once
+# the arguments are known.
+# pylint: disable=import-outside-toplevel
 
-def main():
-    """Main function"""
 
-    args = parse_arguments()
+def _print_json(data):
+    from .jsonlib import dumps
 
-    if args.init_auth:
-        setup.fitbit_init_setup()
-        return
+    print(dumps(data))
+
+
+def _cache_commands(args):
+    """Run --clear-cache and --cache-info."""
+    from . import formatter as fmt
+    from .cache import ResponseCache
+
+    cache = ResponseCache()
+    if args.clear_cache:
+        cache.clear()
+    if args.cache_info and (args.json or args.raw_json):
+        _print_json(fmt.display_cache_info(cache.info(), as_json=True))
+    elif args.cache_info:
+        fmt.display_cache_info(cache.info())
+    cache.close()
+
+
+def _socket_path(args):
+    from .daemon import FITBIT_SOCKET_PATH
+
+    return args.socket or FITBIT_SOCKET_PATH
+
+
+def _use_daemon(args):
+    """Return whether queries should be forwarded to a running daemon."""
+    bypass = (
+        args.serve,
+        args.exporter,
+        args.no_daemon,
+        args.timings,
+        args.watch,
+        args.no_cache,
+        args.refresh_cache,
+    )
+    if any(bypass):
+        return False
+    from .daemon import daemon_running
+
+    return daemon_running(_socket_path(args))
+
+
+def _create_client(args):
+    """Return the data source for the requested mode, the API, a daemon or the local store."""
+    if args.offline and not args.sync:
+        from .store import MetricsStore
 
-    credentials = setup.read_fitbit_token()
+        return MetricsStore()
 
-    fitbit = FitbitAPI(
+    if _use_daemon(args):
+        from .daemon import DaemonClient
+
+        return DaemonClient(_socket_path(args))
+
+    return _api_client(args)
+
+
+def _api_client(args, token_path=None, cache_path=None):
+    """Return a FitbitAPI client for the token file, by default ~/.fitbit/token.json."""
+    from . import fitbit_setup as setup
+    from .cache import FITBIT_CACHE_PATH, ResponseCache
+    from .fitbit_api import FitbitAPI
+    from .retry import RetryPolicy
+
+    credentials = setup.read_fitbit_token(token_path)
+    # --watch revalidates mutable days on every poll instead of reading the cache
+    cache = (
+        None
+        if args.no_cache
+        else ResponseCache(
+            cache_path or FITBIT_CACHE_PATH,
+            refresh=args.refresh_cache,
+            skip_mutable=bool(args.watch),
+        )
+    )
+    return FitbitAPI(
         client_id=credentials["client_id"],
         client_secret=credentials["secret"],
         access_token=credentials["access_token"],
         refresh_token=credentials["refresh_token"],
+        expires_at=credentials.get("expires_at"),
+        token_path=token_path,
+        workers=args.workers,
+        retry_policy=RetryPolicy(max_retries=args.retries, budget=args.retry_budget),
+        cache=cache,
+        conditional_requests=bool(args.watch),
+    )
+
+
+def _sync(fitbit, args):
+    """Sync the local store and return it when the data should be read from it."""
+    from . import formatter as fmt
+    from .store import MetricsStore
+
+    store = MetricsStore()
+    summary = store.sync(fitbit, args.sync[0], workers=args.workers)
+    if args.json or args.raw_json:
+        _print_json(fmt.display_sync_summary(summary, as_json=True))
+    else:
+        fmt.display_sync_summary(summary)
+    if args.offline and has_data_args(args):
+        return store
+    store.close()
+    return None
+
+
+def _serve(args):
+    """Run the daemon until interrupted."""
+    from . import formatter as fmt
+    from .daemon import serve
+
+    fitbit = _create_client(args)
+    path = _socket_path(args)
+    fmt.CONSOLE.print(f":computer: Serving on {path}", style="bold green")
+    try:
+        serve(fitbit, path, ttl=args.serve_ttl)
+    finally:
+        fitbit.close()
+
+
+def _run_exporter(args):
+    """Run the Prometheus exporter until interrupted."""
+    from . import formatter as fmt
+    from .prometheus import serve
+
+    fitbit = _create_client(args)
+    fmt.CONSOLE.print(
+        f":bar_chart: Serving metrics on http://127.0.0.1:{args.exporter_port}/metrics",
+        style="bold green",
     )
+    try:
+        serve(fitbit, args.exporter_port, args.exporter_interval)
+    finally:
+        fitbit.close()
+
 
-    if args.raw_json:
+def _run_accounts(args):
+    """Fetch the requested data of every account, each with its own client."""
+    from functools import partial
+
+    from .accounts import account_cache_path, accounts_display, load_accounts
+
+    # Clients are created in the per-account tasks, so a bad token file only
+    # fails its own account
+    client_factories = {
+        account: partial(_api_client, args, token_path, account_cache_path(account))
+        for account, token_path in load_accounts(args.accounts).items()
+    }
+    accounts_display(client_factories, args)
+
+
+def _display(fitbit, args):
+    """Write the requested data in the selected output mode."""
+    from . import output
+
+    if args.watch:
+        from .watch import watch_display
+
+        watch_display(fitbit, args)
+    elif args.export:
+        output.export_display(fitbit, args)
+    elif args.stats:
+        output.stats_display(fitbit, args)
+    elif args.ndjson:
+        output.ndjson_display(fitbit, args)
+    elif args.raw_json:
         output.raw_json_display(fitbit, args)
     elif args.json:
         output.json_display(fitbit, args)
     else:
         output.table_display(fitbit, args)
+
+
+def _report_timings(args):
+    """Write the --timings report to stderr."""
+    import sys
+
+    from . import formatter as fmt
+    from . import timings
+    from .jsonlib import dumps
+
+    summary = timings.active().summary()
+    if args.json or args.raw_json or args.ndjson:
+        print(dumps(fmt.display_timings(summary, as_json=True)), file=sys.stderr)
+    else:
+        fmt.display_timings(summary)
+
+
+def main():
+    """Main function"""
+
+    args = parse_arguments()
+
+    if not args.timings:
+        _run(args)
+        return
+
+    from . import timings
+
+    timings.enable()
+    try:
+        _run(args)
+    finally:
+        _report_timings(args)
+        timings.disable()
+
+
+def _run(args):
+    """Run the requested command."""
+
+    if args.init_auth:
+        from . import fitbit_setup as setup
+
+        setup.fitbit_init_setup()
+        return
+
+    if args.clear_cache or args.cache_info:
+        _cache_commands(args)
+        if not has_data_args(args):
+            return
+
+    if args.serve:
+        _serve(args)
+        return
+
+    if args.exporter:
+        _run_exporter(args)
+        return
+
+    if args.accounts:
+        _run_accounts(args)
+        return
+
+    fitbit = _create_client(args)
+    try:
+        if args.sync:
+            store = _sync(fitbit, args)
+            if store is not None:
+                fitbit.close()
+                fitbit = store
+            if not has_data_args(args):
+                return
+        _display(fitbit, args)
+    finally:
+        fitbit.close()
@@ -3,37 +3,128 @@
 Output modes for the Fitbit CLI
 """
 
-import json
-from datetime import date, datetime, timedelta
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
 
 from . import formatter as fmt
+from . import timings
+from .dates import iter_days, to_date
+from .exceptions import FitbitAPIError
+from .export import export_sections
+from .jsonlib import dumps
+from .stats import compute_stats
+from .stream import JSONObjectWriter, NDJSONWriter, iter_intraday
 
 
-def collect_activities(fitbit, args):
-    """Fetch activity data for a date or date range."""
+def _total_distance(value):
+    """Return a distance the way the daily summary lists it, as the total distance."""
+    return [{"activity": "total", "distance": float(value)}]
+
+
+# Activity time series resource -> (daily summary field, value conversion)
+ACTIVITY_RANGE_RESOURCES = {
+    "steps": ("steps", int),
+    "distance": ("distances", _total_distance),
+    "calories": ("caloriesOut", int),
+    "minutesSedentary": ("sedentaryMinutes", int),
+    "minutesLightlyActive": ("lightlyActiveMinutes", int),
+    "minutesFairlyActive": ("fairlyActiveMinutes", int),
+    "minutesVeryActive": ("veryActiveMinutes", int),
+}
+
+
+def _fetch_activity_day(fitbit, day):
+    """Fetch one day's activity summary, reporting failures instead of raising."""
+    try:
+        return {**fitbit.get_daily_activity_summary(day), "date": day}
+    except (FitbitAPIError, OSError) as e:
+        return {"date": day, "activities": [], "error": str(e)}
+
+
+def collect_activities(fitbit, args, summary=False):
+    """Fetch activity data for a date or date range.
+
+    Date ranges are fanned out per day over a thread pool. The pool runs inside
+    a fetch_sections worker, so the client's in-flight limit, not the pool
+    size, bounds the requests of the whole run. Days are returned in order,
+    and a failed day carries an ``error`` message instead of discarding the
+    other days. summary is passed on to collect_activities_by_range.
+    """
     start_date, end_date = args.activities
     if end_date is None:
         data = fitbit.get_daily_activity_summary(str(start_date))
         return [{**data, "date": str(start_date)}]
-    start = (
-        start_date
-        if isinstance(start_date, date)
-        else datetime.strptime(start_date, "%Y-%m-%d").date()
-    )
-    end = (
-        end_date
-        if isinstance(end_date, date)
-        else datetime.strptime(end_date, "%Y-%m-%d").date()
-    )
-    return [
-        {
-            **fitbit.get_daily_activity_summary(
-                (start + timedelta(days=i)).strftime("%Y-%m-%d")
-            ),
-            "date": (start + timedelta(days=i)).strftime("%Y-%m-%d"),
+    if args.range_activities:
+        return collect_activities_by_range(fitbit, args, summary)
+    days = list(iter_days(start_date, end_date))
+    with ThreadPoolExecutor(max_workers=min(args.workers, len(days))) as executor:
+        return list(executor.map(partial(_fetch_activity_day, fitbit), days))
+
+
+def _logged_activity_days(fitbit, start_date, end_date):
+    """Return the set of days in the range that have at least one logged activity."""
+    start, end = to_date(start_date), to_date(end_date)
+    after = (start - timedelta(days=1)).strftime("%Y-%m-%d")
+    days, offset = set(), 0
+    while True:
+        page = fitbit.get_activity_log_list(after, offset=offset)
+        activities = page.get("activities", [])
+        for activity in activities:
+            day = activity.get("startTime", "")[:10]
+            if start.isoformat() <= day <= end.isoformat():
+                days.add(day)
+        if (
+            not activities
+            or not page.get("pagination", {}).get("next")
+            or activities[-1].get("startTime", "")[:10] > end.isoformat()
+        ):
+            return days
+        offset += len(activities)
+
+
+def _fill_summaries(rows, series):
+    """Set the daily summary fields of rows from {resource: time series payload}."""
+    for resource, payload in series.items():
+        field, convert = ACTIVITY_RANGE_RESOURCES[resource]
+        for item in payload.get(f"activities-{resource}", []):
+            if item.get("dateTime") in rows:
+                rows[item["dateTime"]]["summary"][field] = convert(item.get("value", 0))
+
+
+def collect_activities_by_range(fitbit, args, summary=False):
+    """Build per-day activity rows from the activity log list instead of per-day calls.
+
+    The per-activity detail is only fetched for days that actually logged
+    activities. The formatters only read the activities, so the daily summary
+    is only built with summary, e.g. for raw JSON output: steps, distance,
+    calories and active minutes then come from one range request per resource,
+    in the fields and shape of the daily summary endpoint. Its other fields,
+    such as goals and heart rate zones, are left out.
+    """
+    start_date, end_date = args.activities
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        series = {
+            resource: executor.submit(
+                fitbit.get_activity_time_series, resource, start_date, end_date
+            )
+            for resource in (ACTIVITY_RANGE_RESOURCES if summary else ())
         }
-        for i in range((end - start).days + 1)
-    ]
+        logged_days = sorted(_logged_activity_days(fitbit, start_date, end_date))
+        details = executor.map(partial(_fetch_activity_day, fitbit), logged_days)
+        series = {resource: future.result() for resource, future in series.items()}
+
+    rows = {
+        day: {"date": day, "activities": []} | ({"summary": {}} if summary else {})
+        for day in iter_days(start_date, end_date)
+    }
+    _fill_summaries(rows, series)
+    for day, detail in zip(logged_days, details):
+        rows[day]["activities"] = detail.get("activities", [])
+        if "error" in detail:
+            rows[day]["error"] = detail["error"]
+    return list(rows.values())
 
 
 def collect_body(fitbit, args):
@@ -46,114 +137,174 @@ def collect_body(fitbit, args):
     }
 
 
-def json_display(fitbit, args):
-    """Fetch data and render each requested endpoint as a single JSON object to stdout."""
-    result = {}
-    profile = None
+def _fetch_jobs(fitbit, args, activity_units=True, raw=False):
+    """Build the ordered mapping of section name to fetch callable for the requested flags.
 
-    if args.user_profile:
-        profile = fitbit.get_user_profile()
-        result.update(fmt.display_user_profile(profile, as_json=True))
+    With activity_units, the user profile is also fetched for activities, whose
+    formatter takes the distance unit from it. raw marks payloads that are
+    output as they are, which need the daily summary of range activities.
+    """
+    jobs = {}
+    if args.user_profile or (activity_units and args.activities):
+        jobs["user_profile"] = fitbit.get_user_profile
     if args.devices:
-        result.update(fmt.display_devices(fitbit.get_devices(), as_json=True))
+        jobs["devices"] = fitbit.get_devices
     if args.sleep:
-        result.update(
-            fmt.display_sleep(fitbit.get_sleep_log(*args.sleep), as_json=True)
-        )
+        jobs["sleep"] = partial(fitbit.get_sleep_log, *args.sleep)
     if args.spo2:
-        result.update(
-            fmt.display_spo2(fitbit.get_spo2_summary(*args.spo2), as_json=True)
-        )
+        jobs["spo2"] = partial(fitbit.get_spo2_summary, *args.spo2)
     if args.heart:
-        result.update(
-            fmt.display_heart_data(
-                fitbit.get_heart_rate_time_series(*args.heart), as_json=True
-            )
-        )
+        jobs["heart"] = partial(fitbit.get_heart_rate_time_series, *args.heart)
     if args.active_zone:
-        result.update(
-            fmt.display_azm_time_series(
-                fitbit.get_azm_time_series(*args.active_zone), as_json=True
-            )
-        )
+        jobs["active_zone"] = partial(fitbit.get_azm_time_series, *args.active_zone)
     if args.breathing_rate:
-        result.update(
-            fmt.display_breathing_rate(
-                fitbit.get_breathing_rate_summary(*args.breathing_rate), as_json=True
-            )
+        jobs["breathing_rate"] = partial(
+            fitbit.get_breathing_rate_summary, *args.breathing_rate
         )
     if args.hrv:
-        result.update(fmt.display_hrv(fitbit.get_hrv_summary(*args.hrv), as_json=True))
+        jobs["hrv"] = partial(fitbit.get_hrv_summary, *args.hrv)
     if args.body:
-        result.update(fmt.display_body(collect_body(fitbit, args), as_json=True))
+        jobs["body"] = partial(collect_body, fitbit, args)
     if args.activities:
-        activity_data = collect_activities(fitbit, args)
-        if profile is None:
-            profile = fitbit.get_user_profile()
-        unit_system = profile.get("user", {}).get("distanceUnit", "METRIC")
-        result.update(fmt.display_activity(activity_data, unit_system, as_json=True))
+        jobs["activities"] = partial(collect_activities, fitbit, args, summary=raw)
+    return jobs
+
+
+def fetch_sections(fitbit, args, activity_units=True, raw=False):
+    """Fetch every requested endpoint concurrently and yield (section, data) in flag order.
+
+    Independent endpoints are submitted to a bounded thread pool at once, so the
+    wall time approaches the slowest single call instead of the sum of all calls.
+    Results are still yielded in the fixed section order as soon as each is ready.
+    Pass activity_units=False when activities are not formatted and raw=True
+    when the payloads are output unformatted, see _fetch_jobs.
+    """
+    jobs = _fetch_jobs(fitbit, args, activity_units, raw)
+    workers = max(1, min(args.workers, len(jobs) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {name: executor.submit(job) for name, job in jobs.items()}
+        for name, future in futures.items():
+            yield name, future.result()
+
 
-    print(json.dumps(result, separators=(",", ":")))
+# Section name -> formatter function name in the formatter module
+SECTION_FORMATTERS = {
+    "user_profile": "display_user_profile",
+    "devices": "display_devices",
+    "sleep": "display_sleep",
+    "spo2": "display_spo2",
+    "heart": "display_heart_data",
+    "active_zone": "display_azm_time_series",
+    "breathing_rate": "display_breathing_rate",
+    "hrv": "display_hrv",
+    "body": "display_body",
+    "activities": "display_activity",
+}
+
+
+def _unit_system(profile):
+    # Without a profile, e.g. for --stats, activities are formatted as metric
+    if profile is None:
+        return "METRIC"
+    return profile.get("user", {}).get("distanceUnit", "METRIC")
+
+
+# Sections whose table formatter has a compact flat rendering
+COMPACT_SECTIONS = ("heart", "activities")
+
+
+def render_sections(fitbit, args, compact=None, activity_units=True, **kwargs):
+    """Fetch the requested sections and pass each one to its formatter in flag order.
+
+    Yields (section, formatter result). kwargs are forwarded to the formatters,
+    e.g. ``as_json=True``. compact is only passed to the formatters that
+    support it, and only when it is set.
+    """
+    sections = fetch_sections(fitbit, args, activity_units)
+    yield from format_sections(sections, args, compact, **kwargs)
+
+
+def format_sections(sections, args, compact=None, only=None, **kwargs):
+    """Pass fetched (section, data) pairs to their formatters, see render_sections.
+
+    When only is given, just the sections named in it are formatted.
+    """
+    profile = None
+    for name, data in sections:
+        if name == "user_profile":
+            profile = data
+            if not args.user_profile:
+                continue
+        if only is not None and name not in only:
+            continue
+        formatter = getattr(fmt, SECTION_FORMATTERS[name])
+        if compact is not None and name in COMPACT_SECTIONS:
+            formatter = partial(formatter, compact=compact)
+        with timings.phase(SECTION_FORMATTERS[name]):
+            if name == "activities":
+                section = formatter(data, _unit_system(profile), **kwargs)
+            else:
+                section = formatter(data, **kwargs)
+        yield name, section
+
+
+def json_display(fitbit, args):
+    """Fetch data and stream each requested endpoint into a single JSON object on stdout.
+
+    Every section is written as soon as it is fetched and formatted.
+    """
+    with JSONObjectWriter(sys.stdout) as writer:
+        for _, section in render_sections(fitbit, args, as_json=True):
+            for key, value in section.items():
+                writer.write_member(key, value)
 
 
 def raw_json_display(fitbit, args):
-    """Collect raw API responses and print compact JSON to stdout."""
-    result = {}
+    """Stream raw API responses as one compact JSON object to stdout."""
+    with JSONObjectWriter(sys.stdout) as writer:
+        for name, data in fetch_sections(fitbit, args, activity_units=False, raw=True):
+            writer.write_member(name, data)
 
-    if args.user_profile:
-        result["user_profile"] = fitbit.get_user_profile()
-    if args.devices:
-        result["devices"] = fitbit.get_devices()
-    if args.sleep:
-        result["sleep"] = fitbit.get_sleep_log(*args.sleep)
-    if args.spo2:
-        result["spo2"] = fitbit.get_spo2_summary(*args.spo2)
-    if args.heart:
-        result["heart"] = fitbit.get_heart_rate_time_series(*args.heart)
-    if args.active_zone:
-        result["active_zone"] = fitbit.get_azm_time_series(*args.active_zone)
-    if args.breathing_rate:
-        result["breathing_rate"] = fitbit.get_breathing_rate_summary(
-            *args.breathing_rate
-        )
-    if args.hrv:
-        result["hrv"] = fitbit.get_hrv_summary(*args.hrv)
-    if args.body:
-        result["body"] = collect_body(fitbit, args)
-    if args.activities:
-        result["activities"] = collect_activities(fitbit, args)
 
-    print(json.dumps(result, separators=(",", ":")))
+def ndjson_display(fitbit, args):
+    """Stream each requested endpoint to stdout as newline-delimited JSON records.
+
+    Summary sections are written one record per line as soon as they are
+    formatted, intraday metrics one sample per line as each day is parsed.
+    """
+    writer = NDJSONWriter(sys.stdout)
+
+    for name, section in render_sections(fitbit, args, as_json=True):
+        writer.write_section(name, section[name])
+    for metric, sample in iter_intraday(fitbit, args):
+        writer.write({"metric": metric, **sample})
+    sys.stdout.flush()
+
+
+def export_display(fitbit, args):
+    """Write every requested section to typed columnar files and show what was written."""
+    summary = export_sections(
+        render_sections(fitbit, args, as_json=True), args.export, args.export_format
+    )
+    if args.json or args.raw_json:
+        print(dumps(fmt.display_export_summary(summary, as_json=True)))
+    else:
+        fmt.display_export_summary(summary)
+
+
+def stats_display(fitbit, args):
+    """Compute statistics over every requested series and show them as a table or JSON."""
+    # Statistics skip activities, so their distance unit is not needed
+    sections = render_sections(fitbit, args, activity_units=False, as_json=True)
+    stats = compute_stats(sections, args.stats_window)
+    if args.json or args.raw_json:
+        print(dumps(fmt.display_stats(stats, as_json=True)))
+    else:
+        fmt.display_stats(stats)
 
 
 def table_display(fitbit, args):
     """Fetch data and render rich tables to the terminal."""
     with fmt.CONSOLE.status("[bold green]Fetching data...") as _:
-        profile = None
-        if args.user_profile:
-            profile = fitbit.get_user_profile()
-            fmt.display_user_profile(profile)
-        if args.devices:
-            fmt.display_devices(fitbit.get_devices())
-        if args.sleep:
-            fmt.display_sleep(fitbit.get_sleep_log(*args.sleep))
-        if args.spo2:
-            fmt.display_spo2(fitbit.get_spo2_summary(*args.spo2))
-        if args.heart:
-            fmt.display_heart_data(fitbit.get_heart_rate_time_series(*args.heart))
-        if args.active_zone:
-            fmt.display_azm_time_series(fitbit.get_azm_time_series(*args.active_zone))
-        if args.breathing_rate:
-            fmt.display_breathing_rate(
-                fitbit.get_breathing_rate_summary(*args.breathing_rate)
-            )
-        if args.hrv:
-            fmt.display_hrv(fitbit.get_hrv_summary(*args.hrv))
-        if args.body:
-            fmt.display_body(collect_body(fitbit, args))
-        if args.activities:
-            activity_data = collect_activities(fitbit, args)
-            if profile is None:
-                profile = fitbit.get_user_profile()
-            unit_system = profile.get("user", {}).get("distanceUnit", "METRIC")
-            fmt.display_activity(activity_data, unit_system)
+        for _ in render_sections(fitbit, args, compact=args.compact):
+            pass
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+Prometheus metrics exporter
+"""
+
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from .records import (
+    parse_azm,
+    parse_breathing_rate,
+    parse_devices,
+    parse_heart,
+    parse_hrv,
+    parse_spo2,
+)
+
+# The exporter pulls in http.server only when it serves
+# pylint: disable=import-outside-toplevel
+
+DEFAULT_PORT = 9877
+DEFAULT_INTERVAL = 300
+# Daily summaries are looked up over the last week, the newest value wins
+LOOKBACK_DAYS = 7
+# API calls per scrape, one per source
+SCRAPE_CALLS = 7
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# name -> (type, help)
+METRICS = {
+    "fitbit_resting_heart_rate_bpm": ("gauge", "Latest resting heart rate."),
+    "fitbit_hrv_daily_rmssd_milliseconds": ("gauge", "Latest daily HRV RMSSD."),
+    "fitbit_hrv_deep_rmssd_milliseconds": ("gauge", "Latest deep sleep HRV RMSSD."),
+    "fitbit_spo2_percent": ("gauge", "Latest nightly SpO2 by statistic."),
+    "fitbit_breathing_rate_breaths_per_minute": (
+        "gauge",
+        "Latest nightly breathing rate.",
+    ),
+    "fitbit_device_battery_percent": ("gauge", "Battery level of a paired device."),
+    "fitbit_device_last_sync_timestamp_seconds": (
+        "gauge",
+        "Last sync time of a paired device.",
+    ),
+    "fitbit_steps_today": ("gauge", "Steps taken today."),
+    "fitbit_active_zone_minutes_today": ("gauge", "Active zone minutes today."),
+    "fitbit_rate_limit_remaining": ("gauge", "Remaining Fitbit API calls this hour."),
+    "fitbit_scrape_duration_seconds": ("gauge", "Duration of the last API scrape."),
+    "fitbit_scrape_last_success_timestamp_seconds": (
+        "gauge",
+        "Time of the last scrape in which every source succeeded.",
+    ),
+    "fitbit_scrape_errors_total": ("counter", "Failed API scrapes by source."),
+}
+
+
+def _latest(records, attribute):
+    """Return the newest non-null attribute of date ordered records."""
+    for record in reversed(records):
+        value = getattr(record, attribute)
+        if value is not None:
+            return value
+    return None
+
+
+def _timestamp(local_time):
+    try:
+        return datetime.fromisoformat(local_time).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _heart(fitbit, start, today):
+    heart = parse_heart(fitbit.get_heart_rate_time_series(start, today))
+    yield "fitbit_resting_heart_rate_bpm", {}, _latest(heart, "resting_heart_rate")
+
+
+def _hrv(fitbit, start, today):
+    hrv = parse_hrv(fitbit.get_hrv_summary(start, today))
+    yield "fitbit_hrv_daily_rmssd_milliseconds", {}, _latest(hrv, "daily_rmssd")
+    yield "fitbit_hrv_deep_rmssd_milliseconds", {}, _latest(hrv, "deep_rmssd")
+
+
+def _spo2(fitbit, start, today):
+    spo2 = parse_spo2(fitbit.get_spo2_summary(start, today))
+    for stat in ("min", "avg", "max"):
+        yield "fitbit_spo2_percent", {"stat": stat}, _latest(spo2, stat)
+
+
+def _breathing_rate(fitbit, start, today):
+    breathing_rate = parse_breathing_rate(
+        fitbit.get_breathing_rate_summary(start, today)
+    )
+    yield (
+        "fitbit_breathing_rate_breaths_per_minute",
+        {},
+        _latest(breathing_rate, "breathing_rate"),
+    )
+
+
+def _devices(fitbit, _start, _today):
+    for device in parse_devices(fitbit.get_devices()):
+        labels = {
+            "device": device.device or "",
+            "type": device.type or "",
+            "mac": device.mac or "",
+        }
+        yield "fitbit_device_battery_percent", labels, device.battery_level
+        yield (
+            "fitbit_device_last_sync_timestamp_seconds",
+            labels,
+            _timestamp(device.last_sync_time),
+        )
+
+
+def _steps(fitbit, _start, today):
+    summary = fitbit.get_daily_activity_summary(today).get("summary", {})
+    yield "fitbit_steps_today", {}, summary.get("steps")
+
+
+def _azm(fitbit, _start, today):
+    azm = parse_azm(fitbit.get_azm_time_series(today))
+    yield "fitbit_active_zone_minutes_today", {}, _latest(azm, "active_zone_minutes")
+
+
+# source -> sample generator, each one is a single API call
+SOURCES = {
+    "heart": _heart,
+    "hrv": _hrv,
+    "spo2": _spo2,
+    "breathing_rate": _breathing_rate,
+    "devices": _devices,
+    "steps": _steps,
+    "active_zone_minutes": _azm,
+}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render(samples):
+    """Render (name, labels, value) samples in the Prometheus text format.
+
+    Samples without a value are left out, metrics are written in METRICS order.
+    """
+    by_name = {}
+    for name, labels, value in samples:
+        if value is not None:
+            by_name.setdefault(name, []).append((labels, value))
+    lines = []
+    for name, (metric_type, help_text) in METRICS.items():
+        if name not in by_name:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in by_name[name]:
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+            series = f"{name}{{{label_text}}}" if label_text else name
+            lines.append(f"{series} {float(value)!r}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """Scrapes the API on a schedule and keeps the rendered metrics in memory
+
+    Requests for /metrics only read the last rendered text, so they never wait
+    for the Fitbit API.
+    """
+
+    def __init__(self, fitbit, interval=DEFAULT_INTERVAL, clock=time.time):
+        self.fitbit = fitbit
+        self.interval = interval
+        self._clock = clock
+        self._errors = dict.fromkeys(SOURCES, 0)
+        self._last_success = None
+        self._text = render([])
+        self._lock = threading.Lock()
+
+    def metrics(self):
+        """Return the metrics of the last scrape in the Prometheus text format."""
+        with self._lock:
+            return self._text
+
+    def scrape(self, today=None):
+        """Fetch every source once and render the result."""
+        today = today or date.today()
+        start = (today - timedelta(days=LOOKBACK_DAYS - 1)).isoformat()
+        today = today.isoformat()
+        began = time.perf_counter()
+        samples, failed = [], False
+        for source, collect in SOURCES.items():
+            try:
+                samples.extend(collect(self.fitbit, start, today))
+            except Exception:  # pylint: disable=broad-exception-caught
+                # An unexpected payload must not stop the other sources, the
+                # failure shows up in fitbit_scrape_errors_total instead
+                self._errors[source] += 1
+                failed = True
+        if not failed:
+            self._last_success = self._clock()
+
+        budget = self._budget()
+        samples.append(
+            (
+                "fitbit_rate_limit_remaining",
+                {},
+                budget.remaining if budget is not None else None,
+            )
+        )
+        samples.append(
+            ("fitbit_scrape_duration_seconds", {}, time.perf_counter() - began)
+        )
+        samples.append(
+            ("fitbit_scrape_last_success_timestamp_seconds", {}, self._last_success)
+        )
+        samples.extend(
+            ("fitbit_scrape_errors_total", {"source": source}, count)
+            for source, count in self._errors.items()
+        )
+        text = render(samples)
+        with self._lock:
+            self._text = text
+
+    def _budget(self):
+        # The local store has no rate limit
+        return getattr(self.fitbit, "rate_limit", None)
+
+    def next_delay(self):
+        """Seconds until the next scrape, waiting for the rate limit reset if needed."""
+        budget = self._budget()
+        if (
+            budget is not None
+            and budget.remaining is not None
+            and budget.remaining < SCRAPE_CALLS
+            and budget.reset_in is not None
+        ):
+            return max(self.interval, budget.reset_in)
+        return self.interval
+
+    def run(self, stop):
+        """Scrape until the stop event is set, surviving failed scrapes."""
+        while not stop.is_set():
+            try:
+                self.scrape()
+            except Exception:  # pylint: disable=broad-exception-caught
+                # Keep the last metrics, their timestamps show they are stale
+                pass
+            stop.wait(self.next_delay())
+
+
+def create_server(exporter, host="127.0.0.1", port=DEFAULT_PORT):
+    """Create the HTTP server answering /metrics from the exporter."""
+
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        """Serve the last rendered metrics"""
+
+        def do_GET(self):  # pylint: disable=C0103
+            """Handle GET request"""
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = exporter.metrics().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):  # pylint: disable=W0622
+            """Do not log every scrape."""
+
+    return ThreadingHTTPServer((host, port), MetricsHandler)
+
+
+def serve(fitbit, port=DEFAULT_PORT, interval=DEFAULT_INTERVAL, host="127.0.0.1"):
+    """Scrape in the background and serve /metrics until interrupted."""
+    exporter = MetricsExporter(fitbit, interval)
+    stop = threading.Event()
+    scraper = threading.Thread(target=exporter.run, args=(stop,), daemon=True)
+    scraper.start()
+    with create_server(exporter, host, port) as httpd:
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stop.set()
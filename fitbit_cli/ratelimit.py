@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Rate limit aware request scheduler
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+RateLimitBudget = namedtuple("RateLimitBudget", ["limit", "remaining", "reset_in"])
+
+
+def _header_int(headers, name):
+    try:
+        return int(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class RateLimiter:  # pylint: disable=too-many-instance-attributes
+    """Paces requests using the Fitbit-Rate-Limit-* response headers
+
+    Requests pass straight through while the budget is healthy. Once the
+    remaining calls drop below ``low_water`` of the limit, requests are spaced
+    evenly over the time left until the window resets, and when the budget is
+    exhausted they wait for the reset instead of running into HTTP 429.
+    """
+
+    def __init__(self, low_water=0.1, clock=time.monotonic, sleep=time.sleep):
+        self.low_water = low_water
+        self.limit = None
+        self.remaining = None
+        self.reset_at = None
+        self._pending = 0
+        self._next_slot = 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def update(self, headers):
+        """Record the budget reported by a response and release its reservation."""
+        limit = _header_int(headers, "Fitbit-Rate-Limit-Limit")
+        remaining = _header_int(headers, "Fitbit-Rate-Limit-Remaining")
+        reset = _header_int(headers, "Fitbit-Rate-Limit-Reset")
+        with self._lock:
+            self._pending = max(0, self._pending - 1)
+            if remaining is None or reset is None:
+                return
+            self.limit = limit
+            self.remaining = remaining
+            self.reset_at = self._clock() + reset
+
+    def reserve(self):
+        """Reserve a request slot and return how many seconds to wait before sending it."""
+        with self._lock:
+            now = self._clock()
+            if self.reset_at is not None and now >= self.reset_at:
+                # New window, the budget is unknown until the next response
+                self.remaining = self.reset_at = None
+            self._pending += 1
+            if self.remaining is None:
+                return 0.0
+
+            available = self.remaining - (self._pending - 1)
+            reset_in = self.reset_at - now
+            if available <= 0:
+                return reset_in
+            if self.limit and available > self.limit * self.low_water:
+                return 0.0
+
+            start = max(now, self._next_slot)
+            self._next_slot = start + reset_in / available
+            return start - now
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        delay = self.reserve()
+        if delay > 0:
+            self._sleep(delay)
+
+    def budget(self):
+        """Return the last known rate limit budget."""
+        with self._lock:
+            reset_in = (
+                max(0.0, self.reset_at - self._clock())
+                if self.reset_at is not None
+                else None
+            )
+            return RateLimitBudget(self.limit, self.remaining, reset_in)
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Typed records parsed from API payloads
+"""
+
+from dataclasses import dataclass
+
+# Each response is parsed once into these records, which the table and JSON
+# formatters then read by attribute. Slotted dataclasses keep them compact (no
+# per-instance __dict__) and cheap to build and read.
+
+
+@dataclass(slots=True)
+class SleepRecord:
+    """One sleep log"""
+
+    date: str | None
+    deep_minutes: int | None
+    light_minutes: int | None
+    rem_minutes: int | None
+    wake_minutes: int | None
+    efficiency: int | None
+    time_in_bed: int | None
+
+
+@dataclass(slots=True)
+class SpO2Record:
+    """One day of SpO2 summary"""
+
+    date: str | None
+    min: float | None
+    avg: float | None
+    max: float | None
+
+
+@dataclass(slots=True)
+class HeartZone:
+    """One heart rate zone of a day"""
+
+    name: str | None
+    min: int | None
+    max: int | None
+    minutes: int | None
+    calories_out: float | None
+
+
+@dataclass(slots=True)
+class HeartRecord:
+    """One day of heart rate time series"""
+
+    date: str | None
+    resting_heart_rate: int | None
+    zones: list[HeartZone]
+
+
+@dataclass(slots=True)
+class AZMRecord:
+    """One day of active zone minutes"""
+
+    date: str | None
+    active_zone_minutes: int | None
+    fat_burn_minutes: int | None
+    cardio_minutes: int | None
+    peak_minutes: int | None
+
+
+@dataclass(slots=True)
+class BreathingRateRecord:
+    """One day of breathing rate summary"""
+
+    date: str | None
+    breathing_rate: float | None
+
+
+@dataclass(slots=True)
+class HRVRecord:
+    """One day of HRV summary"""
+
+    date: str | None
+    daily_rmssd: float | None
+    deep_rmssd: float | None
+
+
+@dataclass(slots=True)
+class BodyRecord:
+    """Weight, BMI and body fat of one day, as reported by the API"""
+
+    date: str | None
+    weight: str | None
+    bmi: str | None
+    fat: str | None
+
+
+@dataclass(slots=True)
+class Device:
+    """One paired device"""
+
+    battery_level: int | None
+    device: str | None
+    type: str | None
+    last_sync_time: str | None
+    mac: str | None
+
+
+@dataclass(slots=True)
+class Activity:
+    """One logged activity"""
+
+    start_time: str | None
+    name: str | None
+    description: str | None
+    distance: float | None
+    steps: int | None
+    calories: int | None
+    duration: int | None
+
+
+@dataclass(slots=True)
+class ActivityDay:
+    """Logged activities of one day, or the error that prevented fetching them"""
+
+    date: str | None
+    activities: list[Activity]
+    error: str | None
+
+
+_EMPTY = {}
+
+
+def _stage_minutes(stages, stage):
+    summary = stages.get(stage)
+    return summary.get("minutes") if summary else None
+
+
+def parse_sleep(sleep_data):
+    """Parse a sleep log response into SleepRecords."""
+    records = []
+    for sleep in sleep_data.get("sleep", []):
+        stages = sleep.get("levels", _EMPTY).get("summary", _EMPTY)
+        records.append(
+            SleepRecord(
+                sleep.get("dateOfSleep"),
+                _stage_minutes(stages, "deep"),
+                _stage_minutes(stages, "light"),
+                _stage_minutes(stages, "rem"),
+                _stage_minutes(stages, "wake"),
+                sleep.get("efficiency"),
+                sleep.get("timeInBed"),
+            )
+        )
+    return records
+
+
+def parse_spo2(spo2_data):
+    """Parse a single day or date range SpO2 response into SpO2Records."""
+    if isinstance(spo2_data, dict):
+        spo2_data = [spo2_data]
+    records = []
+    for spo2 in spo2_data:
+        value = spo2.get("value", _EMPTY)
+        records.append(
+            SpO2Record(
+                spo2.get("dateTime"),
+                value.get("min"),
+                value.get("avg"),
+                value.get("max"),
+            )
+        )
+    return records
+
+
+def parse_heart(heart_data):
+    """Parse a heart rate time series response into HeartRecords."""
+    records = []
+    for day in heart_data.get("activities-heart", []):
+        value = day.get("value", _EMPTY)
+        zones = [
+            HeartZone(
+                zone.get("name"),
+                zone.get("min"),
+                zone.get("max"),
+                zone.get("minutes"),
+                zone.get("caloriesOut"),
+            )
+            for zone in value.get("heartRateZones", [])
+        ]
+        records.append(
+            HeartRecord(day.get("dateTime"), value.get("restingHeartRate"), zones)
+        )
+    return records
+
+
+def parse_azm(azm_data):
+    """Parse an AZM time series response into AZMRecords."""
+    records = []
+    for day in azm_data.get("activities-active-zone-minutes", []):
+        value = day.get("value", _EMPTY)
+        records.append(
+            AZMRecord(
+                day.get("dateTime"),
+                value.get("activeZoneMinutes"),
+                value.get("fatBurnActiveZoneMinutes"),
+                value.get("cardioActiveZoneMinutes"),
+                value.get("peakActiveZoneMinutes"),
+            )
+        )
+    return records
+
+
+def parse_breathing_rate(breathing_rate_data):
+    """Parse a breathing rate summary response into BreathingRateRecords."""
+    return [
+        BreathingRateRecord(
+            br.get("dateTime"), br.get("value", _EMPTY).get("breathingRate")
+        )
+        for br in breathing_rate_data.get("br", [])
+    ]
+
+
+def parse_hrv(hrv_data):
+    """Parse an HRV summary response into HRVRecords."""
+    records = []
+    for hrv in hrv_data.get("hrv", []):
+        value = hrv.get("value", _EMPTY)
+        records.append(
+            HRVRecord(
+                hrv.get("dateTime"), value.get("dailyRmssd"), value.get("deepRmssd")
+            )
+        )
+    return records
+
+
+def parse_body(body_data):
+    """Merge weight, BMI, and body fat time series into BodyRecords sorted by date."""
+    merged = {}
+    for position, resource in enumerate(("weight", "bmi", "fat"), start=1):
+        for item in body_data.get(resource, _EMPTY).get(f"body-{resource}", []):
+            date = item.get("dateTime")
+            row = merged.get(date)
+            if row is None:
+                row = merged[date] = [date, None, None, None]
+            row[position] = item.get("value")
+    return [BodyRecord(*merged[date]) for date in sorted(merged)]
+
+
+def parse_devices(devices):
+    """Parse a device list response into Devices."""
+    return [
+        Device(
+            device.get("batteryLevel"),
+            device.get("deviceVersion"),
+            device.get("type"),
+            device.get("lastSyncTime"),
+            device.get("mac"),
+        )
+        for device in devices
+    ]
+
+
+def parse_activities(activity_data):
+    """Parse collect_activities rows into ActivityDays."""
+    return [
+        ActivityDay(
+            day.get("date"),
+            [
+                Activity(
+                    activity.get("startTime"),
+                    activity.get("name"),
+                    activity.get("description"),
+                    activity.get("distance"),
+                    activity.get("steps"),
+                    activity.get("calories"),
+                    activity.get("duration"),
+                )
+                for activity in day.get("activities", [])
+            ],
+            day.get("error"),
+        )
+        for day in activity_data
+    ]
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Retry policy for transient API failures
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value):
+    """Return the delay in seconds of a Retry-After header (seconds or HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """Jittered exponential backoff with a retry budget shared by every request of a run
+
+    ``max_retries`` bounds the retries of a single request, ``budget`` bounds
+    the retries of all requests together so a failing API cannot stall a long
+    run indefinitely.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        max_retries=3,
+        budget=20,
+        backoff=0.5,
+        max_backoff=60.0,
+        statuses=RETRY_STATUSES,
+        sleep=time.sleep,
+    ):
+        self.max_retries = max_retries
+        self.budget = budget
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def consume(self, attempt):
+        """Return True and use up one retry if attempt may be retried."""
+        with self._lock:
+            if attempt >= self.max_retries or self.budget <= 0:
+                return False
+            self.budget -= 1
+            return True
+
+    def delay(self, attempt, retry_after=None):
+        """Return the seconds to wait before retry number attempt + 1."""
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            return min(server_delay, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def wait(self, attempt, retry_after=None):
+        """Sleep before the next retry."""
+        self._sleep(self.delay(attempt, retry_after))
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Vectorized statistics over formatted sections
+"""
+
+DEFAULT_WINDOW = 7
+PERCENTILES = (10, 50, 90)
+
+# Section -> (series name, field of the formatted record)
+STATS_FIELDS = {
+    "sleep": (
+        ("sleep_efficiency", "efficiency"),
+        ("sleep_deep_minutes", "deep_minutes"),
+        ("sleep_light_minutes", "light_minutes"),
+        ("sleep_rem_minutes", "rem_minutes"),
+        ("sleep_wake_minutes", "wake_minutes"),
+    ),
+    "spo2": (("spo2_avg", "avg"),),
+    "heart": (("resting_heart_rate", "resting_heart_rate"),),
+    "breathing_rate": (("breathing_rate", "breathing_rate"),),
+    "hrv": (("hrv_daily_rmssd", "daily_rmssd"),),
+    "body": (("weight", "weight"), ("bmi", "bmi"), ("fat", "fat")),
+}
+
+
+def _numpy():
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        raise ImportError(
+            "--stats requires numpy, install it with: pip install fitbit-cli[stats]"
+        ) from e
+    return numpy
+
+
+def rolling_mean(values, window):
+    """Return the trailing mean of every full window of values, computed with one cumsum."""
+    np = _numpy()
+    window = min(window, len(values))
+    cumsum = np.concatenate(([0.0], np.cumsum(values)))
+    return (cumsum[window:] - cumsum[:-window]) / window
+
+
+def series_stats(name, dates, values, window=DEFAULT_WINDOW):
+    """Summarize one daily series: range, mean, min/max, percentiles, rolling mean and trend.
+
+    Missing values (None) are dropped. The rolling mean covers the last window
+    values, or every value of a shorter series, and rolling_window reports
+    how many values it actually covers. The trend is the least squares slope in
+    units per day, so gaps between measurements are accounted for.
+    """
+    np = _numpy()
+    days = np.array(dates, dtype="datetime64[D]").astype(np.int64)
+    values = np.array(
+        [np.nan if value is None else float(value) for value in values], dtype=float
+    )
+    present = ~np.isnan(values)
+    days, values = days[present], values[present]
+    order = np.argsort(days, kind="stable")
+    days, values = days[order], values[order]
+
+    stats = {"metric": name, "count": int(values.size)}
+    if not values.size:
+        return stats
+
+    percentiles = np.percentile(values, PERCENTILES)
+    trend = None
+    if np.unique(days).size > 1:
+        trend = round(float(np.polyfit(days - days[0], values, 1)[0]), 4)
+    return {
+        **stats,
+        "start": str(days[0].astype("datetime64[D]")),
+        "end": str(days[-1].astype("datetime64[D]")),
+        "mean": round(float(values.mean()), 2),
+        "min": round(float(values.min()), 2),
+        "max": round(float(values.max()), 2),
+        **{
+            f"p{p}": round(float(value), 2)
+            for p, value in zip(PERCENTILES, percentiles)
+        },
+        "rolling_window": min(window, int(values.size)),
+        "rolling_mean": round(float(rolling_mean(values, window)[-1]), 2),
+        "trend_per_day": trend,
+    }
+
+
+def compute_stats(sections, window=DEFAULT_WINDOW):
+    """Compute series_stats for every supported series of the formatted sections.
+
+    sections yields (section name, formatter JSON output) as produced by
+    ``render_sections(..., as_json=True)``. Sections without numeric daily
+    series, such as devices or activities, are skipped.
+    """
+    results = []
+    for name, section in sections:
+        records = section[name]
+        dates = [record.get("date") for record in records]
+        for series, field in STATS_FIELDS.get(name, ()):
+            values = [record.get(field) for record in records]
+            results.append(series_stats(series, dates, values, window))
+    return results
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+Local metrics store
+"""
+
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from functools import partial
+from pathlib import Path
+
+from .cache import MUTABLE_DAYS
+from .dates import iter_days, to_date
+from .exceptions import FitbitAPIError
+from .jsonlib import dumps, loads
+
+FITBIT_STORE_PATH = f"{Path.home()}/.fitbit/metrics.db"
+DEFAULT_BACKFILL_DAYS = 30
+
+# metric -> (FitbitAPI method, extra leading args, list key in the response)
+RANGE_METRICS = {
+    "sleep": ("get_sleep_log", (), "sleep"),
+    "spo2": ("get_spo2_summary", (), None),
+    "heart": ("get_heart_rate_time_series", (), "activities-heart"),
+    "active_zone": ("get_azm_time_series", (), "activities-active-zone-minutes"),
+    "breathing_rate": ("get_breathing_rate_summary", (), "br"),
+    "hrv": ("get_hrv_summary", (), "hrv"),
+    "body-weight": ("get_body_time_series", ("weight",), "body-weight"),
+    "body-bmi": ("get_body_time_series", ("bmi",), "body-bmi"),
+    "body-fat": ("get_body_time_series", ("fat",), "body-fat"),
+}
+DAILY_METRICS = ("activities",)
+SNAPSHOTS = {"user_profile": "get_user_profile", "devices": "get_devices"}
+METRICS = (*RANGE_METRICS, *DAILY_METRICS)
+
+
+def _split_records(metric, payload):
+    """Yield (date, key, record) for each per-day item of a range response."""
+    _, _, list_key = RANGE_METRICS[metric]
+    if list_key is None:
+        items = payload if isinstance(payload, list) else [payload]
+    else:
+        items = payload.get(list_key, [])
+    for item in items:
+        if metric == "sleep":
+            yield item["dateOfSleep"], str(item.get("logId", "")), item
+        elif item.get("dateTime"):
+            yield item["dateTime"], "", item
+
+
+def _fetch_day_summary(fitbit, day):
+    """Fetch one day's activity summary, returning None on failure."""
+    try:
+        return fitbit.get_daily_activity_summary(day)
+    except (FitbitAPIError, OSError):
+        return None
+
+
+class MetricsStore:
+    """SQLite store of per-day metric records with a high-water mark per metric
+
+    The getter methods mirror FitbitAPI so the output modes can read from the
+    store instead of the network.
+    """
+
+    def __init__(self, path=FITBIT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(
+                "CREATE TABLE IF NOT EXISTS records ("
+                "metric TEXT NOT NULL, date TEXT NOT NULL, key TEXT NOT NULL, "
+                "payload TEXT NOT NULL, PRIMARY KEY (metric, date, key));"
+                "CREATE TABLE IF NOT EXISTS sync_state ("
+                "metric TEXT PRIMARY KEY, high_water TEXT NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                "name TEXT PRIMARY KEY, payload TEXT NOT NULL);"
+            )
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+    # --------- Sync ---------
+
+    def high_water(self, metric):
+        """Return the last fully synced day of a metric, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT high_water FROM sync_state WHERE metric = ?", (metric,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def sync_range(self, metric, start_date=None, today=None):
+        """Return the (start, end) days that still need to be fetched for a metric."""
+        today = today or date.today()
+        if start_date is None:
+            high_water = self.high_water(metric)
+            if high_water is None:
+                start = today - timedelta(days=DEFAULT_BACKFILL_DAYS)
+            else:
+                start = min(
+                    to_date(high_water) + timedelta(days=1),
+                    today - timedelta(days=MUTABLE_DAYS),
+                )
+        else:
+            start = to_date(start_date)
+        return start.isoformat(), today.isoformat()
+
+    def _save(self, metric, records, high_water, clear_range=None):
+        """Atomically store records of a metric and move its high-water mark.
+
+        When clear_range is given, records in that (start, end) range are removed
+        first so that entries deleted upstream disappear from the store too.
+        """
+        with self._lock, self._conn:
+            if clear_range is not None:
+                self._conn.execute(
+                    "DELETE FROM records WHERE metric = ? AND date BETWEEN ? AND ?",
+                    (metric, *clear_range),
+                )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?)",
+                [(metric, day, key, dumps(record)) for day, key, record in records],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?)",
+                (metric, high_water),
+            )
+
+    def _sync_metric(  # pylint: disable=too-many-locals
+        self, fitbit, metric, start_date, workers
+    ):
+        start, end = self.sync_range(metric, start_date)
+        if metric in RANGE_METRICS:
+            method, extra, _ = RANGE_METRICS[metric]
+            try:
+                payload = getattr(fitbit, method)(*extra, start, end)
+            except (FitbitAPIError, OSError) as e:
+                # Nothing is saved, so the range is fetched again on the next sync
+                return {
+                    "metric": metric,
+                    "start": start,
+                    "end": end,
+                    "records": 0,
+                    "failed_days": [],
+                    "error": str(e),
+                }
+            records = list(_split_records(metric, payload))
+            self._save(metric, records, end, clear_range=(start, end))
+            return {
+                "metric": metric,
+                "start": start,
+                "end": end,
+                "records": len(records),
+                "failed_days": [],
+                "error": None,
+            }
+
+        records, failed = [], []
+        days = list(iter_days(start, end))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for day, summary in zip(
+                days, executor.map(partial(_fetch_day_summary, fitbit), days)
+            ):
+                if summary is None:
+                    failed.append(day)
+                else:
+                    records.append((day, "", summary))
+        # Failed days are retried on the next sync
+        high_water = (
+            (to_date(failed[0]) - timedelta(days=1)).isoformat() if failed else end
+        )
+        self._save(metric, records, high_water)
+        return {
+            "metric": metric,
+            "start": start,
+            "end": end,
+            "records": len(records),
+            "failed_days": failed,
+            "error": None,
+        }
+
+    def _sync_snapshot(self, fitbit, name, method):
+        today = date.today().isoformat()
+        try:
+            payload = getattr(fitbit, method)()
+        except (FitbitAPIError, OSError) as e:
+            # The previous snapshot, if any, is kept
+            records, error = 0, str(e)
+        else:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO snapshots VALUES (?, ?)",
+                    (name, dumps(payload)),
+                )
+            records, error = 1, None
+        return {
+            "metric": name,
+            "start": today,
+            "end": today,
+            "records": records,
+            "failed_days": [],
+            "error": error,
+        }
+
+    def sync(self, fitbit, start_date=None, workers=4):
+        """Fetch the missing and still mutable days of every metric into the store.
+
+        Returns one summary row per snapshot and per metric. A snapshot or a
+        metric whose request fails carries the error and does not stop the
+        others. The per-day
+        activity fan-out runs inside the metric pool, so requests are bounded by
+        the client's in-flight limit rather than by either pool.
+        """
+        snapshots = [
+            self._sync_snapshot(fitbit, name, method)
+            for name, method in SNAPSHOTS.items()
+        ]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._sync_metric, fitbit, metric, start_date, workers)
+                for metric in METRICS
+            ]
+            return snapshots + [future.result() for future in futures]
+
+    # --------- FitbitAPI compatible readers ---------
+
+    def _records(self, metric, start_date, end_date=None):
+        start = str(start_date)
+        end = str(end_date) if end_date else start
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM records WHERE metric = ? AND date BETWEEN ? AND ? "
+                "ORDER BY date, key",
+                (metric, start, end),
+            ).fetchall()
+        return [loads(row[0]) for row in rows]
+
+    def _snapshot(self, name):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM snapshots WHERE name = ?", (name,)
+            ).fetchone()
+        if row is None:
+            raise FitbitAPIError(f"No {name} in the local store, run --sync first")
+        return loads(row[0])
+
+    def get_user_profile(self):
+        """Get Profile from the store"""
+        return self._snapshot("user_profile")
+
+    def get_devices(self):
+        """Get Devices from the store"""
+        return self._snapshot("devices")
+
+    def get_sleep_log(self, start_date, end_date=None):
+        """Get Sleep Logs from the store"""
+        return {"sleep": self._records("sleep", start_date, end_date)}
+
+    def get_heart_rate_time_series(self, start_date, end_date=None):
+        """Get Heart Rate Time Series from the store"""
+        return {"activities-heart": self._records("heart", start_date, end_date)}
+
+    def get_spo2_summary(self, start_date, end_date=None):
+        """Get SpO2 Summary from the store"""
+        records = self._records("spo2", start_date, end_date)
+        if end_date:
+            return records
+        return records[0] if records else {}
+
+    def get_azm_time_series(self, start_date, end_date=None):
+        """Get AZM Time Series from the store"""
+        return {
+            "activities-active-zone-minutes": self._records(
+                "active_zone", start_date, end_date
+            )
+        }
+
+    def get_breathing_rate_summary(self, start_date, end_date=None):
+        """Get Breathing Rate Summary from the store"""
+        return {"br": self._records("breathing_rate", start_date, end_date)}
+
+    def get_hrv_summary(self, start_date, end_date=None):
+        """Get HRV Summary from the store"""
+        return {"hrv": self._records("hrv", start_date, end_date)}
+
+    def get_body_time_series(self, resource_path, start_date, end_date=None):
+        """Get Body Time Series from the store"""
+        key = f"body-{resource_path}"
+        return {key: self._records(key, start_date, end_date)}
+
+    def get_daily_activity_summary(self, start_date):
+        """Get Daily Activity Summary from the store"""
+        records = self._records("activities", start_date)
+        if not records:
+            raise FitbitAPIError(f"No activities for {start_date} in the local store")
+        return records[0]
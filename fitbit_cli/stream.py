@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming output for large payloads
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .dates import iter_days
+from .jsonlib import dumps
+
+AZM_FIELDS = {
+    "activeZoneMinutes": "active_zone_minutes",
+    "fatBurnActiveZoneMinutes": "fat_burn_minutes",
+    "cardioActiveZoneMinutes": "cardio_minutes",
+    "peakActiveZoneMinutes": "peak_minutes",
+}
+BR_FIELDS = {
+    "deepSleepSummary": "deep_sleep",
+    "remSleepSummary": "rem_sleep",
+    "lightSleepSummary": "light_sleep",
+    "fullSleepSummary": "full_sleep",
+}
+
+
+class JSONObjectWriter:
+    """Writes one compact JSON object member by member
+
+    Each member is written as soon as it is available and list members record
+    by record, so nothing waits for the whole document to be assembled. The
+    closing brace is only written when the block exits without an error, so a
+    failed run never produces a document that looks complete.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._members = 0
+
+    def __enter__(self):
+        self.stream.write("{")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.stream.write("}\n")
+        self.stream.flush()
+
+    def write_member(self, key, value):
+        """Write one "key":value member of the object."""
+        if self._members:
+            self.stream.write(",")
+        self.stream.write(dumps(key))
+        self.stream.write(":")
+        if isinstance(value, list):
+            self.stream.write("[")
+            for i, record in enumerate(value):
+                if i:
+                    self.stream.write(",")
+                self.stream.write(dumps(record))
+            self.stream.write("]")
+        else:
+            self.stream.write(dumps(value))
+        self._members += 1
+        self.stream.flush()
+
+
+class NDJSONWriter:
+    """Writes one compact JSON document per line"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, record):
+        """Write a single record line."""
+        self.stream.write(dumps(record))
+        self.stream.write("\n")
+
+    def write_section(self, name, section):
+        """Write every record of a formatted section tagged with its metric name."""
+        records = section if isinstance(section, list) else [section]
+        for record in records:
+            self.write({"metric": name, **record})
+        self.stream.flush()
+
+
+def iter_spo2_intraday(spo2_data):
+    """Yield one sample per minute of a SpO2 intraday response."""
+    days = spo2_data if isinstance(spo2_data, list) else [spo2_data]
+    for day in days:
+        for minute in day.get("minutes", []):
+            yield {"time": minute.get("minute"), "spo2": minute.get("value")}
+
+
+def iter_azm_intraday(azm_data):
+    """Yield one sample per minute of an AZM intraday response."""
+    for day in azm_data.get("activities-active-zone-minutes-intraday", []):
+        for minute in day.get("minutes", []):
+            value = minute.get("value", {})
+            yield {
+                "time": minute.get("minute"),
+                **{field: value.get(key) for key, field in AZM_FIELDS.items()},
+            }
+
+
+def iter_breathing_rate_intraday(breathing_rate_data):
+    """Yield one sample per day and sleep stage of a breathing rate intraday response."""
+    for day in breathing_rate_data.get("br", []):
+        value = day.get("value", {})
+        yield {
+            "date": day.get("dateTime"),
+            **{
+                field: value.get(key, {}).get("breathingRate")
+                for key, field in BR_FIELDS.items()
+            },
+        }
+
+
+# CLI argument -> (FitbitAPI method, sample parser)
+INTRADAY_METRICS = {
+    "spo2_intraday": ("get_spo2_intraday", iter_spo2_intraday),
+    "azm_intraday": ("get_azm_intraday", iter_azm_intraday),
+    "breathing_rate_intraday": (
+        "get_breathing_rate_intraday",
+        iter_breathing_rate_intraday,
+    ),
+}
+
+
+def prefetch(fetch, items, workers):
+    """Yield fetch(item) for each item in order, keeping at most workers calls in flight.
+
+    Only a bounded window of responses is held in memory, so long ranges can be
+    streamed while later days are still being downloaded.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(fetch, item))
+            if len(pending) >= workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_intraday(fitbit, args):
+    """Fetch the requested intraday metrics day by day and yield (metric, sample)."""
+    for metric, (method, parse) in INTRADAY_METRICS.items():
+        date_range = getattr(args, metric)
+        if not date_range:
+            continue
+        start_date, end_date = date_range
+        days = iter_days(start_date, end_date or start_date)
+        for payload in prefetch(getattr(fitbit, method), days, args.workers):
+            for sample in parse(payload):
+                yield metric, sample
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Per-request and per-phase timing instrumentation
+"""
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlsplit
+
+# The recorder is process wide so the API clients, the output code and the
+# formatters can report to it without passing it around. Every helper is a
+# no-op until enable() is called.
+_RECORDER = None
+
+
+class Timings:
+    """Thread safe collector of API request timings and named phase durations"""
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+        self.requests = []
+        self.cache_hits = []
+        self.token_refreshes = 0
+        self.phases = {}
+
+    def add_request(self, request):
+        """Record one HTTP exchange, a dict as built by record_request."""
+        with self._lock:
+            self.requests.append(request)
+
+    def add_cache_hit(self, path):
+        """Record a response served from the response cache."""
+        with self._lock:
+            self.cache_hits.append(path)
+
+    def add_token_refresh(self):
+        """Record a token refresh round trip."""
+        with self._lock:
+            self.token_refreshes += 1
+
+    def add_phase(self, name, seconds):
+        """Add the duration of one run of a named phase."""
+        with self._lock:
+            calls, total = self.phases.get(name, (0, 0.0))
+            self.phases[name] = (calls + 1, total + seconds)
+
+    def summary(self):
+        """Return every measurement as a JSON serializable dict, durations in ms."""
+        with self._lock:
+            requests = list(self.requests)
+            phases = dict(self.phases)
+            cache_hits = list(self.cache_hits)
+            token_refreshes = self.token_refreshes
+        return {
+            "requests": requests,
+            "totals": {
+                "requests": len(requests),
+                "retries": sum(1 for r in requests if r["attempt"]),
+                "token_refreshes": token_refreshes,
+                "cache_hits": len(cache_hits),
+                "bytes": sum(r["bytes"] or 0 for r in requests),
+                "network_ms": round(sum(r["total_ms"] for r in requests), 3),
+                "wall_ms": _ms(self._clock() - self._started),
+            },
+            "cache_hits": cache_hits,
+            "phases": {
+                name: {"calls": calls, "ms": _ms(total)}
+                for name, (calls, total) in sorted(phases.items())
+            },
+        }
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def endpoint(url):
+    """Return the path and query of an API URL."""
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+
+def enable():
+    """Start recording and return the recorder."""
+    global _RECORDER  # pylint: disable=global-statement
+    _RECORDER = Timings()
+    return _RECORDER
+
+
+def disable():
+    """Stop recording."""
+    global _RECORDER  # pylint: disable=global-statement
+    _RECORDER = None
+
+
+def active():
+    """Return the recorder, or None when timings are off."""
+    return _RECORDER
+
+
+@contextmanager
+def _timed_phase(recorder, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add_phase(name, time.perf_counter() - start)
+
+
+def phase(name):
+    """Context manager adding the duration of its block to the named phase."""
+    recorder = _RECORDER
+    return nullcontext() if recorder is None else _timed_phase(recorder, name)
+
+
+def record_request(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    method, url, response, seconds, attempt, wait
+):
+    """Record one HTTP exchange of a requests response.
+
+    ``response.elapsed`` covers sending the request until the headers are
+    parsed, i.e. connecting (on a new connection) plus time to first byte. The
+    rest of the exchange is reading the body. The connect time is not exposed
+    separately by requests, so it is part of ttfb.
+    """
+    recorder = _RECORDER
+    if recorder is None:
+        return
+    ttfb = None
+    download = None
+    size = None
+    status = None
+    if response is not None:
+        status = response.status_code
+        ttfb = response.elapsed.total_seconds()
+        download = max(0.0, seconds - ttfb)
+        size = len(response.content)
+    recorder.add_request(
+        {
+            "method": method,
+            "endpoint": endpoint(url),
+            "status": status,
+            "attempt": attempt,
+            "wait_ms": _ms(wait),
+            "ttfb_ms": _ms(ttfb) if ttfb is not None else None,
+            "download_ms": _ms(download) if download is not None else None,
+            "total_ms": _ms(seconds),
+            "bytes": size,
+        }
+    )
+
+
+def record_cache_hit(url):
+    """Record a response served from the response cache."""
+    if _RECORDER is not None:
+        _RECORDER.add_cache_hit(endpoint(url))
+
+
+def record_token_refresh():
+    """Record a token refresh round trip."""
+    if _RECORDER is not None:
+        _RECORDER.add_token_refresh()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Watch mode
+"""
+
+import sys
+import time
+from datetime import datetime
+
+from . import formatter as fmt
+from .cli import resolve_dates
+from .exceptions import FitbitAPIError
+from .output import fetch_sections, format_sections
+from .stream import NDJSONWriter
+
+
+def index_records(section):
+    """Key the records of a formatted section for diffing.
+
+    Dated records are keyed by date and their position within that date, e.g.
+    a nap after the main sleep. Undated records are keyed by position.
+    """
+    records = section if isinstance(section, list) else [section]
+    keyed, per_day = {}, {}
+    for position, record in enumerate(records):
+        day = record.get("date") if isinstance(record, dict) else None
+        if day is None:
+            keyed[(None, position)] = record
+        else:
+            occurrence = per_day.get(day, 0)
+            per_day[day] = occurrence + 1
+            keyed[(day, occurrence)] = record
+    return keyed
+
+
+def diff_records(previous, current):
+    """Return the (change, record) pairs between two index_records results.
+
+    change is "added", "changed" or "removed". Unchanged records are skipped.
+    """
+    changes = []
+    for key, record in current.items():
+        before = previous.get(key)
+        if before is None:
+            changes.append(("added", record))
+        elif before != record:
+            changes.append(("changed", record))
+    changes.extend(
+        ("removed", record) for key, record in previous.items() if key not in current
+    )
+    return changes
+
+
+class Watcher:  # pylint: disable=too-few-public-methods
+    """Polls the requested sections and diffs them against the previous poll"""
+
+    def __init__(self, fitbit, args):
+        self.fitbit = fitbit
+        self.args = args
+        self._previous = {}
+
+    def poll(self):
+        """Fetch every section once and return (sections, {section: changes}).
+
+        Date arguments are resolved on every poll, so "today" and relative
+        ranges move forward when the watch runs past midnight.
+        """
+        args = resolve_dates(self.args)
+        sections = list(fetch_sections(self.fitbit, args))
+        changes = {}
+        for name, section in format_sections(sections, args, as_json=True):
+            current = index_records(section[name])
+            changes[name] = diff_records(self._previous.get(name, {}), current)
+            self._previous[name] = current
+        return sections, changes
+
+
+def _write_changes(writer, changes):
+    for name, section_changes in changes.items():
+        for change, record in section_changes:
+            writer.write({"metric": name, "change": change, **record})
+    writer.stream.flush()
+
+
+def _render_changes(sections, changes, args):
+    changed = {name for name, section_changes in changes.items() if section_changes}
+    if not changed:
+        return
+    fmt.CONSOLE.rule(f"Changes at {datetime.now():%H:%M:%S}")
+    for _ in format_sections(sections, args, compact=args.compact, only=changed):
+        pass
+
+
+def watch_display(fitbit, args, polls=None, sleep=time.sleep):
+    """Re-poll the requested data every args.watch seconds and show what changed.
+
+    The first poll shows everything. Later polls re-render only the sections
+    that changed, or with --json/--ndjson write one line per added, changed or
+    removed record. Stops on Ctrl+C, or after polls polls.
+    """
+    watcher = Watcher(fitbit, args)
+    writer = NDJSONWriter(sys.stdout)
+    as_json = args.json or args.ndjson
+    count = 0
+    try:
+        while True:
+            try:
+                sections, changes = watcher.poll()
+            except (FitbitAPIError, OSError) as e:
+                print(f"Poll failed: {e}", file=sys.stderr)
+            else:
+                if as_json:
+                    _write_changes(writer, changes)
+                else:
+                    _render_changes(sections, changes, args)
+            count += 1
+            if polls is not None and count >= polls:
+                return
+            sleep(args.watch)
+    except KeyboardInterrupt:
+        pass
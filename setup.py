@@ -2,6 +2,7 @@
 """
 setup.py
 """
+
 # pylint: disable=C0301
 
 import re
@@ -49,6 +50,12 @@ setup(
         "requests==2.33.1",
         "rich==15.0.0",
     ],
+    extras_require={
+        "async": ["aiohttp==3.14.5"],
+        "fast-json": ["orjson==3.13.0"],
+        "parquet": ["pyarrow==26.0.0"],
+        "stats": ["numpy==2.4.6"],
+    },
     python_requires=">=3.12",
     entry_points={"console_scripts": ["fitbit-cli = fitbit_cli.main:main"]},
 )
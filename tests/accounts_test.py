@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Multiple Accounts Tests
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413
+from output_test import make_args  # isort: skip  # pylint: disable=C0411,E0401
+from fitbit_cli import fitbit_setup
+from fitbit_cli.accounts import account_cache_path, accounts_display, load_accounts
+from fitbit_cli.exceptions import FitbitAPIError, FitbitInitError
+from fitbit_cli.fitbit_api import FitbitAPI
+
+
+def hrv_client(rmssd):
+    """Mocked API with one day of HRV."""
+    client = MagicMock()
+    client.get_hrv_summary.return_value = {
+        "hrv": [{"dateTime": "2024-01-01", "value": {"dailyRmssd": rmssd}}]
+    }
+    return client
+
+
+class TestLoadAccounts(unittest.TestCase):
+    """Test suite for discovering account token files."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_directory_of_token_files(self):
+        """Test that every JSON file in a directory is an account named after it."""
+        for name in ("bob", "alice"):
+            fitbit_setup.write_fitbit_token(
+                {}, os.path.join(self.tmp.name, f"{name}.json")
+            )
+
+        accounts = load_accounts(self.tmp.name)
+
+        self.assertEqual(list(accounts), ["alice", "bob"])
+        self.assertEqual(accounts["bob"], os.path.join(self.tmp.name, "bob.json"))
+
+    def test_manifest_resolves_relative_paths(self):
+        """Test that manifest token paths are relative to the manifest."""
+        manifest = os.path.join(self.tmp.name, "accounts.json")
+        with open(manifest, "w", encoding="utf-8") as f:
+            json.dump({"alice": "tokens/alice.json", "bob": "/srv/bob.json"}, f)
+
+        accounts = load_accounts(manifest)
+
+        self.assertEqual(
+            accounts,
+            {
+                "alice": os.path.join(self.tmp.name, "tokens", "alice.json"),
+                "bob": "/srv/bob.json",
+            },
+        )
+
+    def test_invalid_account_names_are_rejected(self):
+        """Test that account names cannot escape the cache directory."""
+        manifest = os.path.join(self.tmp.name, "accounts.json")
+        with open(manifest, "w", encoding="utf-8") as f:
+            json.dump({"../x": "x.json"}, f)
+
+        with self.assertRaises(FitbitInitError):
+            load_accounts(manifest)
+
+    def test_each_account_has_its_own_cache(self):
+        """Test that accounts never share cached responses."""
+        self.assertNotEqual(account_cache_path("alice"), account_cache_path("bob"))
+
+    def test_refresh_updates_the_account_token_file(self):
+        """Test that a token refresh writes to the token file of its own account."""
+        paths = {}
+        for name in ("alice", "bob"):
+            paths[name] = os.path.join(self.tmp.name, f"{name}.json")
+            fitbit_setup.write_fitbit_token(
+                {"access_token": "a", "refresh_token": f"{name}-r1"}, paths[name]
+            )
+        fitbit = FitbitAPI("client", "secret", "a", "bob-r1", token_path=paths["bob"])
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"access_token": "b2", "refresh_token": "bob-r2"}
+        fitbit.session.post = MagicMock(return_value=response)
+
+        fitbit.refresh_access_token()
+
+        self.assertEqual(
+            fitbit_setup.read_fitbit_token(paths["bob"])["refresh_token"], "bob-r2"
+        )
+        self.assertEqual(
+            fitbit_setup.read_fitbit_token(paths["alice"])["refresh_token"], "alice-r1"
+        )
+
+
+class TestAccountsDisplay(unittest.TestCase):
+    """Test suite for fetching and tagging the data of several accounts."""
+
+    def setUp(self):
+        failing = MagicMock()
+        failing.get_hrv_summary.side_effect = FitbitAPIError("HTTP error occurred")
+        self.clients = {
+            "alice": hrv_client(40.0),
+            "bob": failing,
+            "carol": hrv_client(50.0),
+        }
+        self.factories = {
+            account: MagicMock(return_value=client)
+            for account, client in self.clients.items()
+        }
+
+    def run_display(self, **kwargs):
+        """Run accounts_display and return stdout."""
+        args = make_args(
+            hrv=("2024-01-01", None), json=False, raw_json=False, ndjson=False
+        )
+        vars(args).update(kwargs)
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            accounts_display(self.factories, args)
+        return stdout.getvalue()
+
+    def test_ndjson_records_are_tagged_by_account(self):
+        """Test that each NDJSON line names its account and failures do not stop others."""
+        lines = [
+            json.loads(line) for line in self.run_display(ndjson=True).splitlines()
+        ]
+
+        self.assertEqual(
+            [
+                (line["account"], line.get("daily_rmssd"), line.get("error"))
+                for line in lines
+            ],
+            [
+                ("alice", 40.0, None),
+                ("bob", None, "HTTP error occurred"),
+                ("carol", 50.0, None),
+            ],
+        )
+
+    def test_json_is_keyed_by_account(self):
+        """Test that JSON output holds one object per account."""
+        output = json.loads(self.run_display(json=True))
+
+        self.assertEqual(list(output), ["alice", "bob", "carol"])
+        self.assertEqual(output["carol"]["hrv"][0]["daily_rmssd"], 50.0)
+        self.assertEqual(output["bob"], {"error": "HTTP error occurred"})
+
+    def test_account_without_a_usable_token_file_does_not_stop_the_others(self):
+        """Test that a client that cannot be created only fails its own account."""
+
+        def missing_token():
+            raise FitbitInitError("Token file not found at bob.json")
+
+        self.factories["bob"] = missing_token
+
+        output = json.loads(self.run_display(json=True))
+
+        self.assertEqual(output["bob"], {"error": "Token file not found at bob.json"})
+        self.assertEqual(output["alice"]["hrv"][0]["daily_rmssd"], 40.0)
+        self.assertEqual(output["carol"]["hrv"][0]["daily_rmssd"], 50.0)
+
+    def test_every_client_is_closed(self):
+        """Test that clients are closed once their account is fetched."""
+        self.run_display(ndjson=True)
+
+        for client in self.clients.values():
+            client.close.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
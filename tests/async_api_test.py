@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Async Fitbit API Tests
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413
+from fitbit_cli import async_api, fitbit_setup
+from fitbit_cli.async_api import AsyncFitbitAPI
+from fitbit_cli.retry import RetryPolicy
+
+
+def make_response(status, body="{}", headers=None):
+    """Build a fake aiohttp response whose body has already been read."""
+    return MagicMock(
+        status=status, headers=headers or {}, text=AsyncMock(return_value=body)
+    )
+
+
+@unittest.skipIf(async_api.aiohttp is None, "aiohttp is not installed")
+class TestAsyncFitbitAPI(unittest.IsolatedAsyncioTestCase):
+    """Test suite for the asyncio Fitbit client."""
+
+    async def asyncSetUp(self):
+        self.fitbit = AsyncFitbitAPI(
+            "client",
+            "secret",
+            "access",
+            "refresh",
+            retry_policy=RetryPolicy(sleep=MagicMock()),
+        )
+
+    async def asyncTearDown(self):
+        await self.fitbit.close()
+
+    async def test_getters_share_the_sync_url_surface(self):
+        """Test that async getters request the same URLs as FitbitAPI."""
+        self.fitbit._send = AsyncMock(  # pylint: disable=W0212
+            return_value=make_response(200, '{"hrv":[]}')
+        )
+
+        result = await self.fitbit.get_hrv_summary("2024-01-01", "2024-01-07")
+
+        self.assertEqual(result, {"hrv": []})
+        self.assertEqual(
+            self.fitbit._send.call_args.args[1],  # pylint: disable=W0212
+            "https://api.fitbit.com/1/user/-/hrv/date/2024-01-01/2024-01-07.json",
+        )
+
+    async def test_long_ranges_are_gathered_concurrently_and_merged(self):
+        """Test that chunked ranges are requested together and merged in order."""
+        started = []
+
+        async def send(_method, url, _headers):
+            started.append(url)
+            await asyncio.sleep(0.01 if len(started) == 1 else 0)
+            return make_response(200, f'{{"br":["{url[-15:-5]}"]}}')
+
+        self.fitbit._send = send  # pylint: disable=W0212
+
+        result = await self.fitbit.get_breathing_rate_summary(
+            "2024-01-01", "2024-02-14"
+        )
+
+        self.assertEqual(result, {"br": ["2024-01-30", "2024-02-14"]})
+
+    @patch("fitbit_cli.async_api.update_fitbit_token")
+    async def test_401_refreshes_token_once_and_retries(self, mock_update):
+        """Test that a 401 triggers an async token refresh and a retried request."""
+        self.fitbit._send = AsyncMock(  # pylint: disable=W0212
+            side_effect=[make_response(401), make_response(200, "[]")]
+        )
+
+        async def refresh(expired_token=None):
+            self.assertEqual(expired_token, "access")
+            self.fitbit.access_token = "new"
+            self.fitbit.headers = self.fitbit._create_headers()  # pylint: disable=W0212
+
+        self.fitbit.refresh_access_token = refresh
+
+        self.assertEqual(await self.fitbit.get_devices(), [])
+        sent_headers = self.fitbit._send.call_args.args[2]  # pylint: disable=W0212
+        self.assertEqual(sent_headers["Authorization"], "Bearer new")
+        mock_update.assert_not_called()
+
+    async def test_expiring_token_adopts_a_token_refreshed_elsewhere(self):
+        """Test that an expiring token is replaced from the token file before sending."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "token.json")
+            with patch.object(fitbit_setup, "FITBIT_TOKEN_PATH", path):
+                fitbit_setup.write_fitbit_token(
+                    {"access_token": "other", "refresh_token": "refresh9"}
+                )
+                self.fitbit.expires_at = time.time() + 60
+                self.fitbit._send = AsyncMock(  # pylint: disable=W0212
+                    return_value=make_response(200, "[]")
+                )
+
+                self.assertEqual(await self.fitbit.get_devices(), [])
+
+        sent_headers = self.fitbit._send.call_args.args[2]  # pylint: disable=W0212
+        self.assertEqual(sent_headers["Authorization"], "Bearer other")
+        self.assertEqual(self.fitbit.refresh_token, "refresh9")
+
+
+if __name__ == "__main__":
+    unittest.main()
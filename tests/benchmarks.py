@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks
+
+Times the formatters, body merging, the activity fetch pipeline against a
+mocked API with injected latency, and cold CLI startup. Not collected by
+pytest, run it directly::
+
+    python tests/benchmarks.py --output bench.json
+    python tests/benchmarks.py --compare bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from argparse import Namespace
+from datetime import date, timedelta
+
+# Add the parent directory to sys.path to make imports work
+ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+sys.path.insert(0, ROOT)
+
+# pylint: disable=C0413
+from rich.console import Console
+
+from fitbit_cli import __version__
+from fitbit_cli import formatter as fmt
+from fitbit_cli import output
+
+DAYS = (1, 30, 365, 1095)
+QUICK_DAYS = (1, 30)
+LATENCY = 0.02
+
+
+def _dates(days):
+    start = date(2022, 1, 1)
+    return [(start + timedelta(days=i)).isoformat() for i in range(days)]
+
+
+def sleep_payload(days):
+    """Synthetic sleep log response."""
+    stages = {
+        stage: {"minutes": 60 + i}
+        for i, stage in enumerate(("deep", "light", "rem", "wake"))
+    }
+    return {
+        "sleep": [
+            {
+                "dateOfSleep": day,
+                "efficiency": 90,
+                "timeInBed": 480,
+                "levels": {"summary": stages},
+            }
+            for day in _dates(days)
+        ]
+    }
+
+
+def spo2_payload(days):
+    """Synthetic SpO2 summary response."""
+    return [
+        {"dateTime": day, "value": {"min": 93.1, "avg": 95.6, "max": 98.2}}
+        for day in _dates(days)
+    ]
+
+
+def heart_payload(days):
+    """Synthetic heart rate time series response."""
+    zones = [
+        {"name": name, "min": low, "max": low + 30, "minutes": 30, "caloriesOut": 99.5}
+        for name, low in (("Out of Range", 30), ("Fat Burn", 98), ("Cardio", 128))
+    ]
+    return {
+        "activities-heart": [
+            {
+                "dateTime": day,
+                "value": {"restingHeartRate": 60, "heartRateZones": zones},
+            }
+            for day in _dates(days)
+        ]
+    }
+
+
+def azm_payload(days):
+    """Synthetic AZM time series response."""
+    value = {
+        "activeZoneMinutes": 30,
+        "fatBurnActiveZoneMinutes": 20,
+        "cardioActiveZoneMinutes": 8,
+        "peakActiveZoneMinutes": 2,
+    }
+    return {
+        "activities-active-zone-minutes": [
+            {"dateTime": day, "value": value} for day in _dates(days)
+        ]
+    }
+
+
+def breathing_rate_payload(days):
+    """Synthetic breathing rate summary response."""
+    return {
+        "br": [
+            {"dateTime": day, "value": {"breathingRate": 15.2}} for day in _dates(days)
+        ]
+    }
+
+
+def hrv_payload(days):
+    """Synthetic HRV summary response."""
+    return {
+        "hrv": [
+            {"dateTime": day, "value": {"dailyRmssd": 40.1, "deepRmssd": 45.3}}
+            for day in _dates(days)
+        ]
+    }
+
+
+def body_payload(days):
+    """Synthetic body time series responses keyed like collect_body."""
+    return {
+        resource: {
+            f"body-{resource}": [
+                {"dateTime": day, "value": value} for day in _dates(days)
+            ]
+        }
+        for resource, value in (("weight", "75.5"), ("bmi", "22.1"), ("fat", "18.2"))
+    }
+
+
+def activity_payload(days):
+    """Synthetic collect_activities rows with two logged activities per day."""
+    activity = {
+        "startTime": "07:00",
+        "name": "Walk",
+        "description": "Walking",
+        "distance": 2.5,
+        "steps": 3000,
+        "calories": 150,
+        "duration": 1800000,
+    }
+    return [{"date": day, "activities": [activity] * 2} for day in _dates(days)]
+
+
+def devices_payload(days):
+    """Synthetic device list, one device per requested day."""
+    return [
+        {
+            "batteryLevel": 80,
+            "deviceVersion": "Charge 6",
+            "type": "TRACKER",
+            "lastSyncTime": "2024-01-01T07:00:00.000",
+            "mac": "AABBCCDDEEFF",
+        }
+    ] * days
+
+
+# formatter name -> (payload builder, extra positional args)
+FORMATTERS = {
+    "display_sleep": (sleep_payload, ()),
+    "display_spo2": (spo2_payload, ()),
+    "display_heart_data": (heart_payload, ()),
+    "display_azm_time_series": (azm_payload, ()),
+    "display_breathing_rate": (breathing_rate_payload, ()),
+    "display_hrv": (hrv_payload, ()),
+    "display_body": (body_payload, ()),
+    "display_devices": (devices_payload, ()),
+    "display_activity": (activity_payload, ("METRIC",)),
+}
+
+
+class LatencyFitbit:
+    """Mocked API whose calls sleep for a fixed latency like a network round trip."""
+
+    def __init__(self, latency=LATENCY):
+        self.latency = latency
+
+    def get_daily_activity_summary(self, day):
+        """Daily activity summary with one logged activity."""
+        time.sleep(self.latency)
+        return {"activities": activity_payload(1)[0]["activities"][:1], "date": day}
+
+    def get_activity_time_series(self, resource, start_date, end_date):
+        """Range time series of one activity resource."""
+        time.sleep(self.latency)
+        days = (end_date - start_date).days + 1
+        return {
+            f"activities-{resource}": [
+                {"dateTime": day, "value": "10"} for day in _dates(days)
+            ]
+        }
+
+    def get_activity_log_list(self, after_date, limit=100, offset=0):
+        """One page of the activity log list with an activity every third day."""
+        del after_date, limit
+        time.sleep(self.latency)
+        if offset:
+            return {"activities": [], "pagination": {}}
+        return {
+            "activities": [{"startTime": f"{day}T07:00:00"} for day in _dates(30)[::3]],
+            "pagination": {},
+        }
+
+
+def measure(func, repeat):
+    """Run func repeat times and return timing statistics in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        "repeat": repeat,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+    }
+
+
+def bench_formatters(days_list, repeat):
+    """Time every display_* formatter in JSON and table mode."""
+    for name, (build, extra) in FORMATTERS.items():
+        formatter = getattr(fmt, name)
+        for days in days_list:
+            payload = build(days)
+            for as_json in (True, False):
+                mode = "json" if as_json else "table"
+                stats = measure(
+                    lambda f=formatter, p=payload, e=extra, j=as_json: f(
+                        p, *e, as_json=j
+                    ),
+                    repeat if as_json or days < 365 else max(1, repeat // 5),
+                )
+                yield f"formatter.{name}[{mode},{days}d]", stats
+
+
+def bench_merge_body(days_list, repeat):
+    """Time _merge_body_data."""
+    for days in days_list:
+        payload = body_payload(days)
+        yield f"formatter._merge_body_data[{days}d]", measure(
+            lambda p=payload: fmt._merge_body_data(p),  # pylint: disable=W0212
+            repeat,
+        )
+
+
+def bench_collect_activities(repeat):
+    """Time collect_activities over 30 days against the latency injected mock."""
+    start = date(2022, 1, 1)
+    fitbit = LatencyFitbit()
+    for workers in (1, 4, 8):
+        for range_activities in (False, True):
+            args = Namespace(
+                activities=(start, start + timedelta(days=29)),
+                workers=workers,
+                range_activities=range_activities,
+            )
+            mode = "range" if range_activities else "per_day"
+            yield f"output.collect_activities[{mode},30d,{workers}w]", measure(
+                lambda a=args: output.collect_activities(fitbit, a),
+                max(1, repeat // 5),
+            )
+
+
+def bench_startup(repeat):
+    """Time cold interpreter startup for importing the CLI and for --version."""
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    commands = {
+        "import": "import fitbit_cli.main",
+        "version": "import sys\nsys.argv = ['fitbit-cli', '--version']\n"
+        "from fitbit_cli.main import main\ntry:\n    main()\nexcept SystemExit:\n    pass",
+    }
+    baseline = [sys.executable, "-c", "pass"]
+    yield "startup.python", measure(
+        lambda: subprocess.run(baseline, check=True, env=env), repeat
+    )
+    for name, code in commands.items():
+        command = [sys.executable, "-c", code]
+        yield f"startup.{name}", measure(
+            lambda c=command: subprocess.run(
+                c, check=True, env=env, stdout=subprocess.DEVNULL
+            ),
+            repeat,
+        )
+
+
+def run(quick=False, repeat=20):
+    """Run every benchmark and return the machine-readable report."""
+    days_list = QUICK_DAYS if quick else DAYS
+    results = {}
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        # Tables are fully rendered, but not written to the terminal
+        fmt.CONSOLE = Console(file=devnull, width=160)
+        for group in (
+            bench_formatters(days_list, repeat),
+            bench_merge_body(days_list, repeat),
+            bench_collect_activities(repeat),
+            bench_startup(repeat),
+        ):
+            for name, stats in group:
+                results[name] = stats
+                print(f"{name:<60} {stats['median'] * 1000:>10.3f} ms", file=sys.stderr)
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold):
+    """Return (name, baseline median, median, ratio) for benchmarks slower than threshold."""
+    regressions = []
+    for name, stats in report["results"].items():
+        before = baseline["results"].get(name)
+        if before is None or not before["median"]:
+            continue
+        ratio = stats["median"] / before["median"]
+        if ratio > threshold:
+            regressions.append((name, before["median"], stats["median"], ratio))
+    return regressions
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description="fitbit-cli benchmarks")
+    parser.add_argument("--quick", action="store_true", help="Only small payloads.")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per benchmark.")
+    parser.add_argument("--output", metavar="FILE", help="Write the JSON report.")
+    parser.add_argument(
+        "--compare", metavar="FILE", help="Compare against a previous JSON report."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Median slowdown ratio reported as a regression (default: 1.25).",
+    )
+    args = parser.parse_args()
+
+    report = run(quick=args.quick, repeat=args.repeat)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(report, json.load(file), args.threshold)
+        for name, before, after, ratio in regressions:
+            print(
+                f"REGRESSION {name}: {before * 1000:.3f} ms -> {after * 1000:.3f} ms "
+                f"({ratio:.2f}x)",
+                file=sys.stderr,
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
 Body CLI Tests
 """
 
+import io
 import os
 import sys
 import unittest
@@ -50,7 +51,7 @@ class TestBodyFeature(unittest.TestCase):
     def test_get_body_time_series_single_date_uses_period_endpoint(self):
         """Test that a single body date uses the 1d body time series endpoint."""
         fitbit = FitbitAPI("client", "secret", "access", "refresh")
-        fitbit.make_request = MagicMock(return_value=MagicMock(json=lambda: {}))
+        fitbit.make_request = MagicMock(return_value=MagicMock(content=b"{}"))
 
         fitbit.get_body_time_series("weight", "2024-01-05")
 
@@ -62,7 +63,7 @@ class TestBodyFeature(unittest.TestCase):
     def test_get_body_time_series_date_range_uses_range_endpoint(self):
         """Test that a body date range uses the body time series date-range endpoint."""
         fitbit = FitbitAPI("client", "secret", "access", "refresh")
-        fitbit.make_request = MagicMock(return_value=MagicMock(json=lambda: {}))
+        fitbit.make_request = MagicMock(return_value=MagicMock(content=b"{}"))
 
         fitbit.get_body_time_series("bmi", "2024-01-01", "2024-01-07")
 
@@ -156,16 +157,19 @@ class TestBodyFeature(unittest.TestCase):
             hrv=None,
             body=("2024-01-01", None),
             activities=None,
+            workers=4,
         )
 
-        with patch("builtins.print") as mock_print:
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
             output.json_display(fitbit, args)
 
         fitbit.get_body_time_series.assert_any_call("weight", "2024-01-01", None)
         fitbit.get_body_time_series.assert_any_call("bmi", "2024-01-01", None)
         fitbit.get_body_time_series.assert_any_call("fat", "2024-01-01", None)
-        mock_print.assert_called_once_with(
+        self.assertEqual(
+            stdout.getvalue(),
             '{"body":[{"date":"2024-01-01","weight":"80.1","bmi":"24.7","fat":"18.1"}]}'
+            + "\n",
         )
 
     def test_raw_json_display_includes_body_weight_bmi_and_fat_responses(self):
@@ -187,9 +191,10 @@ class TestBodyFeature(unittest.TestCase):
             hrv=None,
             body=("2026-04-01", None),
             activities=None,
+            workers=4,
         )
 
-        with patch("builtins.print") as mock_print:
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
             output.raw_json_display(fitbit, args)
 
         expected_json = (
@@ -197,7 +202,7 @@ class TestBodyFeature(unittest.TestCase):
             '"bmi":{"body-bmi":[{"dateTime":"2026-04-01","value":"24.7"}]},'
             '"fat":{"body-fat":[{"dateTime":"2026-04-01","value":"19.2"}]}}}'
         )
-        mock_print.assert_called_once_with(expected_json)
+        self.assertEqual(stdout.getvalue(), expected_json + "\n")
 
     @patch("fitbit_cli.output.fmt.display_body")
     def test_table_display_uses_unified_body_formatter(self, mock_display_body):
@@ -219,6 +224,8 @@ class TestBodyFeature(unittest.TestCase):
             hrv=None,
             body=("2026-04-01", None),
             activities=None,
+            workers=4,
+            compact=None,
         )
 
         output.table_display(fitbit, args)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Response Cache Tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413
+from fitbit_cli import cache
+from fitbit_cli.cache import ResponseCache
+from fitbit_cli.fitbit_api import FitbitAPI
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test suite for the SQLite response cache."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.path = os.path.join(self.tmpdir.name, "cache.db")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_ttl_is_long_for_finalized_days_and_short_for_recent_days(self):
+        """Test that only ranges ending before yesterday get the long TTL."""
+        today = date(2024, 1, 10)
+        base = "https://api.fitbit.com/1/user/-/hrv/date"
+
+        self.assertEqual(
+            cache.ttl_for_url(f"{base}/2024-01-01/2024-01-08.json", today),
+            cache.FINALIZED_TTL,
+        )
+        self.assertEqual(
+            cache.ttl_for_url(f"{base}/2024-01-01/2024-01-09.json", today),
+            cache.TODAY_TTL,
+        )
+        self.assertEqual(
+            cache.ttl_for_url("https://api.fitbit.com/1/user/-/devices.json", today),
+            cache.TODAY_TTL,
+        )
+
+    def test_get_returns_stored_body_until_expired(self):
+        """Test that entries are served until their TTL passes."""
+        response_cache = ResponseCache(self.path)
+        url = "https://api.fitbit.com/1/user/-/br/date/2020-01-01.json"
+        response_cache.set(url, '{"br":[]}')
+
+        self.assertEqual(response_cache.get(url), '{"br":[]}')
+        with patch("fitbit_cli.cache.time.time", return_value=4102444800):
+            self.assertIsNone(response_cache.get(url))
+        self.assertEqual(response_cache.info()["entries"], 1)
+        response_cache.close()
+
+    def test_refresh_mode_skips_reads_but_stores_responses(self):
+        """Test that refresh mode always misses and still writes fresh bodies."""
+        url = "https://api.fitbit.com/1/user/-/br/date/2020-01-01.json"
+        response_cache = ResponseCache(self.path, refresh=True)
+        response_cache.set(url, "{}")
+
+        self.assertIsNone(response_cache.get(url))
+        self.assertEqual(ResponseCache(self.path).get(url), "{}")
+        response_cache.close()
+
+    def test_fitbit_api_serves_cache_hits_without_network(self):
+        """Test that a cached URL is returned without calling make_request."""
+        response_cache = ResponseCache(self.path)
+        fitbit = FitbitAPI(
+            "client", "secret", "access", "refresh", cache=response_cache
+        )
+        fitbit.make_request = MagicMock(
+            return_value=MagicMock(text='{"hrv":[]}', content=b'{"hrv":[]}')
+        )
+
+        first = fitbit.get_hrv_summary("2020-01-01")
+        second = fitbit.get_hrv_summary("2020-01-01")
+
+        fitbit.make_request.assert_called_once()
+        self.assertEqual(first, second)
+        fitbit.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Range Chunking Tests
+"""
+
+import json
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413
+from fitbit_cli.chunking import merge_payloads, split_range
+from fitbit_cli.fitbit_api import FitbitAPI
+
+
+class TestRangeChunking(unittest.TestCase):
+    """Test suite for splitting long ranges into spans each endpoint accepts."""
+
+    def test_split_range_keeps_short_ranges_unchanged(self):
+        """Test that a range within the limit is a single, untouched span."""
+        self.assertEqual(
+            split_range("2024-01-01", "2024-01-30", 30), [("2024-01-01", "2024-01-30")]
+        )
+
+    def test_split_range_covers_long_ranges_without_gaps(self):
+        """Test that long ranges are split into contiguous spans of at most max_days."""
+        self.assertEqual(
+            split_range("2024-01-01", "2024-03-05", 30),
+            [
+                ("2024-01-01", "2024-01-30"),
+                ("2024-01-31", "2024-02-29"),
+                ("2024-03-01", "2024-03-05"),
+            ],
+        )
+
+    def test_merge_payloads_concatenates_lists(self):
+        """Test that dict and list responses are merged back into one payload."""
+        self.assertEqual(
+            merge_payloads([{"hrv": [1], "meta": "a"}, {"hrv": [2], "meta": "b"}]),
+            {"hrv": [1, 2], "meta": "a"},
+        )
+        self.assertEqual(merge_payloads([[1], [2, 3]]), [1, 2, 3])
+
+    def test_long_hrv_range_is_fetched_in_chunks(self):
+        """Test that an HRV range longer than 30 days is requested in spans and merged."""
+        fitbit = FitbitAPI("client", "secret", "access", "refresh")
+        fitbit.make_request = MagicMock(
+            side_effect=lambda method, url: MagicMock(
+                content=json.dumps({"hrv": [{"url": url}]}).encode()
+            )
+        )
+
+        result = fitbit.get_hrv_summary("2024-01-01", "2024-02-14")
+
+        self.assertEqual(
+            [item["url"] for item in result["hrv"]],
+            [
+                "https://api.fitbit.com/1/user/-/hrv/date/2024-01-01/2024-01-30.json",
+                "https://api.fitbit.com/1/user/-/hrv/date/2024-01-31/2024-02-14.json",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
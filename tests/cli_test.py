@@ -21,7 +21,7 @@ from fitbit_cli.cli import (
 )
 
 
-class TestCLIDateFunctions(unittest.TestCase):
+class TestCLIDateFunctions(unittest.TestCase):  # pylint: disable=R0904
     """Test suite for date-related utility functions in the fitbit_cli.cli module."""
 
     @patch("fitbit_cli.cli.datetime")
@@ -223,6 +223,68 @@ class TestCLIDateFunctions(unittest.TestCase):
         args = parse_arguments()
         self.assertIsNotNone(args.hrv)
 
+    @patch("sys.argv", ["fitbit-cli", "--spo2-intraday"])
+    def test_intraday_without_ndjson_raises_error(self):
+        """Test that intraday flags are rejected unless --ndjson is given."""
+        with self.assertRaises(SystemExit):
+            parse_arguments()
+
+    @patch("sys.argv", ["fitbit-cli", "--ndjson", "--br-intraday", "last-week"])
+    def test_intraday_with_ndjson_parses_successfully(self):
+        """Test that an intraday flag combined with --ndjson parses without error."""
+        args = parse_arguments()
+        self.assertTrue(args.ndjson)
+        self.assertIsNotNone(args.breathing_rate_intraday)
+
+    @patch("sys.argv", ["fitbit-cli", "--offline", "--ndjson", "--spo2-intraday"])
+    def test_offline_intraday_raises_error(self):
+        """Test that --offline rejects intraday data, the store has none."""
+        with self.assertRaises(SystemExit):
+            parse_arguments()
+
+    @patch("sys.argv", ["fitbit-cli", "--offline", "--range-activities", "-t"])
+    def test_offline_range_activities_raises_error(self):
+        """Test that --offline rejects --range-activities, the store has no time series."""
+        with self.assertRaises(SystemExit):
+            parse_arguments()
+
+    @patch("sys.argv", ["fitbit-cli", "--sync", "2024-01-01,2024-02-01"])
+    def test_sync_with_a_date_range_raises_error(self):
+        """Test that --sync rejects an end date instead of ignoring it."""
+        with self.assertRaises(SystemExit):
+            parse_arguments()
+
+    @patch("fitbit_cli.cli.datetime")
+    def test_sync_accepts_a_start_date_or_a_range_up_to_today(self, mock_datetime):
+        """Test that --sync keeps only the start of relative ranges ending today."""
+        mock_datetime.today.return_value = datetime(2024, 2, 1)
+        mock_datetime.strptime = datetime.strptime
+
+        with patch("sys.argv", ["fitbit-cli", "--sync", "2024-01-01"]):
+            self.assertEqual(
+                parse_arguments().sync, (datetime(2024, 1, 1).date(), None)
+            )
+        with patch("sys.argv", ["fitbit-cli", "--sync", "last-week"]):
+            self.assertEqual(parse_arguments().sync, ("2024-01-25", None))
+
+    @patch("sys.argv", ["fitbit-cli", "--hrv", "--watch", "60"])
+    def test_watch_parses_interval(self):
+        """Test that --watch takes a poll interval in seconds."""
+        args = parse_arguments()
+        self.assertEqual(args.watch, 60)
+
+    @patch("sys.argv", ["fitbit-cli", "--hrv", "--watch", "60", "--raw-json"])
+    def test_watch_with_raw_json_raises_error(self):
+        """Test that --watch rejects --raw-json, it only writes formatted records."""
+        with self.assertRaises(SystemExit):
+            parse_arguments()
+
+    @patch("sys.argv", ["fitbit-cli", "--hrv", "--watch", "60", "--export", "out"])
+    def test_watch_with_export_raises_error(self):
+        """Test that --watch is rejected together with --export."""
+        with self.assertRaises(SystemExit):
+            parse_arguments()
+
 
 if __name__ == "__main__":
     unittest.main()
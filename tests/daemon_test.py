@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Daemon Tests
+"""
+
+import os
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import date
+from unittest.mock import MagicMock
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413
+from fitbit_cli.daemon import DaemonClient, DaemonServer, TTLCache, daemon_running
+from fitbit_cli.exceptions import FitbitAPIError
+
+
+class TestTTLCache(unittest.TestCase):
+    """Test suite for the in-memory query cache of the daemon."""
+
+    def test_values_expire_after_the_ttl(self):
+        """Test that a value is fetched again once its TTL has passed."""
+        now = [0.0]
+        cache = TTLCache(ttl=60, clock=lambda: now[0])
+        fetch = MagicMock(side_effect=[1, 2])
+
+        self.assertEqual(cache.get_or_fetch("k", fetch), 1)
+        now[0] = 59
+        self.assertEqual(cache.get_or_fetch("k", fetch), 1)
+        now[0] = 61
+        self.assertEqual(cache.get_or_fetch("k", fetch), 2)
+
+    def test_expired_entries_and_key_locks_are_dropped(self):
+        """Test that the cache does not grow with keys that are no longer fresh."""
+        now = [0.0]
+        cache = TTLCache(ttl=60, clock=lambda: now[0])
+
+        for key in ("a", "b", "c"):
+            cache.get_or_fetch(key, lambda: 1)
+        now[0] = 61
+        cache.get_or_fetch("d", lambda: 1)
+
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache._key_locks, {})  # pylint: disable=W0212
+
+    def test_concurrent_misses_fetch_once(self):
+        """Test that concurrent lookups of one missing key share a single fetch."""
+        cache = TTLCache()
+        calls = []
+        release = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            release.wait(2)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cache.get_or_fetch("k", fetch))
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 4)
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets are not available")
+class TestDaemon(unittest.TestCase):
+    """Test suite for serving queries over the daemon socket."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "daemon.sock")
+        self.fitbit = MagicMock()
+        self.fitbit.get_hrv_summary.return_value = {"hrv": [{"dateTime": "2024-01-01"}]}
+        self.server = DaemonServer(self.fitbit, self.path, ttl=60)
+        thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.05,), daemon=True
+        )
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.client = DaemonClient(self.path)
+
+    def test_queries_are_forwarded_and_cached(self):
+        """Test that a query returns the API result and repeats come from memory."""
+        first = self.client.get_hrv_summary(date(2024, 1, 1), "2024-01-07")
+        second = self.client.get_hrv_summary("2024-01-01", "2024-01-07")
+
+        self.assertEqual(first, {"hrv": [{"dateTime": "2024-01-01"}]})
+        self.assertEqual(second, first)
+        self.fitbit.get_hrv_summary.assert_called_once_with("2024-01-01", "2024-01-07")
+
+    def test_api_errors_reach_the_client(self):
+        """Test that an API error raised in the daemon is raised by the client."""
+        self.fitbit.get_devices.side_effect = FitbitAPIError("HTTP error occurred")
+
+        with self.assertRaisesRegex(FitbitAPIError, "HTTP error occurred"):
+            self.client.get_devices()
+
+    def test_only_getters_are_served(self):
+        """Test that methods other than the get_* queries cannot be called."""
+        with self.assertRaises(AttributeError):
+            self.client.close_session()  # pylint: disable=no-member
+        with self.assertRaisesRegex(FitbitAPIError, "Unknown query"):
+            self.client.call("refresh_access_token")
+        self.fitbit.refresh_access_token.assert_not_called()
+
+    def test_socket_is_private(self):
+        """Test that only the owner can connect to the socket."""
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+        self.assertTrue(daemon_running(self.path))
+
+    def test_stale_socket_is_replaced(self):
+        """Test that a socket file without a daemon behind it does not block serving."""
+        path = os.path.join(self.tmp.name, "stale.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(path)
+        self.assertFalse(daemon_running(path))
+
+        server = DaemonServer(self.fitbit, path)
+        server.server_close()
+
+        self.assertFalse(os.path.exists(path))
+
+    def test_second_daemon_on_the_same_socket_is_refused(self):
+        """Test that starting a daemon on a socket that is in use fails."""
+        with self.assertRaisesRegex(FitbitAPIError, "already serving"):
+            DaemonServer(self.fitbit, self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
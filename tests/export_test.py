@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Export Tests
+"""
+
+import csv
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413,W0212
+from fitbit_cli import export
+from fitbit_cli import formatter as fmt
+
+HEART_DATA = {
+    "activities-heart": [
+        {
+            "dateTime": "2024-01-01",
+            "value": {
+                "restingHeartRate": 60,
+                "heartRateZones": [
+                    {"name": "Cardio", "min": 120, "max": 150, "minutes": 10},
+                    {"name": "Peak", "min": 150, "max": 220, "minutes": 2},
+                ],
+            },
+        },
+        {"dateTime": "2024-01-02", "value": {"heartRateZones": []}},
+    ]
+}
+BODY_DATA = {
+    "weight": {"body-weight": [{"dateTime": "2024-01-01", "value": "75.5"}]},
+    "bmi": {"body-bmi": [{"dateTime": "2024-01-01", "value": "22.1"}]},
+    "fat": {"body-fat": []},
+}
+ACTIVITY_DATA = [
+    {
+        "date": "2024-01-01",
+        "activities": [
+            {"name": "Walk", "distance": 2.5, "steps": 3000, "duration": 1800000}
+        ],
+    },
+    {"date": "2024-01-02", "activities": [], "error": "HTTP error occurred"},
+]
+
+
+def read_csv(path):
+    """Read a CSV file into a list of rows."""
+    with open(path, newline="", encoding="utf-8") as file:
+        return list(csv.reader(file))
+
+
+class TestExport(unittest.TestCase):
+    """Test suite for the columnar export."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.sections = [
+            ("heart", fmt.display_heart_data(HEART_DATA, as_json=True)),
+            ("body", fmt.display_body(BODY_DATA, as_json=True)),
+            ("activities", fmt.display_activity(ACTIVITY_DATA, "METRIC", True)),
+        ]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_csv_export_writes_one_flat_table_per_metric(self):
+        """Test that nested heart zones and activities become their own flat tables."""
+        summary = export.export_sections(self.sections, self.tmp.name, batch_size=1)
+
+        self.assertEqual(
+            [(s["table"], s["rows"]) for s in summary],
+            [("heart", 2), ("heart_zones", 2), ("body", 1), ("activities", 1)],
+        )
+        self.assertEqual(
+            read_csv(os.path.join(self.tmp.name, "heart.csv")),
+            [["date", "resting_heart_rate"], ["2024-01-01", "60"], ["2024-01-02", ""]],
+        )
+        self.assertEqual(
+            read_csv(os.path.join(self.tmp.name, "heart_zones.csv"))[1],
+            ["2024-01-01", "Cardio", "120", "150", "10", ""],
+        )
+        self.assertEqual(
+            read_csv(os.path.join(self.tmp.name, "body.csv"))[1],
+            ["2024-01-01", "75.5", "22.1", ""],
+        )
+        self.assertEqual(
+            read_csv(os.path.join(self.tmp.name, "activities.csv"))[1],
+            ["2024-01-01", "", "Walk", "", "2.5", "km", "3000", "", "30.0"],
+        )
+
+    def test_cast_converts_formatted_values_to_column_types(self):
+        """Test that string API values are typed and missing values become None."""
+        self.assertEqual(export._cast("75.5", "float"), 75.5)
+        self.assertEqual(export._cast("2024-01-01", "date"), date(2024, 1, 1))
+        self.assertEqual(export._cast(60.0, "int"), 60)
+        self.assertIsNone(export._cast(None, "int"))
+        self.assertIsNone(export._cast("", "float"))
+
+    @unittest.skipIf(
+        importlib.util.find_spec("pyarrow") is None, "pyarrow is not installed"
+    )
+    def test_parquet_export_keeps_column_types(self):
+        """Test that Parquet files carry a typed schema and every batch."""
+        import pyarrow.parquet  # pylint: disable=C0415
+
+        export.export_sections(self.sections, self.tmp.name, "parquet", batch_size=1)
+
+        heart = pyarrow.parquet.read_table(os.path.join(self.tmp.name, "heart.parquet"))
+        self.assertEqual(str(heart.schema.field("date").type), "date32[day]")
+        self.assertEqual(str(heart.schema.field("resting_heart_rate").type), "int64")
+        self.assertEqual(heart.column("resting_heart_rate").to_pylist(), [60, None])
+
+
+if __name__ == "__main__":
+    unittest.main()
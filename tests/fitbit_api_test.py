@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""
+Fitbit API Tests
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import requests
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413
+from output_test import make_args  # isort: skip  # pylint: disable=C0411,E0401
+from fitbit_cli import fitbit_setup
+from fitbit_cli.fitbit_api import FitbitAPI
+from fitbit_cli.output import fetch_sections
+
+
+def make_response(status_code=200, payload=None, headers=None, elapsed=0.0):
+    """Build a fake requests.Response that took elapsed seconds to its headers."""
+    response = MagicMock(status_code=status_code, headers=headers or {})
+    response.json.return_value = payload if payload is not None else {}
+    response.text = json.dumps(response.json.return_value)
+    response.content = response.text.encode()
+    response.elapsed = timedelta(seconds=elapsed)
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            response=response
+        )
+    return response
+
+
+def track_in_flight(fitbit, delay=0.005):
+    """Make each request of fitbit take delay seconds and count requests in flight.
+
+    Returns [in flight now, peak in flight], updated as requests are sent.
+    """
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def slow_request(*_args, **_kwargs):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        time.sleep(delay)
+        with lock:
+            in_flight[0] -= 1
+        return make_response(payload={})
+
+    fitbit.session.request = MagicMock(side_effect=slow_request)
+    return in_flight
+
+
+class TestFitbitAPISession(unittest.TestCase):
+    """Test suite for the pooled HTTP session used by FitbitAPI."""
+
+    def test_session_pool_size_is_configurable(self):
+        """Test that the https adapter pool honours the pool_size argument."""
+        fitbit = FitbitAPI("client", "secret", "access", "refresh", pool_size=16)
+
+        adapter = fitbit.session.get_adapter("https://api.fitbit.com")
+
+        self.assertEqual(adapter._pool_maxsize, 16)  # pylint: disable=W0212
+
+    def test_session_pool_defaults_to_the_in_flight_limit(self):
+        """Test that the pool holds every in-flight request plus a token refresh."""
+        fitbit = FitbitAPI("client", "secret", "access", "refresh", workers=12)
+
+        adapter = fitbit.session.get_adapter("https://api.fitbit.com")
+
+        self.assertEqual(adapter._pool_maxsize, 13)  # pylint: disable=W0212
+
+    def test_chunks_and_sections_share_the_in_flight_limit(self):
+        """Test that chunked ranges fetched by concurrent sections stay within workers."""
+        fitbit = FitbitAPI("client", "secret", "access", "refresh", workers=2)
+        in_flight = track_in_flight(fitbit)
+        args = make_args(
+            sleep=("2022-01-01", "2024-01-01"),
+            spo2=("2023-01-01", "2023-12-31"),
+            workers=2,
+        )
+
+        dict(fetch_sections(fitbit, args))
+
+        self.assertEqual(fitbit.session.request.call_count, 8 + 13)
+        self.assertEqual(in_flight[1], 2)
+
+    def test_activity_days_share_the_in_flight_limit(self):
+        """Test that the per-day activity fan-out inside a section stays within workers."""
+        fitbit = FitbitAPI("client", "secret", "access", "refresh", workers=2)
+        in_flight = track_in_flight(fitbit)
+        args = make_args(
+            sleep=("2024-01-01", "2024-01-20"),
+            activities=("2024-01-01", "2024-01-20"),
+            workers=2,
+        )
+
+        dict(fetch_sections(fitbit, args, activity_units=False))
+
+        self.assertEqual(fitbit.session.request.call_count, 1 + 20)
+        self.assertEqual(in_flight[1], 2)
+
+    def test_requests_reuse_the_same_session(self):
+        """Test that every get_* call goes through the shared session."""
+        fitbit = FitbitAPI("client", "secret", "access", "refresh")
+        fitbit.session.request = MagicMock(return_value=make_response(payload={}))
+
+        fitbit.get_devices()
+        fitbit.get_user_profile()
+
+        self.assertEqual(fitbit.session.request.call_count, 2)
+        headers = fitbit.session.request.call_args.kwargs["headers"]
+        self.assertEqual(headers["Authorization"], "Bearer access")
+
+    def test_conditional_requests_reuse_the_payload_on_304(self):
+        """Test that validators are sent back and a 304 returns the previous payload."""
+        fitbit = FitbitAPI(
+            "client", "secret", "access", "refresh", conditional_requests=True
+        )
+        first = make_response(
+            payload={"hrv": [1]},
+            headers={
+                "ETag": '"v1"',
+                "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+            },
+        )
+        not_modified = make_response(status_code=304)
+        fitbit.session.request = MagicMock(side_effect=[first, not_modified])
+
+        self.assertEqual(fitbit.get_hrv_summary("2024-01-01"), {"hrv": [1]})
+        self.assertEqual(fitbit.get_hrv_summary("2024-01-01"), {"hrv": [1]})
+
+        first_headers = fitbit.session.request.call_args_list[0].kwargs["headers"]
+        second_headers = fitbit.session.request.call_args_list[1].kwargs["headers"]
+        self.assertNotIn("If-None-Match", first_headers)
+        self.assertEqual(second_headers["If-None-Match"], '"v1"')
+        self.assertEqual(
+            second_headers["If-Modified-Since"], "Mon, 01 Jan 2024 00:00:00 GMT"
+        )
+
+
+class TestTokenRefresh(unittest.TestCase):
+    """Test suite for proactive and cross-process token refresh."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.path = os.path.join(self.tmp.name, "token.json")
+        patcher = patch.object(fitbit_setup, "FITBIT_TOKEN_PATH", self.path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+        fitbit_setup.write_fitbit_token(
+            {"access_token": "old", "refresh_token": "refresh", "secret": "secret"}
+        )
+
+    def read_token(self):
+        """Return the token file content."""
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    @patch("fitbit_cli.fitbit_api.update_fitbit_token")
+    def test_stale_401_does_not_refresh_twice(self, mock_update):
+        """Test that a 401 for an already replaced token reuses the new token."""
+        fitbit = FitbitAPI("client", "secret", "old", "refresh")
+        fitbit.session.post = MagicMock(
+            return_value=make_response(
+                payload={"access_token": "new", "refresh_token": "refresh2"}
+            )
+        )
+
+        fitbit.refresh_access_token(expired_token="old")
+        fitbit.refresh_access_token(expired_token="old")
+
+        fitbit.session.post.assert_called_once()
+        mock_update.assert_called_once_with("new", "refresh2", None, path=None)
+        self.assertEqual(fitbit.headers["Authorization"], "Bearer new")
+
+    def test_token_about_to_expire_is_refreshed_before_the_request(self):
+        """Test that a token inside the refresh margin is refreshed without a 401."""
+        fitbit = FitbitAPI(
+            "client", "secret", "old", "refresh", expires_at=time.time() + 60
+        )
+        fitbit.session.post = MagicMock(
+            return_value=make_response(
+                payload={
+                    "access_token": "new",
+                    "refresh_token": "refresh2",
+                    "expires_in": 28800,
+                }
+            )
+        )
+        fitbit.session.request = MagicMock(return_value=make_response(payload={}))
+
+        fitbit.get_devices()
+
+        fitbit.session.post.assert_called_once()
+        fitbit.session.request.assert_called_once()
+        headers = fitbit.session.request.call_args.kwargs["headers"]
+        self.assertEqual(headers["Authorization"], "Bearer new")
+        token = self.read_token()
+        self.assertEqual(token["refresh_token"], "refresh2")
+        self.assertAlmostEqual(token["expires_at"], time.time() + 28800, delta=5)
+
+    def test_valid_token_is_not_refreshed(self):
+        """Test that a token outside the refresh margin is used as is."""
+        fitbit = FitbitAPI(
+            "client", "secret", "old", "refresh", expires_at=time.time() + 3600
+        )
+        fitbit.session.post = MagicMock()
+        fitbit.session.request = MagicMock(return_value=make_response(payload={}))
+
+        fitbit.get_devices()
+
+        fitbit.session.post.assert_not_called()
+
+    def test_token_refreshed_by_another_process_is_adopted(self):
+        """Test that a newer token in the token file is used instead of refreshing."""
+        fitbit_setup.write_fitbit_token(
+            {"access_token": "other", "refresh_token": "refresh9", "expires_at": 1.0}
+        )
+        fitbit = FitbitAPI("client", "secret", "old", "refresh")
+        fitbit.session.post = MagicMock()
+
+        fitbit.refresh_access_token(expired_token="old")
+
+        fitbit.session.post.assert_not_called()
+        self.assertEqual(fitbit.refresh_token, "refresh9")
+        self.assertEqual(fitbit.headers["Authorization"], "Bearer other")
+
+    def test_concurrent_clients_refresh_once(self):
+        """Test that clients sharing the token file coalesce behind the file lock."""
+        calls = []
+
+        def post(*_args, **_kwargs):
+            calls.append(1)
+            time.sleep(0.05)
+            return make_response(
+                payload={"access_token": "new", "refresh_token": "refresh2"}
+            )
+
+        clients = [FitbitAPI("client", "secret", "old", "refresh") for _ in range(4)]
+        for client in clients:
+            client.session.post = post
+        threads = [
+            threading.Thread(target=client.refresh_access_token, args=("old",))
+            for client in clients
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual({client.access_token for client in clients}, {"new"})
+        self.assertEqual(self.read_token()["refresh_token"], "refresh2")
+
+    def test_token_file_is_private_and_replaced_atomically(self):
+        """Test that the token file is owner only and no temporary file is left."""
+        fitbit_setup.update_fitbit_token("a", "r", 123.0)
+
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+        self.assertEqual(self.read_token()["expires_at"], 123.0)
+        self.assertEqual(os.listdir(self.tmp.name), ["token.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
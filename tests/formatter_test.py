@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Formatter Tests
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+from rich.table import Table
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413
+from fitbit_cli import formatter as fmt
+
+
+def heart_days(days):
+    """Build a heart rate time series response with two zones per day."""
+    return {
+        "activities-heart": [
+            {
+                "dateTime": f"2024-01-{day + 1:02d}",
+                "value": {
+                    "restingHeartRate": 60,
+                    "heartRateZones": [
+                        {"name": "Fat Burn", "minutes": 20, "caloriesOut": 100.0},
+                        {"name": "Cardio", "minutes": 5, "caloriesOut": 50.5},
+                    ],
+                },
+            }
+            for day in range(days)
+        ]
+    }
+
+
+def activity_days(days):
+    """Build collect_activities rows with one activity per day and one failed day."""
+    rows = [
+        {
+            "date": f"2024-01-{day + 1:02d}",
+            "activities": [{"name": "Walk", "distance": 2.5, "duration": 600000}],
+        }
+        for day in range(days)
+    ]
+    rows.append({"date": "2024-02-01", "activities": [], "error": "HTTP error"})
+    return rows
+
+
+def printed_table(mock_print):
+    """Return the table passed to the patched console."""
+    table = mock_print.call_args.args[0]
+    nested = [cell for column in table.columns for cell in column.cells]
+    return table, any(isinstance(cell, Table) for cell in nested)
+
+
+class TestCompactTables(unittest.TestCase):
+    """Test suite for the flat rendering of long heart rate and activity ranges."""
+
+    @patch("fitbit_cli.formatter.CONSOLE.print")
+    def test_short_heart_range_keeps_nested_zone_tables(self, mock_print):
+        """Test that a short range still renders one zones table per day."""
+        fmt.display_heart_data(heart_days(3))
+
+        table, nested = printed_table(mock_print)
+        self.assertEqual(table.row_count, 3)
+        self.assertTrue(nested)
+
+    @patch("fitbit_cli.formatter.CONSOLE.print")
+    def test_long_heart_range_switches_to_flat_zone_columns(self, mock_print):
+        """Test that above the threshold zones become columns of a flat table."""
+        fmt.display_heart_data(heart_days(fmt.COMPACT_ROWS + 1))
+
+        table, nested = printed_table(mock_print)
+        self.assertFalse(nested)
+        self.assertEqual(
+            [column.header for column in table.columns][2:],
+            ["Fat Burn (min)", "Cardio (min)", "Calories Out (kcal) :fire:"],
+        )
+        self.assertEqual(list(table.columns[4].cells)[0], "150.50")
+
+    @patch("fitbit_cli.formatter.CONSOLE.print")
+    def test_compact_flag_overrides_the_threshold(self, mock_print):
+        """Test that compact=True and compact=False force either rendering."""
+        fmt.display_heart_data(heart_days(1), compact=True)
+        self.assertFalse(printed_table(mock_print)[1])
+
+        fmt.display_activity(
+            activity_days(fmt.COMPACT_ROWS + 1), "METRIC", compact=False
+        )
+        self.assertTrue(printed_table(mock_print)[1])
+
+    @patch("fitbit_cli.formatter.CONSOLE.print")
+    def test_compact_activities_have_one_row_per_activity_and_failed_day(
+        self, mock_print
+    ):
+        """Test the flat activity table keeps failed days as error rows."""
+        fmt.display_activity(activity_days(2), "METRIC", compact=True)
+
+        table, nested = printed_table(mock_print)
+        self.assertFalse(nested)
+        self.assertEqual(table.row_count, 3)
+        self.assertEqual(list(table.columns[3].cells)[:2], ["2.5 km", "2.5 km"])
+
+
+if __name__ == "__main__":
+    unittest.main()
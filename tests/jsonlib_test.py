@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+JSON Backend Tests
+"""
+
+import json
+import os
+import sys
+import unittest
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413
+from fitbit_cli import jsonlib
+
+PAYLOAD = {
+    "activities-heart": [
+        {
+            "dateTime": "2024-01-01",
+            "value": {
+                "restingHeartRate": 60,
+                "heartRateZones": [{"name": "Fat Burn", "caloriesOut": 99.57}],
+            },
+        }
+    ],
+    "empty": [],
+    "missing": None,
+    "flag": True,
+}
+
+
+class TestJSONBackend(unittest.TestCase):
+    """Test suite for the optional fast JSON backend."""
+
+    def test_dumps_matches_stdlib_compact_output(self):
+        """Test that dumps matches compact json.dumps for ASCII data without NaN or exponents."""
+        self.assertEqual(
+            jsonlib.dumps(PAYLOAD), json.dumps(PAYLOAD, separators=(",", ":"))
+        )
+
+    def test_loads_accepts_str_and_bytes(self):
+        """Test that loads parses both response text and raw response bytes."""
+        text = json.dumps(PAYLOAD)
+        self.assertEqual(jsonlib.loads(text), PAYLOAD)
+        self.assertEqual(jsonlib.loads(text.encode()), PAYLOAD)
+
+    def test_dumps_falls_back_for_integers_above_64_bits(self):
+        """Test that integers orjson rejects are serialized by the standard library."""
+        value = {"big": 2**70}
+        self.assertEqual(jsonlib.dumps(value), json.dumps(value, separators=(",", ":")))
+
+    def test_dumps_nan(self):
+        """Test that NaN is null with orjson and NaN with the standard library."""
+        expected = "null" if jsonlib.BACKEND == "orjson" else "NaN"
+        self.assertEqual(jsonlib.dumps({"nan": float("nan")}), f'{{"nan":{expected}}}')
+
+    def test_dumps_large_floats_parse_back_unchanged(self):
+        """Test that floats in exponent notation keep their value whatever the spelling."""
+        value = {"large": 1e16, "small": 1.5e-7}
+        self.assertEqual(json.loads(jsonlib.dumps(value)), value)
+
+    def test_dumps_round_trips_non_ascii_text(self):
+        """Test that non-ASCII text parses back unchanged whatever the backend."""
+        value = {"name": "Café Läufer"}
+        self.assertEqual(json.loads(jsonlib.dumps(value)), value)
+
+    def test_backend_is_reported(self):
+        """Test that the selected backend is one of the supported ones."""
+        self.assertIn(jsonlib.BACKEND, ("orjson", "json"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Output Tests
+"""
+
+import io
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from argparse import Namespace
+from unittest.mock import MagicMock, patch
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413
+from fitbit_cli import output
+from fitbit_cli.exceptions import FitbitAPIError
+
+
+def make_args(**kwargs):
+    """Build an argparse Namespace with every data flag disabled by default."""
+    defaults = {
+        "user_profile": False,
+        "devices": False,
+        "sleep": None,
+        "spo2": None,
+        "heart": None,
+        "active_zone": None,
+        "breathing_rate": None,
+        "hrv": None,
+        "body": None,
+        "activities": None,
+        "spo2_intraday": None,
+        "azm_intraday": None,
+        "breathing_rate_intraday": None,
+        "workers": 4,
+        "range_activities": False,
+        "compact": None,
+    }
+    defaults.update(kwargs)
+    return Namespace(**defaults)
+
+
+class TestConcurrentFetch(unittest.TestCase):
+    """Test suite for concurrent endpoint fetching in the output module."""
+
+    def test_fetch_sections_runs_endpoints_concurrently(self):
+        """Test that independent endpoints overlap instead of running back to back."""
+        barrier = threading.Barrier(3, timeout=2)
+
+        def slow(payload):
+            def call(*_):
+                barrier.wait()
+                return payload
+
+            return call
+
+        fitbit = MagicMock()
+        fitbit.get_sleep_log.side_effect = slow({"sleep": []})
+        fitbit.get_hrv_summary.side_effect = slow({"hrv": []})
+        fitbit.get_breathing_rate_summary.side_effect = slow({"br": []})
+        args = make_args(
+            sleep=("2024-01-01", None),
+            hrv=("2024-01-01", None),
+            breathing_rate=("2024-01-01", None),
+        )
+
+        sections = list(output.fetch_sections(fitbit, args))
+
+        self.assertEqual(
+            sections,
+            [
+                ("sleep", {"sleep": []}),
+                ("breathing_rate", {"br": []}),
+                ("hrv", {"hrv": []}),
+            ],
+        )
+
+    def test_fetch_sections_preserves_flag_order_regardless_of_latency(self):
+        """Test that sections are yielded in flag order even when earlier calls are slower."""
+
+        def delayed(payload, delay):
+            def call(*_):
+                time.sleep(delay)
+                return payload
+
+            return call
+
+        fitbit = MagicMock()
+        fitbit.get_devices.side_effect = delayed([], 0.05)
+        fitbit.get_spo2_summary.side_effect = delayed({}, 0)
+        args = make_args(devices=True, spo2=("2024-01-01", None))
+
+        names = [name for name, _ in output.fetch_sections(fitbit, args)]
+
+        self.assertEqual(names, ["devices", "spo2"])
+
+    def test_raw_json_display_skips_profile_for_activities(self):
+        """Test that raw JSON activities do not fetch the profile used for units."""
+        fitbit = MagicMock()
+        fitbit.get_daily_activity_summary.return_value = {"activities": []}
+        args = make_args(activities=("2024-01-01", None), workers=1)
+
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            output.raw_json_display(fitbit, args)
+
+        fitbit.get_user_profile.assert_not_called()
+        self.assertEqual(list(json.loads(stdout.getvalue())), ["activities"])
+
+    def test_formatted_activities_fetch_the_profile_once(self):
+        """Test that formatted activities fetch the profile without emitting it."""
+        fitbit = MagicMock()
+        fitbit.get_user_profile.return_value = {"user": {"distanceUnit": "US"}}
+        fitbit.get_daily_activity_summary.return_value = {"activities": []}
+        args = make_args(activities=("2024-01-01", None), workers=1)
+
+        sections = dict(output.render_sections(fitbit, args, as_json=True))
+
+        fitbit.get_user_profile.assert_called_once_with()
+        self.assertEqual(list(sections), ["activities"])
+
+    def test_stats_display_skips_profile_for_activities(self):
+        """Test that --stats, which skips activities, does not fetch the profile."""
+        fitbit = MagicMock()
+        fitbit.get_daily_activity_summary.return_value = {"activities": []}
+        args = make_args(
+            activities=("2024-01-01", None),
+            workers=1,
+            stats_window=7,
+            json=True,
+            raw_json=False,
+        )
+
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            output.stats_display(fitbit, args)
+
+        fitbit.get_user_profile.assert_not_called()
+        self.assertEqual(json.loads(stdout.getvalue()), {"stats": []})
+
+
+class TestCollectActivities(unittest.TestCase):
+    """Test suite for the per-day activity fan-out."""
+
+    def test_collect_activities_keeps_day_order_with_parallel_fetch(self):
+        """Test that days come back in calendar order even when fetched out of order."""
+
+        def summary(day):
+            time.sleep(0.03 if day.endswith("01") else 0)
+            return {"activities": [{"name": day}]}
+
+        fitbit = MagicMock()
+        fitbit.get_daily_activity_summary.side_effect = summary
+        args = make_args(activities=("2024-01-01", "2024-01-03"))
+
+        days = output.collect_activities(fitbit, args)
+
+        self.assertEqual(
+            [d["date"] for d in days], ["2024-01-01", "2024-01-02", "2024-01-03"]
+        )
+        self.assertEqual(days[0]["activities"], [{"name": "2024-01-01"}])
+
+    def test_collect_activities_reports_failed_day_and_keeps_the_rest(self):
+        """Test that one failing day is reported without losing other days."""
+
+        def summary(day):
+            if day == "2024-01-02":
+                raise FitbitAPIError("HTTP error occurred: boom")
+            return {"activities": []}
+
+        fitbit = MagicMock()
+        fitbit.get_daily_activity_summary.side_effect = summary
+        args = make_args(activities=("2024-01-01", "2024-01-03"), workers=2)
+
+        days = output.collect_activities(fitbit, args)
+
+        self.assertEqual(len(days), 3)
+        self.assertNotIn("error", days[0])
+        self.assertEqual(days[1]["error"], "HTTP error occurred: boom")
+        self.assertNotIn("error", days[2])
+
+    def _range_fitbit(self):
+        """Build a fake client with time series and one logged activity on 2024-01-02."""
+
+        def time_series(resource, start, end):
+            self.assertEqual((start, end), ("2024-01-01", "2024-01-03"))
+            return {
+                f"activities-{resource}": [
+                    {"dateTime": "2024-01-01", "value": "10"},
+                    {"dateTime": "2024-01-02", "value": "20"},
+                    {"dateTime": "2024-01-03", "value": "30"},
+                ]
+            }
+
+        fitbit = MagicMock()
+        fitbit.get_activity_time_series.side_effect = time_series
+        fitbit.get_activity_log_list.return_value = {
+            "activities": [{"startTime": "2024-01-02T07:00:00.000+01:00"}],
+            "pagination": {"next": ""},
+        }
+        fitbit.get_daily_activity_summary.return_value = {
+            "activities": [{"name": "Walk"}]
+        }
+        return fitbit
+
+    def test_range_activities_fetches_detail_only_for_logged_days(self):
+        """Test that range mode lists the logs and only fetches days with logs."""
+        fitbit = self._range_fitbit()
+        args = make_args(activities=("2024-01-01", "2024-01-03"), range_activities=True)
+
+        days = output.collect_activities(fitbit, args)
+
+        fitbit.get_daily_activity_summary.assert_called_once_with("2024-01-02")
+        fitbit.get_activity_log_list.assert_called_once_with("2023-12-31", offset=0)
+        fitbit.get_activity_time_series.assert_not_called()
+        self.assertEqual(
+            days,
+            [
+                {"date": "2024-01-01", "activities": []},
+                {"date": "2024-01-02", "activities": [{"name": "Walk"}]},
+                {"date": "2024-01-03", "activities": []},
+            ],
+        )
+
+    def test_raw_range_activities_have_the_daily_summary_shape(self):
+        """Test that raw range rows carry time series values in daily summary fields."""
+        fitbit = self._range_fitbit()
+        args = make_args(
+            activities=("2024-01-01", "2024-01-03"), range_activities=True, workers=1
+        )
+
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            output.raw_json_display(fitbit, args)
+
+        days = json.loads(stdout.getvalue())["activities"]
+        self.assertEqual(
+            fitbit.get_activity_time_series.call_count,
+            len(output.ACTIVITY_RANGE_RESOURCES),
+        )
+        self.assertEqual(days[1]["activities"], [{"name": "Walk"}])
+        self.assertEqual(
+            days[2]["summary"],
+            {
+                "steps": 30,
+                "distances": [{"activity": "total", "distance": 30.0}],
+                "caloriesOut": 30,
+                "sedentaryMinutes": 30,
+                "lightlyActiveMinutes": 30,
+                "fairlyActiveMinutes": 30,
+                "veryActiveMinutes": 30,
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
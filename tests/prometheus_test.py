@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Prometheus Exporter Tests
+"""
+
+import os
+import sys
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413
+from fitbit_cli.exceptions import FitbitAPIError
+from fitbit_cli.prometheus import (
+    CONTENT_TYPE,
+    MetricsExporter,
+    create_server,
+    render,
+)
+from fitbit_cli.ratelimit import RateLimitBudget
+
+
+def make_fitbit():
+    """Build a mocked API returning one week of data."""
+    fitbit = MagicMock()
+    fitbit.get_heart_rate_time_series.return_value = {
+        "activities-heart": [
+            {"dateTime": "2024-01-06", "value": {"restingHeartRate": 58}},
+            {"dateTime": "2024-01-07", "value": {}},
+        ]
+    }
+    fitbit.get_hrv_summary.return_value = {
+        "hrv": [{"dateTime": "2024-01-07", "value": {"dailyRmssd": 41.5}}]
+    }
+    fitbit.get_spo2_summary.return_value = [
+        {"dateTime": "2024-01-07", "value": {"min": 93.0, "avg": 95.5, "max": 98.0}}
+    ]
+    fitbit.get_breathing_rate_summary.return_value = {"br": []}
+    fitbit.get_devices.return_value = [
+        {"batteryLevel": 80, "deviceVersion": 'Charge "6"', "type": "TRACKER"}
+    ]
+    fitbit.get_daily_activity_summary.return_value = {"summary": {"steps": 4321}}
+    fitbit.get_azm_time_series.return_value = {
+        "activities-active-zone-minutes": [
+            {"dateTime": "2024-01-07", "value": {"activeZoneMinutes": 12}}
+        ]
+    }
+    fitbit.rate_limit = RateLimitBudget(150, 120, 1800.0)
+    return fitbit
+
+
+class TestMetricsExporter(unittest.TestCase):
+    """Test suite for scraping the API into Prometheus metrics."""
+
+    def test_scrape_exports_the_latest_values(self):
+        """Test that each metric carries the newest non-null value of the week."""
+        exporter = MetricsExporter(make_fitbit(), clock=lambda: 1700000000.0)
+
+        exporter.scrape(today=date(2024, 1, 7))
+        text = exporter.metrics()
+
+        self.assertIn("# TYPE fitbit_resting_heart_rate_bpm gauge", text)
+        self.assertIn("fitbit_resting_heart_rate_bpm 58.0\n", text)
+        self.assertIn("fitbit_hrv_daily_rmssd_milliseconds 41.5\n", text)
+        self.assertIn('fitbit_spo2_percent{stat="avg"} 95.5\n', text)
+        self.assertIn(
+            'fitbit_device_battery_percent{device="Charge \\"6\\"",type="TRACKER",mac=""} 80.0',
+            text,
+        )
+        self.assertIn("fitbit_steps_today 4321.0\n", text)
+        self.assertIn("fitbit_active_zone_minutes_today 12.0\n", text)
+        self.assertIn("fitbit_rate_limit_remaining 120.0\n", text)
+        self.assertIn("fitbit_scrape_last_success_timestamp_seconds 1700000000.0", text)
+        # No breathing rate data at all, so the metric is left out
+        self.assertNotIn("fitbit_breathing_rate_breaths_per_minute", text)
+
+    def test_failed_source_is_counted_and_others_still_export(self):
+        """Test that one failing endpoint does not hide the other metrics."""
+        fitbit = make_fitbit()
+        fitbit.get_hrv_summary.side_effect = FitbitAPIError("HTTP error occurred")
+        exporter = MetricsExporter(fitbit)
+
+        exporter.scrape(today=date(2024, 1, 7))
+        text = exporter.metrics()
+
+        self.assertIn('fitbit_scrape_errors_total{source="hrv"} 1.0', text)
+        self.assertIn("fitbit_resting_heart_rate_bpm 58.0", text)
+        self.assertNotIn("fitbit_scrape_last_success_timestamp_seconds", text)
+
+    def test_unexpected_payload_is_counted_as_a_source_error(self):
+        """Test that errors other than API errors are counted per source too."""
+        fitbit = make_fitbit()
+        fitbit.get_devices.return_value = {"errors": [{"errorType": "system"}]}
+        exporter = MetricsExporter(fitbit)
+
+        exporter.scrape(today=date(2024, 1, 7))
+        text = exporter.metrics()
+
+        self.assertIn('fitbit_scrape_errors_total{source="devices"} 1.0', text)
+        self.assertIn("fitbit_steps_today 4321.0", text)
+
+    def test_run_survives_a_failing_scrape(self):
+        """Test that the scrape loop keeps going after a scrape raises."""
+        exporter = MetricsExporter(make_fitbit(), interval=0)
+        stop = threading.Event()
+
+        with patch.object(exporter, "scrape") as scrape:
+
+            def fail_then_stop():
+                if scrape.call_count == 1:
+                    raise RuntimeError("boom")
+                stop.set()
+
+            scrape.side_effect = fail_then_stop
+            exporter.run(stop)
+
+        self.assertEqual(scrape.call_count, 2)
+
+    def test_next_scrape_waits_for_rate_limit_reset(self):
+        """Test that a low budget postpones the next scrape until the window resets."""
+        fitbit = make_fitbit()
+        exporter = MetricsExporter(fitbit, interval=300)
+        self.assertEqual(exporter.next_delay(), 300)
+
+        fitbit.rate_limit = RateLimitBudget(150, 3, 1800.0)
+        self.assertEqual(exporter.next_delay(), 1800.0)
+
+    def test_render_escapes_label_values(self):
+        """Test that label values are escaped per the text format."""
+        text = render([("fitbit_steps_today", {"a": 'x"\\\n'}, 1)])
+        self.assertIn('fitbit_steps_today{a="x\\"\\\\\\n"} 1.0', text)
+
+
+class TestMetricsServer(unittest.TestCase):
+    """Test suite for the /metrics HTTP endpoint."""
+
+    def setUp(self):
+        self.fitbit = make_fitbit()
+        self.exporter = MetricsExporter(self.fitbit)
+        self.exporter.scrape(today=date(2024, 1, 7))
+        self.fitbit.reset_mock()
+        self.server = create_server(self.exporter, port=0)
+        threading.Thread(
+            target=self.server.serve_forever, args=(0.05,), daemon=True
+        ).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def test_metrics_are_served_from_memory(self):
+        """Test that /metrics returns the last scrape without calling the API."""
+        with urllib.request.urlopen(f"{self.url}/metrics", timeout=2) as response:
+            body = response.read().decode("utf-8")
+            content_type = response.headers["Content-Type"]
+
+        self.assertEqual(content_type, CONTENT_TYPE)
+        self.assertEqual(body, self.exporter.metrics())
+        self.assertEqual(self.fitbit.method_calls, [])
+
+    def test_other_paths_are_not_found(self):
+        """Test that only /metrics is served."""
+        with self.assertRaises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{self.url}/", timeout=2)  # pylint: disable=R1732
+        self.assertEqual(error.exception.code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
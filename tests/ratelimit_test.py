@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Rate Limiter Tests
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413
+from fitbit_cli.fitbit_api import FitbitAPI
+from fitbit_cli.ratelimit import RateLimitBudget, RateLimiter
+
+
+def headers(limit, remaining, reset):
+    """Build Fitbit rate limit response headers."""
+    return {
+        "Fitbit-Rate-Limit-Limit": str(limit),
+        "Fitbit-Rate-Limit-Remaining": str(remaining),
+        "Fitbit-Rate-Limit-Reset": str(reset),
+    }
+
+
+class FakeClock:  # pylint: disable=R0903
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test suite for the header driven rate limit scheduler."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(clock=self.clock)
+
+    def test_unknown_or_healthy_budget_does_not_wait(self):
+        """Test that requests are not delayed before headers are seen or with plenty left."""
+        self.assertEqual(self.limiter.reserve(), 0.0)
+        self.limiter.update(headers(150, 120, 1800))
+        self.assertEqual(self.limiter.reserve(), 0.0)
+
+    def test_low_budget_spreads_requests_until_reset(self):
+        """Test that a low budget spaces requests evenly over the rest of the window."""
+        self.limiter.update(headers(150, 10, 100))
+
+        delays = [self.limiter.reserve() for _ in range(3)]
+
+        self.assertEqual(delays[0], 0.0)
+        self.assertAlmostEqual(delays[1], 10.0)
+        self.assertAlmostEqual(delays[2], 10.0 + 100 / 9)
+
+    def test_exhausted_budget_waits_for_reset_then_resumes(self):
+        """Test that an empty budget waits for the window reset."""
+        self.limiter.update(headers(150, 0, 60))
+
+        self.assertEqual(self.limiter.reserve(), 60)
+        self.clock.now += 61
+        self.assertEqual(self.limiter.reserve(), 0.0)
+
+    def test_fitbit_api_exposes_budget_from_response_headers(self):
+        """Test that FitbitAPI records the budget from each response."""
+        fitbit = FitbitAPI("client", "secret", "access", "refresh")
+        fitbit.rate_limiter = RateLimiter(clock=self.clock)
+        fitbit.session.request = MagicMock(
+            return_value=MagicMock(
+                status_code=200, headers=headers(150, 149, 3000), content=b"{}"
+            )
+        )
+
+        fitbit.get_devices()
+
+        self.assertEqual(fitbit.rate_limit, RateLimitBudget(150, 149, 3000))
+
+
+if __name__ == "__main__":
+    unittest.main()
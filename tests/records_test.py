@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Records Tests
+"""
+
+import os
+import sys
+import unittest
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413
+from fitbit_cli import records
+
+
+class TestRecords(unittest.TestCase):
+    """Test suite for parsing API payloads into typed records."""
+
+    def test_parse_sleep_reads_stage_minutes_once(self):
+        """Test that missing sleep stages become None instead of raising."""
+        sleep = records.parse_sleep(
+            {
+                "sleep": [
+                    {
+                        "dateOfSleep": "2024-01-01",
+                        "efficiency": 90,
+                        "timeInBed": 480,
+                        "levels": {"summary": {"deep": {"minutes": 60}}},
+                    }
+                ]
+            }
+        )
+
+        self.assertEqual(
+            sleep,
+            [records.SleepRecord("2024-01-01", 60, None, None, None, 90, 480)],
+        )
+
+    def test_parse_heart_builds_zone_records(self):
+        """Test that heart rate zones are parsed into HeartZone records."""
+        heart = records.parse_heart(
+            {
+                "activities-heart": [
+                    {
+                        "dateTime": "2024-01-01",
+                        "value": {
+                            "restingHeartRate": 60,
+                            "heartRateZones": [{"name": "Cardio", "minutes": 5}],
+                        },
+                    },
+                    {"dateTime": "2024-01-02"},
+                ]
+            }
+        )
+
+        self.assertEqual(
+            heart[0].zones, [records.HeartZone("Cardio", None, None, 5, None)]
+        )
+        self.assertEqual(heart[1], records.HeartRecord("2024-01-02", None, []))
+
+    def test_parse_spo2_accepts_single_day_and_range_payloads(self):
+        """Test that a single day dict and a range list parse the same way."""
+        day = {"dateTime": "2024-01-01", "value": {"min": 94.0, "avg": 96.0}}
+
+        self.assertEqual(records.parse_spo2(day), records.parse_spo2([day]))
+        self.assertIsNone(records.parse_spo2(day)[0].max)
+
+    def test_parse_body_merges_resources_by_date(self):
+        """Test that body resources are merged into one record per date in date order."""
+        body = records.parse_body(
+            {
+                "weight": {"body-weight": [{"dateTime": "2024-01-02", "value": "80"}]},
+                "fat": {"body-fat": [{"dateTime": "2024-01-01", "value": "18"}]},
+            }
+        )
+
+        self.assertEqual(
+            body,
+            [
+                records.BodyRecord("2024-01-01", None, None, "18"),
+                records.BodyRecord("2024-01-02", "80", None, None),
+            ],
+        )
+
+    def test_records_have_no_instance_dict(self):
+        """Test that records are slotted."""
+        self.assertFalse(hasattr(records.HRVRecord("2024-01-01", 40, 45), "__dict__"))
+
+    def test_parse_activities_keeps_failed_days(self):
+        """Test that a day that failed to fetch keeps its error message."""
+        days = records.parse_activities(
+            [{"date": "2024-01-01", "activities": [], "error": "HTTP error"}]
+        )
+
+        self.assertEqual(days, [records.ActivityDay("2024-01-01", [], "HTTP error")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Retry Policy Tests
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413
+from fitbit_api_test import make_response  # isort: skip  # pylint: disable=C0411,E0401
+from fitbit_cli.exceptions import FitbitAPIError
+from fitbit_cli.fitbit_api import FitbitAPI
+from fitbit_cli.retry import RetryPolicy, parse_retry_after
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test suite for retries with backoff in FitbitAPI.make_request."""
+
+    def setUp(self):
+        self.sleep = MagicMock()
+        self.fitbit = FitbitAPI(
+            "client",
+            "secret",
+            "access",
+            "refresh",
+            retry_policy=RetryPolicy(max_retries=2, budget=5, sleep=self.sleep),
+        )
+
+    def test_retry_after_header_accepts_seconds(self):
+        """Test that Retry-After seconds are parsed and invalid values ignored."""
+        self.assertEqual(parse_retry_after("7"), 7.0)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test that the exponential delay stays within the jitter window and cap."""
+        policy = RetryPolicy(backoff=1, max_backoff=5)
+        with patch("fitbit_cli.retry.random.uniform", side_effect=lambda a, b: b):
+            self.assertEqual(policy.delay(0), 1)
+            self.assertEqual(policy.delay(2), 4)
+            self.assertEqual(policy.delay(10), 5)
+        self.assertEqual(policy.delay(0, retry_after="3"), 3)
+
+    def test_transient_status_is_retried_honouring_retry_after(self):
+        """Test that a 503 followed by a 200 succeeds after waiting Retry-After."""
+        self.fitbit.session.request = MagicMock(
+            side_effect=[
+                make_response(503, headers={"Retry-After": "2"}),
+                make_response(200, payload={"hrv": []}),
+            ]
+        )
+
+        self.assertEqual(self.fitbit.get_hrv_summary("2024-01-01"), {"hrv": []})
+        self.sleep.assert_called_once_with(2.0)
+
+    def test_connection_errors_are_retried_until_max_retries(self):
+        """Test that connection errors are retried and re-raised once exhausted."""
+        self.fitbit.session.request = MagicMock(
+            side_effect=requests.exceptions.ConnectionError("reset")
+        )
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.fitbit.get_devices()
+        self.assertEqual(self.fitbit.session.request.call_count, 3)
+
+    def test_retry_budget_is_shared_across_requests(self):
+        """Test that the run-wide budget stops retries once it is spent."""
+        self.fitbit.retry_policy.budget = 1
+        self.fitbit.session.request = MagicMock(return_value=make_response(502))
+
+        with self.assertRaises(FitbitAPIError):
+            self.fitbit.get_devices()
+        with self.assertRaises(FitbitAPIError):
+            self.fitbit.get_devices()
+        self.assertEqual(self.fitbit.session.request.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Startup Tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+
+# Modules that must only be loaded on the code paths that need them
+HEAVY_MODULES = (
+    "requests",
+    "rich",
+    "http.server",
+    "webbrowser",
+    "sqlite3",
+    "numpy",
+    "pyarrow",
+)
+# Cumulative import time of fitbit_cli.main, a few times the measured cost
+IMPORT_BUDGET_US = 50_000
+
+
+def run_python(code, *flags):
+    """Run code in a fresh interpreter with the repository on sys.path."""
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+        env=env,
+    )
+
+
+def loaded_heavy_modules(code):
+    """Return the heavy modules loaded after running code in a fresh interpreter."""
+    result = run_python(
+        f"{code}\nimport json, sys\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+class TestStartup(unittest.TestCase):
+    """Test suite for the CLI import cost."""
+
+    def test_main_import_loads_only_the_argument_parser(self):
+        """Test that importing the entry point does not load heavy modules."""
+        self.assertEqual(loaded_heavy_modules("import fitbit_cli.main"), [])
+
+    def test_version_does_not_load_heavy_modules(self):
+        """Test that --version exits before anything heavy is imported."""
+        code = (
+            "import sys\n"
+            "sys.argv = ['fitbit-cli', '--version']\n"
+            "from fitbit_cli.main import main\n"
+            "try:\n"
+            "    main()\n"
+            "except SystemExit:\n"
+            "    pass"
+        )
+        self.assertEqual(loaded_heavy_modules(code), [])
+
+    def test_json_formatting_does_not_load_rich(self):
+        """Test that JSON output paths never import rich."""
+        code = (
+            "from fitbit_cli import formatter, output\n"
+            "formatter.display_hrv({'hrv': []}, as_json=True)"
+        )
+        self.assertEqual(loaded_heavy_modules(code), [])
+
+    def test_daemon_client_does_not_load_requests(self):
+        """Test that forwarding queries to a daemon never imports the HTTP stack."""
+        code = "from fitbit_cli.daemon import DaemonClient, daemon_running"
+        self.assertEqual(loaded_heavy_modules(code), [])
+
+    def test_main_import_time_stays_within_budget(self):
+        """Test the cumulative import time of the entry point reported by -X importtime."""
+        result = run_python("import fitbit_cli.main", "-X", "importtime")
+        cumulative = next(
+            int(line.split("|")[1])
+            for line in result.stderr.splitlines()
+            if line.split("|")[-1].strip() == "fitbit_cli.main"
+        )
+        self.assertLess(cumulative, IMPORT_BUDGET_US)
+
+
+if __name__ == "__main__":
+    unittest.main()
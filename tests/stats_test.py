@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Stats Tests
+"""
+
+import importlib.util
+import os
+import sys
+import unittest
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413
+from fitbit_cli import formatter as fmt
+from fitbit_cli import stats
+
+
+@unittest.skipIf(importlib.util.find_spec("numpy") is None, "numpy is not installed")
+class TestStats(unittest.TestCase):
+    """Test suite for vectorized series statistics."""
+
+    def test_series_stats_summarizes_sorted_values_and_skips_missing(self):
+        """Test summary values, dropping None and sorting by date."""
+        result = stats.series_stats(
+            "resting_heart_rate",
+            ["2024-01-03", "2024-01-01", "2024-01-02", "2024-01-05"],
+            [62, 60, None, 64],
+            window=2,
+        )
+
+        self.assertEqual(
+            result,
+            {
+                "metric": "resting_heart_rate",
+                "count": 3,
+                "start": "2024-01-01",
+                "end": "2024-01-05",
+                "mean": 62.0,
+                "min": 60.0,
+                "max": 64.0,
+                "p10": 60.4,
+                "p50": 62.0,
+                "p90": 63.6,
+                "rolling_window": 2,
+                "rolling_mean": 63.0,
+                "trend_per_day": 1.0,
+            },
+        )
+
+    def test_series_without_values_only_reports_count(self):
+        """Test that an empty series does not fail."""
+        self.assertEqual(
+            stats.series_stats("hrv_daily_rmssd", ["2024-01-01"], [None]),
+            {"metric": "hrv_daily_rmssd", "count": 0},
+        )
+
+    def test_rolling_window_is_the_number_of_values_averaged(self):
+        """Test that a series shorter than the window reports the window actually used."""
+        result = stats.series_stats(
+            "hrv_daily_rmssd", ["2024-01-01", "2024-01-02", "2024-01-03"], [40, 42, 44]
+        )
+
+        self.assertEqual(result["rolling_window"], 3)
+        self.assertEqual(result["rolling_mean"], 42.0)
+
+    def test_rolling_mean_uses_every_full_window(self):
+        """Test the cumulative sum rolling mean and a window longer than the series."""
+        self.assertEqual(list(stats.rolling_mean([1, 2, 3, 4], 2)), [1.5, 2.5, 3.5])
+        self.assertEqual(list(stats.rolling_mean([1, 2], 7)), [1.5])
+
+    def test_compute_stats_reads_formatted_sections(self):
+        """Test that body values given as strings become numeric series."""
+        body = {
+            "weight": {
+                "body-weight": [
+                    {"dateTime": "2024-01-01", "value": "75.0"},
+                    {"dateTime": "2024-01-02", "value": "74.0"},
+                ]
+            }
+        }
+        sections = [
+            ("body", fmt.display_body(body, as_json=True)),
+            ("devices", {"devices": []}),
+        ]
+
+        result = stats.compute_stats(sections)
+
+        self.assertEqual([s["metric"] for s in result], ["weight", "bmi", "fat"])
+        self.assertEqual(result[0]["trend_per_day"], -1.0)
+        self.assertEqual(result[1]["count"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Local Metrics Store Tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413
+from fitbit_api_test import (  # isort: skip  # pylint: disable=C0411,E0401
+    track_in_flight,
+)
+
+from fitbit_cli.exceptions import FitbitAPIError
+from fitbit_cli.fitbit_api import FitbitAPI
+from fitbit_cli.store import METRICS, SNAPSHOTS, MetricsStore
+
+
+def make_fitbit():
+    """Build a fake FitbitAPI returning one record per range metric."""
+    fitbit = MagicMock()
+    fitbit.get_user_profile.return_value = {"user": {"distanceUnit": "METRIC"}}
+    fitbit.get_devices.return_value = []
+    fitbit.get_sleep_log.return_value = {
+        "sleep": [{"dateOfSleep": "2024-01-02", "logId": 1, "efficiency": 90}]
+    }
+    fitbit.get_spo2_summary.return_value = [
+        {"dateTime": "2024-01-02", "value": {"avg": 95}}
+    ]
+    fitbit.get_heart_rate_time_series.return_value = {
+        "activities-heart": [{"dateTime": "2024-01-02", "value": {}}]
+    }
+    fitbit.get_azm_time_series.return_value = {"activities-active-zone-minutes": []}
+    fitbit.get_breathing_rate_summary.return_value = {"br": []}
+    fitbit.get_hrv_summary.return_value = {
+        "hrv": [
+            {"dateTime": "2024-01-01", "value": {"dailyRmssd": 40}},
+            {"dateTime": "2024-01-02", "value": {"dailyRmssd": 42}},
+        ]
+    }
+    fitbit.get_body_time_series.side_effect = lambda resource, *_: {
+        f"body-{resource}": [{"dateTime": "2024-01-02", "value": "1"}]
+    }
+    fitbit.get_daily_activity_summary.side_effect = lambda day: {
+        "activities": [{"name": day}]
+    }
+    return fitbit
+
+
+class TestMetricsStore(unittest.TestCase):
+    """Test suite for the incremental local metrics store."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.store = MetricsStore(os.path.join(self.tmpdir.name, "metrics.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_sync_range_starts_after_high_water_or_at_mutable_window(self):
+        """Test that a later sync only fetches days after the high-water mark."""
+        today = date(2024, 1, 10)
+
+        self.assertEqual(
+            self.store.sync_range("hrv", today=today), ("2023-12-11", "2024-01-10")
+        )
+        self.store._save("hrv", [], "2024-01-05")  # pylint: disable=W0212
+        self.assertEqual(
+            self.store.sync_range("hrv", today=today), ("2024-01-06", "2024-01-10")
+        )
+        self.store._save("hrv", [], "2024-01-10")  # pylint: disable=W0212
+        self.assertEqual(
+            self.store.sync_range("hrv", today=today), ("2024-01-09", "2024-01-10")
+        )
+
+    @patch("fitbit_cli.store.date")
+    def test_sync_stores_records_and_reads_back_api_shapes(self, mock_date):
+        """Test that synced records are served back in FitbitAPI payload shapes."""
+        mock_date.today.return_value = date(2024, 1, 2)
+        fitbit = make_fitbit()
+
+        summary = self.store.sync(fitbit, "2024-01-01", workers=2)
+
+        self.assertEqual([s["metric"] for s in summary], [*SNAPSHOTS, *METRICS])
+        self.assertEqual(self.store.high_water("hrv"), "2024-01-02")
+        self.assertEqual(
+            self.store.get_hrv_summary("2024-01-02"),
+            {"hrv": [{"dateTime": "2024-01-02", "value": {"dailyRmssd": 42}}]},
+        )
+        self.assertEqual(
+            self.store.get_spo2_summary("2024-01-02"),
+            {"dateTime": "2024-01-02", "value": {"avg": 95}},
+        )
+        self.assertEqual(
+            self.store.get_body_time_series("bmi", "2024-01-01", "2024-01-02"),
+            {"body-bmi": [{"dateTime": "2024-01-02", "value": "1"}]},
+        )
+        self.assertEqual(
+            self.store.get_daily_activity_summary("2024-01-01"),
+            {"activities": [{"name": "2024-01-01"}]},
+        )
+        self.assertEqual(
+            self.store.get_user_profile()["user"]["distanceUnit"], "METRIC"
+        )
+
+    @patch("fitbit_cli.store.date")
+    def test_activity_days_share_the_in_flight_limit(self, mock_date):
+        """Test that the per-day fan-out inside the metric pool stays within workers."""
+        mock_date.today.return_value = date(2024, 1, 20)
+        fitbit = FitbitAPI("client", "secret", "access", "refresh", workers=2)
+        in_flight = track_in_flight(fitbit)
+
+        self.store.sync(fitbit, "2024-01-01", workers=2)
+
+        self.assertEqual(fitbit.session.request.call_count, 2 + 9 + 20)
+        self.assertEqual(in_flight[1], 2)
+
+    @patch("fitbit_cli.store.date")
+    def test_failed_activity_day_holds_back_the_high_water_mark(self, mock_date):
+        """Test that a failed day is retried on the next sync."""
+        mock_date.today.return_value = date(2024, 1, 3)
+        fitbit = make_fitbit()
+
+        def summary(day):
+            if day == "2024-01-02":
+                raise OSError("timeout")
+            return {"activities": []}
+
+        fitbit.get_daily_activity_summary.side_effect = summary
+
+        result = self.store.sync(fitbit, "2024-01-01")
+
+        self.assertEqual(result[-1]["failed_days"], ["2024-01-02"])
+        self.assertEqual(self.store.high_water("activities"), "2024-01-01")
+
+    @patch("fitbit_cli.store.date")
+    def test_failed_range_metric_is_reported_and_others_are_saved(self, mock_date):
+        """Test that one failing range request does not abort the whole sync."""
+        mock_date.today.return_value = date(2024, 1, 2)
+        fitbit = make_fitbit()
+        fitbit.get_sleep_log.side_effect = FitbitAPIError("HTTP error occurred: 500")
+
+        summary = {row["metric"]: row for row in self.store.sync(fitbit, "2024-01-01")}
+
+        self.assertEqual(summary["sleep"]["error"], "HTTP error occurred: 500")
+        self.assertEqual(summary["sleep"]["records"], 0)
+        self.assertIsNone(self.store.high_water("sleep"))
+        self.assertIsNone(summary["hrv"]["error"])
+        self.assertEqual(self.store.high_water("hrv"), "2024-01-02")
+
+    @patch("fitbit_cli.store.date")
+    def test_failed_snapshot_is_reported_and_metrics_are_synced(self, mock_date):
+        """Test that a failing devices request does not abort the whole sync."""
+        mock_date.today.return_value = date(2024, 1, 2)
+        fitbit = make_fitbit()
+        fitbit.get_devices.side_effect = OSError("timeout")
+
+        summary = {row["metric"]: row for row in self.store.sync(fitbit, "2024-01-01")}
+
+        self.assertEqual(summary["devices"]["error"], "timeout")
+        self.assertEqual(summary["devices"]["records"], 0)
+        self.assertIsNone(summary["user_profile"]["error"])
+        self.assertEqual(self.store.high_water("hrv"), "2024-01-02")
+        with self.assertRaises(FitbitAPIError):
+            self.store.get_devices()
+
+
+if __name__ == "__main__":
+    unittest.main()
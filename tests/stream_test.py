@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming Output Tests
+"""
+
+import io
+import json
+import os
+import sys
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413
+from fitbit_cli import output, stream
+
+from output_test import make_args  # isort: skip  # pylint: disable=C0411,E0401
+
+
+class TestIntradayStreaming(unittest.TestCase):
+    """Test suite for intraday NDJSON streaming."""
+
+    def test_spo2_intraday_yields_one_sample_per_minute(self):
+        """Test that SpO2 intraday single-day and range payloads are flattened."""
+        day = {
+            "dateTime": "2024-01-01",
+            "minutes": [
+                {"minute": "2024-01-01T01:00:00", "value": 95.1},
+                {"minute": "2024-01-01T01:01:00", "value": 96.0},
+            ],
+        }
+
+        self.assertEqual(
+            list(stream.iter_spo2_intraday(day)),
+            [
+                {"time": "2024-01-01T01:00:00", "spo2": 95.1},
+                {"time": "2024-01-01T01:01:00", "spo2": 96.0},
+            ],
+        )
+        self.assertEqual(len(list(stream.iter_spo2_intraday([day, day]))), 4)
+
+    def test_azm_intraday_samples_use_formatter_field_names(self):
+        """Test that AZM intraday values are renamed like the summary formatter."""
+        azm = {
+            "activities-active-zone-minutes-intraday": [
+                {
+                    "dateTime": "2024-01-01",
+                    "minutes": [
+                        {
+                            "minute": "2024-01-01T07:00:00",
+                            "value": {
+                                "activeZoneMinutes": 1,
+                                "cardioActiveZoneMinutes": 1,
+                            },
+                        }
+                    ],
+                }
+            ]
+        }
+
+        self.assertEqual(
+            list(stream.iter_azm_intraday(azm)),
+            [
+                {
+                    "time": "2024-01-01T07:00:00",
+                    "active_zone_minutes": 1,
+                    "fat_burn_minutes": None,
+                    "cardio_minutes": 1,
+                    "peak_minutes": None,
+                }
+            ],
+        )
+
+    def test_prefetch_keeps_order_with_bounded_window(self):
+        """Test that prefetched results come back in input order."""
+
+        def fetch(item):
+            time.sleep(0.02 if item == 0 else 0)
+            return item
+
+        self.assertEqual(list(stream.prefetch(fetch, range(5), 2)), [0, 1, 2, 3, 4])
+
+    def test_ndjson_display_streams_summary_records_and_intraday_samples(self):
+        """Test that ndjson output writes one line per record and per sample."""
+        fitbit = MagicMock()
+        fitbit.get_hrv_summary.return_value = {
+            "hrv": [
+                {"dateTime": "2024-01-01", "value": {"dailyRmssd": 40, "deepRmssd": 50}}
+            ]
+        }
+        fitbit.get_spo2_intraday.side_effect = lambda day: {
+            "dateTime": day,
+            "minutes": [{"minute": f"{day}T00:00:00", "value": 97}],
+        }
+        args = make_args(
+            hrv=("2024-01-01", None), spo2_intraday=("2024-01-01", "2024-01-02")
+        )
+
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            output.ndjson_display(fitbit, args)
+
+        self.assertEqual(
+            stdout.getvalue().splitlines(),
+            [
+                '{"metric":"hrv","date":"2024-01-01","daily_rmssd":40,"deep_rmssd":50}',
+                '{"metric":"spo2_intraday","time":"2024-01-01T00:00:00","spo2":97}',
+                '{"metric":"spo2_intraday","time":"2024-01-02T00:00:00","spo2":97}',
+            ],
+        )
+
+
+class TestJSONObjectWriter(unittest.TestCase):
+    """Test suite for the member-by-member JSON object writer."""
+
+    def test_streamed_document_matches_single_dump(self):
+        """Test that the streamed object is byte-identical to one json.dumps call."""
+        document = {
+            "sleep": [{"date": "2024-01-01", "efficiency": 90}, {"date": "x"}],
+            "user_profile": {"first_name": "A"},
+            "devices": [],
+        }
+        buffer = io.StringIO()
+
+        with stream.JSONObjectWriter(buffer) as writer:
+            for key, value in document.items():
+                writer.write_member(key, value)
+
+        self.assertEqual(
+            buffer.getvalue(), json.dumps(document, separators=(",", ":")) + "\n"
+        )
+
+    def test_failed_run_does_not_close_the_object(self):
+        """Test that an error leaves the document visibly incomplete."""
+        buffer = io.StringIO()
+
+        with self.assertRaises(RuntimeError):
+            with stream.JSONObjectWriter(buffer) as writer:
+                writer.write_member("hrv", [])
+                raise RuntimeError("fetch failed")
+
+        self.assertEqual(buffer.getvalue(), '{"hrv":[]')
+
+
+if __name__ == "__main__":
+    unittest.main()
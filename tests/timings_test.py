@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Timings Tests
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413
+from fitbit_api_test import make_response  # isort: skip  # pylint: disable=C0411,E0401
+from output_test import make_args  # isort: skip  # pylint: disable=C0411,E0401
+from fitbit_cli import fitbit_setup
+from fitbit_cli import formatter as fmt
+from fitbit_cli import timings
+from fitbit_cli.cache import ResponseCache
+from fitbit_cli.fitbit_api import FitbitAPI
+from fitbit_cli.output import format_sections
+
+
+class TestTimings(unittest.TestCase):
+    """Test suite for the --timings recorder."""
+
+    def setUp(self):
+        self.recorder = timings.enable()
+
+    def tearDown(self):
+        timings.disable()
+
+    def test_disabled_recorder_records_nothing(self):
+        """Test that the helpers are no-ops until timings are enabled."""
+        timings.disable()
+
+        with timings.phase("parse"):
+            pass
+        timings.record_cache_hit("https://api.fitbit.com/1/user/-/devices.json")
+
+        self.assertIsNone(timings.active())
+        self.assertEqual(self.recorder.summary()["phases"], {})
+
+    def test_requests_are_recorded_with_status_bytes_and_latency_split(self):
+        """Test that every request of make_request is reported, retries included."""
+        fitbit = FitbitAPI("client", "secret", "access", "refresh")
+        fitbit.retry_policy.wait = MagicMock()
+        responses = iter(
+            [make_response(503), make_response(payload={"devices": []}, elapsed=0.01)]
+        )
+
+        def slow_request(*_args, **_kwargs):
+            time.sleep(0.02)
+            return next(responses)
+
+        fitbit.session.request = MagicMock(side_effect=slow_request)
+
+        fitbit.get_devices()
+
+        summary = self.recorder.summary()
+        first, second = summary["requests"]  # pylint: disable=W0632
+        self.assertEqual((first["status"], first["attempt"]), (503, 0))
+        self.assertEqual((second["status"], second["attempt"]), (200, 1))
+        self.assertEqual(second["endpoint"], "/1/user/-/devices.json")
+        self.assertEqual(second["bytes"], len(b'{"devices": []}'))
+        self.assertEqual(second["ttfb_ms"], 10.0)
+        self.assertGreater(second["download_ms"], 0)
+        self.assertAlmostEqual(
+            second["ttfb_ms"] + second["download_ms"], second["total_ms"], places=2
+        )
+        self.assertEqual(summary["totals"]["requests"], 2)
+        self.assertEqual(summary["totals"]["retries"], 1)
+        self.assertEqual(summary["phases"]["parse"]["calls"], 1)
+
+    def test_cache_hits_and_token_refreshes_are_counted(self):
+        """Test that cached responses and 401 refreshes show up in the totals."""
+        with tempfile.TemporaryDirectory() as tmp:
+            token_path = os.path.join(tmp, "token.json")
+            fitbit_setup.write_fitbit_token(
+                {"access_token": "access", "refresh_token": "refresh"}, token_path
+            )
+            cache = ResponseCache(os.path.join(tmp, "cache.db"))
+            fitbit = FitbitAPI(
+                "client",
+                "secret",
+                "access",
+                "refresh",
+                cache=cache,
+                token_path=token_path,
+            )
+            refreshed = make_response(
+                payload={"access_token": "new", "refresh_token": "refresh2"}
+            )
+            fitbit.session.post = MagicMock(return_value=refreshed)
+            fitbit.session.request = MagicMock(
+                side_effect=[make_response(401), make_response(payload=[])]
+            )
+
+            fitbit.get_devices()
+            fitbit.get_devices()
+            fitbit.close()
+
+        totals = self.recorder.summary()["totals"]
+        self.assertEqual(totals["requests"], 2)
+        self.assertEqual(totals["token_refreshes"], 1)
+        self.assertEqual(totals["cache_hits"], 1)
+
+    @patch("fitbit_cli.formatter.CONSOLE.print")
+    def test_formatters_and_rendering_are_timed(self, _mock_print):
+        """Test that each display_* call and the table rendering are separate phases."""
+        sections = [("hrv", {"hrv": [{"dateTime": "2024-01-01", "value": {}}]})]
+
+        list(format_sections(sections, make_args(hrv=("2024-01-01", None))))
+
+        phases = self.recorder.summary()["phases"]
+        self.assertEqual(phases["display_hrv"]["calls"], 1)
+        self.assertEqual(phases["render"]["calls"], 1)
+        self.assertLessEqual(phases["render"]["ms"], phases["display_hrv"]["ms"])
+
+    def test_json_report(self):
+        """Test that the JSON report wraps the summary."""
+        summary = self.recorder.summary()
+
+        self.assertEqual(
+            fmt.display_timings(summary, as_json=True), {"timings": summary}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
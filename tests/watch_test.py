@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Watch Mode Tests
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+
+# Add the parent directory to sys.path to make imports work
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# pylint: disable=C0413
+from fitbit_api_test import make_response  # isort: skip  # pylint: disable=C0411,E0401
+from output_test import make_args  # isort: skip  # pylint: disable=C0411,E0401
+from fitbit_cli.cache import ResponseCache
+from fitbit_cli.cli import DateRange
+from fitbit_cli.exceptions import FitbitAPIError
+from fitbit_cli.fitbit_api import FitbitAPI
+from fitbit_cli.main import _use_daemon
+from fitbit_cli.watch import Watcher, diff_records, index_records, watch_display
+
+
+def hrv_payload(*days):
+    """HRV summary response with one (date, daily RMSSD) entry per day."""
+    return {
+        "hrv": [
+            {"dateTime": day, "value": {"dailyRmssd": rmssd, "deepRmssd": 40.0}}
+            for day, rmssd in days
+        ]
+    }
+
+
+class TestDiffRecords(unittest.TestCase):
+    """Test suite for diffing formatted records between polls."""
+
+    def test_added_changed_and_removed_records(self):
+        """Test that only records that differ from the previous poll are reported."""
+        previous = index_records(
+            [{"date": "d1", "v": 1}, {"date": "d2", "v": 2}, {"date": "d3", "v": 3}]
+        )
+        current = index_records(
+            [{"date": "d1", "v": 1}, {"date": "d2", "v": 5}, {"date": "d4", "v": 4}]
+        )
+
+        self.assertEqual(
+            diff_records(previous, current),
+            [
+                ("changed", {"date": "d2", "v": 5}),
+                ("added", {"date": "d4", "v": 4}),
+                ("removed", {"date": "d3", "v": 3}),
+            ],
+        )
+
+    def test_records_of_the_same_day_are_told_apart(self):
+        """Test that a second record on one date, e.g. a nap, is a new record."""
+        previous = index_records([{"date": "d1", "v": 1}])
+        current = index_records([{"date": "d1", "v": 1}, {"date": "d1", "v": 2}])
+
+        self.assertEqual(
+            diff_records(previous, current), [("added", {"date": "d1", "v": 2})]
+        )
+
+
+class TestWatchDisplay(unittest.TestCase):
+    """Test suite for polling and reporting changes."""
+
+    def setUp(self):
+        self.fitbit = MagicMock()
+        self.fitbit.get_hrv_summary.side_effect = [
+            hrv_payload(("2024-01-01", 40.0), ("2024-01-02", 41.0)),
+            hrv_payload(("2024-01-01", 40.0), ("2024-01-02", 45.0)),
+            hrv_payload(("2024-01-01", 40.0), ("2024-01-02", 45.0)),
+        ]
+        self.sleep = MagicMock()
+
+    def test_json_emits_only_changed_records(self):
+        """Test that later polls write just the records that changed."""
+        args = make_args(hrv=("2024-01-01", "2024-01-02"), watch=30, ndjson=True)
+        args.json = args.raw_json = False
+
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            watch_display(self.fitbit, args, polls=3, sleep=self.sleep)
+
+        lines = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual(
+            [(line["change"], line["date"]) for line in lines],
+            [
+                ("added", "2024-01-01"),
+                ("added", "2024-01-02"),
+                ("changed", "2024-01-02"),
+            ],
+        )
+        self.assertEqual(lines[-1]["daily_rmssd"], 45.0)
+        self.sleep.assert_called_with(30)
+        self.assertEqual(self.sleep.call_count, 2)
+
+    @patch("fitbit_cli.formatter.display_hrv")
+    def test_tables_are_rendered_only_for_changed_sections(self, display_hrv):
+        """Test that an unchanged poll renders nothing."""
+        display_hrv.side_effect = lambda data, as_json=False: (
+            {"hrv": [{"date": h["dateTime"], **h["value"]} for h in data["hrv"]]}
+            if as_json
+            else None
+        )
+        args = make_args(hrv=("2024-01-01", "2024-01-02"), watch=30)
+        args.json = args.raw_json = args.ndjson = False
+
+        with patch("fitbit_cli.watch.fmt") as fmt:
+            watch_display(self.fitbit, args, polls=3, sleep=self.sleep)
+
+        tables = [c for c in display_hrv.call_args_list if not c.kwargs.get("as_json")]
+        self.assertEqual(len(tables), 2)
+        self.assertEqual(fmt.CONSOLE.rule.call_count, 2)
+
+    @patch("fitbit_cli.cli.datetime")
+    def test_dates_move_forward_past_midnight(self, mock_datetime):
+        """Test that a bare flag and a relative range are resolved on every poll."""
+        mock_datetime.today.return_value = datetime(2024, 1, 1, 23, 59)
+        self.fitbit.get_hrv_summary.side_effect = None
+        self.fitbit.get_hrv_summary.return_value = hrv_payload()
+        self.fitbit.get_breathing_rate_summary.return_value = {"br": []}
+        args = make_args(
+            hrv=DateRange(date(2024, 1, 1), None),
+            breathing_rate=DateRange("2023-12-30", "2024-01-01", spec="last-2-days"),
+            watch=30,
+        )
+        watcher = Watcher(self.fitbit, args)
+
+        watcher.poll()
+        mock_datetime.today.return_value = datetime(2024, 1, 2, 0, 1)
+        watcher.poll()
+
+        self.assertEqual(
+            [c.args for c in self.fitbit.get_hrv_summary.call_args_list],
+            [(date(2024, 1, 1), None), (date(2024, 1, 2), None)],
+        )
+        self.assertEqual(
+            [c.args for c in self.fitbit.get_breathing_rate_summary.call_args_list],
+            [("2023-12-30", "2024-01-01"), ("2023-12-31", "2024-01-02")],
+        )
+
+    def test_failed_poll_is_reported_and_watching_continues(self):
+        """Test that an API error in one poll does not stop watching."""
+        self.fitbit.get_hrv_summary.side_effect = [
+            FitbitAPIError("HTTP error occurred"),
+            hrv_payload(("2024-01-01", 40.0)),
+        ]
+        args = make_args(hrv=("2024-01-01", "2024-01-01"), watch=30, ndjson=True)
+        args.json = args.raw_json = False
+
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout, patch(
+            "sys.stderr", new_callable=io.StringIO
+        ) as stderr:
+            watch_display(self.fitbit, args, polls=2, sleep=self.sleep)
+
+        self.assertIn("Poll failed: HTTP error occurred", stderr.getvalue())
+        self.assertEqual(len(stdout.getvalue().splitlines()), 1)
+
+
+class TestWatchRequests(unittest.TestCase):
+    """Test suite for the requests a real client sends while watching."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = ResponseCache(
+            os.path.join(self.tmp.name, "cache.db"), skip_mutable=True
+        )
+        credentials = ("client", "secret", "access", "refresh")
+        self.fitbit = FitbitAPI(
+            *credentials, cache=self.cache, conditional_requests=True
+        )
+        self.addCleanup(self.fitbit.close)
+
+    def test_today_is_revalidated_on_every_poll(self):
+        """Test that a cached response of today does not hide a change."""
+        today = date.today().isoformat()
+        self.fitbit.session.request = MagicMock(
+            side_effect=[
+                make_response(
+                    payload=hrv_payload((today, 40.0)), headers={"ETag": "1"}
+                ),
+                make_response(
+                    payload=hrv_payload((today, 45.0)), headers={"ETag": "2"}
+                ),
+                make_response(status_code=304),
+            ]
+        )
+
+        polls = [self.fitbit.get_hrv_summary(today) for _ in range(3)]
+
+        self.assertEqual(self.fitbit.session.request.call_count, 3)
+        self.assertEqual(polls[1], hrv_payload((today, 45.0)))
+        self.assertEqual(polls[2], polls[1])
+        headers = self.fitbit.session.request.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], "2")
+
+    def test_finalized_days_are_still_served_from_the_cache(self):
+        """Test that days that cannot change anymore are fetched once."""
+        self.fitbit.session.request = MagicMock(
+            return_value=make_response(payload=hrv_payload(("2020-01-01", 40.0)))
+        )
+
+        self.fitbit.get_hrv_summary("2020-01-01")
+        self.fitbit.get_hrv_summary("2020-01-01")
+
+        self.assertEqual(self.fitbit.session.request.call_count, 1)
+
+    @patch("fitbit_cli.daemon.daemon_running", return_value=True)
+    def test_watch_bypasses_the_daemon(self, _mock_running):
+        """Test that watch polls the API itself, the daemon would serve cached results."""
+        args = make_args(
+            watch=60,
+            socket=None,
+            serve=False,
+            exporter=False,
+            no_daemon=False,
+            timings=False,
+            no_cache=False,
+            refresh_cache=False,
+        )
+
+        self.assertFalse(_use_daemon(args))
+        args.watch = None
+        self.assertTrue(_use_daemon(args))
+
+
+if __name__ == "__main__":
+    unittest.main()